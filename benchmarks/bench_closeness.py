@@ -0,0 +1,72 @@
+"""
+Mide `closeness_centrality` sobre redes de tesis sintéticas de hasta 100k nodos y
+la compara con `nx.closeness_centrality` en los tamaños en que NetworkX es viable.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_closeness.py [--sizes 1000 10000 100000] [--nx-max 10000]
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+import networkx as nx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# los módulos del proyecto se importan igual que desde src/main.py
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from graph.closeness import closeness_centrality  # noqa: E402
+from graph.csr_graph import CSRGraph  # noqa: E402
+from synthetic import thesis_relations  # noqa: E402
+
+TOLERANCE = 1e-12
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--nx-max",
+        type=int,
+        default=10000,
+        help="tamaño máximo en que se ejecuta NetworkX",
+    )
+    parser.add_argument("--batch-entries", type=int, default=1 << 22)
+    args = parser.parse_args()
+
+    print(
+        f"{'nodos':>8} {'aristas':>8} {'grafo':>9} {'csr (s)':>9} {'nx (s)':>9} {'x':>7}"
+    )
+    for size in args.sizes:
+        relations = thesis_relations(size)
+        for directed in (False, True):
+            graph = CSRGraph.from_relations(relations, directed=directed)
+
+            start = perf_counter()
+            result = closeness_centrality(graph, batch_entries=args.batch_entries)
+            seconds = perf_counter() - start
+
+            nx_seconds, speedup = "-", "-"
+            if size <= args.nx_max:
+                nx_graph = graph.to_networkx()
+                start = perf_counter()
+                expected = nx.closeness_centrality(nx_graph)
+                elapsed = perf_counter() - start
+                error = max(abs(result[node] - expected[node]) for node in expected)
+                if error > TOLERANCE:
+                    raise SystemExit(f"[ERROR] difiere de NetworkX en {error}")
+                nx_seconds, speedup = f"{elapsed:.2f}", f"{elapsed / seconds:.1f}"
+
+            kind = "dirigido" if directed else "no dir."
+            print(
+                f"{graph.number_of_nodes():>8} {graph.number_of_edges():>8} {kind:>9}"
+                f" {seconds:>9.2f} {nx_seconds:>9} {speedup:>7}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compara la memoria por arista de `CSRGraph.from_relations` con la de un grafo de
+NetworkX construido con las mismas relaciones, medida con tracemalloc.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_csr_graph.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+import networkx as nx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# los módulos del proyecto se importan igual que desde src/main.py
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from graph.csr_graph import CSRGraph  # noqa: E402
+from synthetic import thesis_relations  # noqa: E402
+
+
+def measure(build):
+    """
+    Construye un grafo y mide la memoria que queda reservada y el pico durante la construcción.
+
+    Los nombres ya existen en las relaciones, así que solo se cuenta lo que añade el grafo.
+
+    Params:
+    -------
+    build : Callable
+        Función sin argumentos que construye el grafo.
+
+    Returns:
+    --------
+    Tuple[Any, int, int, float]
+        El grafo, los bytes que retiene, el pico de bytes y los segundos de construcción.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    graph = build()
+    seconds = perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, current, peak, seconds
+
+
+def networkx_graph(relations, directed):
+    graph = nx.DiGraph() if directed else nx.Graph()
+    graph.add_edges_from(relations)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'aristas':>8} {'grafo':>9} {'tipo':>9} {'B/arista':>9}"
+        f" {'pico B/ar.':>10} {'nbytes/ar.':>10} {'s':>6}"
+    )
+    for size in args.sizes:
+        relations = thesis_relations(size)
+        for directed in (True, False):
+            kind = "dirigido" if directed else "no dir."
+            csr, current, peak, seconds = measure(
+                lambda: CSRGraph.from_relations(relations, directed)
+            )
+            m = csr.number_of_edges()
+            print(
+                f"{m:>8} {'CSRGraph':>9} {kind:>9} {current / m:>9.1f}"
+                f" {peak / m:>10.1f} {csr.nbytes / m:>10.1f} {seconds:>6.2f}"
+            )
+            del csr
+
+            name = "DiGraph" if directed else "Graph"
+            graph, current, peak, seconds = measure(
+                lambda: networkx_graph(relations, directed)
+            )
+            print(
+                f"{m:>8} {name:>9} {kind:>9} {current / m:>9.1f}"
+                f" {peak / m:>10.1f} {'-':>10} {seconds:>6.2f}",
+                flush=True,
+            )
+            del graph
+
+
+if __name__ == "__main__":
+    main()
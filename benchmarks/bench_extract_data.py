@@ -0,0 +1,87 @@
+"""
+Compara la extracción elemento a elemento (`extract_data`) con la extracción
+en bloque (`extract_data_bulk`) sobre un listado guardado, en un navegador real.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_extract_data.py [--page tests/fixtures/listing.html]
+"""
+
+import argparse
+import json
+import os
+import sys
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# los módulos del proyecto se importan igual que desde src/main.py
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from scraper.config import (
+    CHROMEDRIVER_PATH,
+    init_driver,
+    set_driver_options,
+)  # noqa: E402
+from scraper.extract_data import extract_data, extract_data_bulk  # noqa: E402
+
+DEFAULT_PAGE = os.path.join(ROOT, "tests", "fixtures", "listing.html")
+
+
+def timed(func, *args, repeat: int = 3, **kwargs):
+    """
+    Ejecuta una función varias veces y devuelve su resultado y el mejor tiempo.
+
+    Params:
+    -------
+    func : Callable
+        La función a medir.
+    repeat : int
+        Número de ejecuciones.
+
+    Returns:
+    --------
+    Tuple[Any, float]
+        El resultado de la última ejecución y el menor tiempo en segundos.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page", default=DEFAULT_PAGE, help="listado html guardado")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    driver = init_driver(set_driver_options(), CHROMEDRIVER_PATH)
+    try:
+        driver.get("file://" + os.path.abspath(args.page))
+
+        expected, per_element = timed(extract_data, driver, repeat=args.repeat)
+        n = sum(len(theses) for theses in expected.values())
+        print(f"[INFO] {n} tesis en {len(expected)} años")
+        print(f"extract_data               {per_element * 1000:9.1f} ms")
+
+        for method in ("script", "source"):
+            data, seconds = timed(
+                extract_data_bulk, driver, method=method, repeat=args.repeat
+            )
+            # mismo contenido y mismo orden de años e ids
+            same = json.dumps(data) == json.dumps(expected)
+            print(
+                f"extract_data_bulk({method!r:8}) {seconds * 1000:9.1f} ms"
+                f"  x{per_element / seconds:6.1f}  {'OK' if same else 'DISTINTO'}"
+            )
+            if not same:
+                raise SystemExit(f"[ERROR] extract_data_bulk({method!r}) no coincide")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
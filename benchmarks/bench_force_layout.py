@@ -0,0 +1,101 @@
+"""
+Mide cómo escala `force_layout` con el tamaño de la red, hasta 100k nodos, frente a
+`nx.spring_layout` en los tamaños en que NetworkX es viable.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_force_layout.py [--sizes 1000 3000 10000 30000 100000]
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# los módulos del proyecto se importan igual que desde src/main.py
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from graph.csr_graph import CSRGraph  # noqa: E402
+from graph.force_layout import force_layout  # noqa: E402
+from synthetic import thesis_relations  # noqa: E402
+
+
+def layout_quality(graph: CSRGraph, pos, k: float):
+    """
+    Resume la calidad de un layout en dos cifras comparables entre motores.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo no dirigido.
+    pos : Dict[str, Tuple[float, float]]
+        La posición de cada nodo.
+    k : float
+        La distancia óptima entre nodos con la que se ha calculado el layout.
+
+    Returns:
+    --------
+    Tuple[float, float]
+        La longitud mediana de las aristas en unidades de k y la proporción de nodos
+        que tienen otro a menos de k / 10 (solapados al dibujarlos).
+    """
+
+    xy = np.array([pos[name] for name in graph.names])
+    src = np.repeat(np.arange(graph.number_of_nodes()), np.diff(graph.indptr))
+    lengths = np.linalg.norm(xy[src] - xy[graph.indices], axis=1)
+    nearest, _ = cKDTree(xy).query(xy, k=2)
+    return np.median(lengths) / k, np.mean(nearest[:, 1] < k / 10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 3000, 10000, 30000, 100000]
+    )
+    parser.add_argument(
+        "--spring-max",
+        type=int,
+        default=3000,
+        help="tamaño máximo en que se ejecuta nx.spring_layout",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'nodos':>8} {'motor':>11} {'s':>8} {'x':>6}"
+        f" {'arista/k':>9} {'solapados':>10}"
+    )
+    for size in args.sizes:
+        graph = CSRGraph.from_relations(thesis_relations(size), directed=False)
+        n = graph.number_of_nodes()
+        k = 1 / np.sqrt(n)
+
+        start = perf_counter()
+        pos = force_layout(graph, k, seed=0)
+        seconds = perf_counter() - start
+        edge, overlap = layout_quality(graph, pos, k)
+        print(
+            f"{n:>8} {'multilevel':>11} {seconds:>8.2f} {'':>6}"
+            f" {edge:>9.2f} {overlap:>10.1%}",
+            flush=True,
+        )
+
+        if size <= args.spring_max:
+            nx_graph = graph.to_networkx()
+            start = perf_counter()
+            pos = nx.spring_layout(nx_graph, k=k, seed=0)
+            spring_seconds = perf_counter() - start
+            edge, overlap = layout_quality(graph, pos, k)
+            print(
+                f"{n:>8} {'spring':>11} {spring_seconds:>8.2f}"
+                f" {spring_seconds / seconds:>6.1f} {edge:>9.2f} {overlap:>10.1%}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Compara `clean_data` (con `NameIndex`) con el bucle anterior, que llamaba a
+`unify_duplicated_names` para cada autor y cada director, sobre datos sintéticos
+de decenas de miles de nombres, y comprueba que el json resultante es idéntico.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_name_index.py [--sizes 2000 8000 40000] [--loop-max 8000]
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+from time import perf_counter
+from typing import Dict
+
+from unidecode import unidecode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# los módulos del proyecto se importan igual que desde src/main.py
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from scraper.clean_data import clean_data, unify_duplicated_names  # noqa: E402
+
+FIRST_NAMES = [
+    "José", "María", "Juan", "Ana", "Luis", "Carmen", "Pablo", "Elena", "Javier",
+    "Lucía", "Carlos", "Marta", "Daniel", "Laura", "Rubén", "Sara", "Iván", "Raquel",
+]  # fmt: skip
+SURNAMES = [
+    "García", "Fernández", "González", "Rodríguez", "López", "Martínez", "Sánchez",
+    "Pérez", "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno",
+    "Álvarez", "Muñoz", "Romero", "Alonso", "Gutiérrez", "Navarro", "Torres",
+    "Domínguez", "Vázquez", "Ramos", "Gil", "Ramírez", "Serrano", "Blanco", "Suárez",
+    "Molina", "Morales", "Ortega", "Delgado", "Castro", "Ortiz", "Rubio", "Marín",
+    "Sanz", "Iglesias",
+]  # fmt: skip
+
+
+def synthetic_theses(n_theses: int, seed: int = 0) -> Dict[str, Dict[str, Dict]]:
+    """
+    Genera datos de tesis sintéticos con nombres al estilo de los del portal.
+
+    Con pocos nombres y apellidos muchos nombres comparten palabras, que es el peor
+    caso para el índice. Parte de los autores dirigen después otras tesis, y sus
+    nombres aparecen con variantes: sin acentos, con "Apellidos, Nombre" o sin el
+    segundo apellido.
+
+    Params:
+    -------
+    n_theses : int
+        Número de tesis.
+    seed : int
+        Semilla del generador.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict]]
+        Los datos sin limpiar, organizados por año y ID como los del scraper.
+    """
+
+    rng = random.Random(seed)
+
+    def person():
+        return rng.choice(FIRST_NAMES), rng.choice(SURNAMES), rng.choice(SURNAMES)
+
+    directors = [person() for _ in range(max(10, n_theses // 4))]
+    years = max(1, n_theses // 50)
+    data = dict()
+
+    for i in range(n_theses):
+        year = str(2024 - i * years // n_theses)
+        first, surname1, surname2 = author = person()
+
+        variant = rng.random()
+        if variant < 0.2:
+            name = f"{surname1} {surname2}, {first}"
+        elif variant < 0.3:
+            name = f"{first} {surname1}"
+        elif variant < 0.5:
+            name = unidecode(f"{first} {surname1} {surname2}")
+        else:
+            name = f"{first} {surname1} {surname2}"
+
+        chosen = rng.sample(directors, 2 if rng.random() < 0.3 else 1)
+        theses = data.setdefault(year, dict())
+        theses[f"{year}-{len(theses) + 1}"] = {
+            "title": f"Tesis {i}",
+            "author": name,
+            "directors": [unidecode(" ".join(d)).title() for d in chosen],
+        }
+        # algunos autores acaban dirigiendo tesis
+        if rng.random() < 0.3:
+            directors.append(author)
+
+    return data
+
+
+def clean_data_loop(data):
+    """
+    `clean_data` tal y como era antes de `NameIndex`: cada autor se compara con
+    todos los directores y se queda con el último que coincide.
+    """
+
+    directors_names_set = set()
+    for year in data.keys():
+        for id in data[year].keys():
+            directors_names_set.update(data[year][id]["directors"])
+    directors_names_list = list(directors_names_set)
+
+    for year in data.keys():
+        for id in data[year].keys():
+            author = unidecode(data[year][id]["author"])
+            if "," in author:
+                author = author.split(",")
+                author.reverse()
+                author = list(map(lambda name: name.strip(), author))
+                author = " ".join(author)
+            data[year][id]["author"] = author.title()
+
+            for director in directors_names_list:
+                result_name = unify_duplicated_names(author, director)
+                if result_name:
+                    data[year][id]["author"] = result_name
+
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 8000, 40000])
+    parser.add_argument(
+        "--loop-max",
+        type=int,
+        default=8000,
+        help="número máximo de tesis en que se ejecuta el bucle anterior",
+    )
+    args = parser.parse_args()
+
+    print(f"{'tesis':>7} {'nombres':>8} {'índice (s)':>11} {'bucle (s)':>10} {'x':>6}")
+    for size in args.sizes:
+        data = synthetic_theses(size)
+        names = {t["author"] for y in data.values() for t in y.values()}
+        names.update(
+            d for y in data.values() for t in y.values() for d in t["directors"]
+        )
+
+        start = perf_counter()
+        result = clean_data(copy.deepcopy(data))
+        seconds = perf_counter() - start
+
+        loop_seconds, speedup = "-", "-"
+        if size <= args.loop_max:
+            start = perf_counter()
+            expected = clean_data_loop(copy.deepcopy(data))
+            elapsed = perf_counter() - start
+            if json.dumps(result, indent=4) != json.dumps(expected, indent=4):
+                raise SystemExit(f"[ERROR] el json difiere del bucle con {size} tesis")
+            loop_seconds, speedup = f"{elapsed:.2f}", f"{elapsed / seconds:.0f}"
+
+        print(
+            f"{size:>7} {len(names):>8} {seconds:>11.2f} {loop_seconds:>10} {speedup:>6}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import random
+from typing import List, Tuple
+
+
+def thesis_relations(
+    n_theses: int, co_supervised: float = 0.3, seed: int = 0
+) -> List[Tuple[str, str]]:
+    """
+    Genera relaciones autor -> director sintéticas con la forma de la red de tesis,
+    para medir el rendimiento con más nodos de los que tiene el portal.
+
+    Cada tesis tiene un autor nuevo y uno o dos directores. Los directores se eligen
+    con probabilidad proporcional a las tesis que ya han dirigido más uno, entre
+    todas las personas que ya han aparecido, así que hay pocos directores con muchas
+    tesis y algunos autores acaban dirigiendo tesis, como en la red real.
+
+    Params:
+    -------
+    n_theses : int
+        Número de tesis (y de autores).
+    co_supervised : float
+        Proporción de tesis con dos directores.
+    seed : int
+        Semilla del generador.
+
+    Returns:
+    --------
+    List[Tuple[str, str]]
+        Las relaciones (autor, director), con unas n_theses + 1 personas.
+    """
+
+    rng = random.Random(seed)
+    people = ["Persona 0"]
+    # cada persona aparece una vez por estar y otra por cada tesis dirigida
+    tickets = [0]
+    relations = []
+
+    for i in range(1, n_theses + 1):
+        author = f"Persona {i}"
+        n_directors = 2 if rng.random() < co_supervised else 1
+        directors = {rng.choice(tickets) for _ in range(n_directors)}
+        for director in directors:
+            relations.append((author, people[director]))
+            tickets.append(director)
+        people.append(author)
+        tickets.append(i)
+
+    return relations
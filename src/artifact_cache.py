@@ -0,0 +1,315 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Iterable, List
+
+# directorio por defecto de la caché, relativo al directorio de trabajo
+CACHE_DIR = os.path.join(".cache", "artifacts")
+
+# tamaño máximo por defecto de la caché en disco
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+# número de firmas de ejecuciones completas que se conservan
+MAX_RUNS = 20
+
+# archivos que forman parte del código: Python y las plantillas de las páginas
+SOURCE_EXTENSIONS = (".py", ".html", ".js")
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Calcula una clave de caché a partir de cualquier combinación de valores serializables.
+
+    Params:
+    -------
+    *parts : Any
+        Los valores que identifican el artefacto (hashes de entrada, parámetros...).
+
+    Returns:
+    --------
+    str
+        El hash SHA-256 en hexadecimal de los valores en JSON canónico.
+    """
+
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    Calcula el hash SHA-256 del contenido de un archivo.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_digest(root: str) -> str:
+    """
+    Calcula un hash de todo el código de un directorio (ver `SOURCE_EXTENSIONS`).
+
+    Forma parte de las claves de la caché, así que cualquier cambio en el código
+    invalida los artefactos guardados con la versión anterior.
+
+    Params:
+    -------
+    root : str
+        El directorio del código (p. ej: src).
+
+    Returns:
+    --------
+    str
+        El hash SHA-256 de las rutas y el contenido de los archivos, en orden.
+    """
+
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for name in sorted(filenames):
+            if name.endswith(SOURCE_EXTENSIONS):
+                path = os.path.join(dirpath, name)
+                digest.update(os.path.relpath(path, root).encode("utf-8"))
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _signature(path: str) -> List[int]:
+    """
+    Tamaño y fecha de modificación de un archivo, para saber si ha cambiado. De un
+    directorio, el tamaño total, la fecha más reciente y el número de archivos.
+    """
+
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    size, mtime, count = 0, 0, 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            stat = os.stat(os.path.join(dirpath, name))
+            size, count = size + stat.st_size, count + 1
+            mtime = max(mtime, stat.st_mtime_ns)
+    return [size, mtime, count]
+
+
+class ArtifactCache:
+    """
+    Caché en disco de los resultados y archivos generados por cada paso del análisis.
+
+    Cada entrada se guarda en un directorio con el nombre de su clave (un hash de las
+    entradas del paso) y contiene el resultado serializado con pickle y una copia de
+    los archivos que generó (o de directorios enteros, cuando el número de archivos
+    depende del resultado). Cuando la caché supera `max_bytes` se borran las
+    entradas usadas hace más tiempo (LRU, según la fecha de su `meta.json`, que se
+    actualiza en cada acierto).
+
+    Además guarda, para cada ejecución completa, la firma (tamaño y fecha) de todos
+    sus archivos de salida, para detectar una ejecución sin cambios sin cargar nada.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, "runs"), exist_ok=True)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self._entry_dir(key), "meta.json")
+
+    def has(self, key: str) -> bool:
+        """
+        Indica si hay una entrada completa para la clave.
+        """
+
+        return os.path.exists(self._meta_path(key))
+
+    def load(self, key: str) -> Any:
+        """
+        Carga el resultado guardado de una entrada y la marca como usada.
+
+        Params:
+        -------
+        key : str
+            La clave de la entrada.
+
+        Returns:
+        --------
+        Any
+            El resultado del paso.
+        """
+
+        with open(os.path.join(self._entry_dir(key), "result.pkl"), "rb") as f:
+            result = pickle.load(f)
+        os.utime(self._meta_path(key))
+        return result
+
+    def restore(self, key: str) -> List[str]:
+        """
+        Copia a su sitio los archivos de una entrada que falten o hayan cambiado.
+
+        Params:
+        -------
+        key : str
+            La clave de la entrada.
+
+        Returns:
+        --------
+        List[str]
+            Las rutas de los archivos de la entrada.
+        """
+
+        with open(self._meta_path(key), "r") as f:
+            files = json.load(f)["files"]
+
+        for i, path in enumerate(files):
+            cached = os.path.join(self._entry_dir(key), "files", str(i))
+            # las copias conservan la fecha, así que si coinciden no hay que copiar
+            if os.path.exists(path) and _signature(path) == _signature(cached):
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if os.path.isdir(cached):
+                shutil.rmtree(path, ignore_errors=True)
+                shutil.copytree(cached, path)
+            else:
+                shutil.copy2(cached, path)
+
+        os.utime(self._meta_path(key))
+        return files
+
+    def store(self, key: str, result: Any, outputs: Iterable[str]) -> None:
+        """
+        Guarda el resultado y los archivos generados por un paso.
+
+        La entrada se escribe en un directorio temporal y se renombra al final, para
+        que una ejecución interrumpida no deje entradas a medias.
+
+        Params:
+        -------
+        key : str
+            La clave de la entrada.
+        result : Any
+            El resultado del paso (debe poder serializarse con pickle).
+        outputs : Iterable[str]
+            Las rutas de los archivos (o directorios) que ha generado el paso.
+
+        Returns:
+        --------
+        None
+        """
+
+        entry = self._entry_dir(key)
+        tmp = entry + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(os.path.join(tmp, "files"))
+
+        files = list(outputs)
+        for i, path in enumerate(files):
+            if os.path.isdir(path):
+                shutil.copytree(path, os.path.join(tmp, "files", str(i)))
+            else:
+                shutil.copy2(path, os.path.join(tmp, "files", str(i)))
+        with open(os.path.join(tmp, "result.pkl"), "wb") as f:
+            pickle.dump(result, f)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            f.write(json.dumps({"files": files}, ensure_ascii=False))
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+
+    def run_is_fresh(self, run_key: str) -> bool:
+        """
+        Indica si ya se hizo una ejecución con la misma clave y sus salidas siguen intactas.
+
+        Params:
+        -------
+        run_key : str
+            La clave de la ejecución (datos, código y opciones).
+
+        Returns:
+        --------
+        bool
+            True si todos los archivos de salida existen con el mismo tamaño y fecha.
+        """
+
+        path = os.path.join(self.root, "runs", run_key + ".json")
+        if not os.path.exists(path):
+            return False
+
+        with open(path, "r") as f:
+            signatures = json.load(f)
+        for output, signature in signatures.items():
+            if not os.path.exists(output) or _signature(output) != signature:
+                return False
+
+        os.utime(path)
+        return True
+
+    def save_run(self, run_key: str, outputs: Iterable[str]) -> None:
+        """
+        Guarda la firma de los archivos de salida de una ejecución terminada.
+
+        Params:
+        -------
+        run_key : str
+            La clave de la ejecución.
+        outputs : Iterable[str]
+            Las rutas de los archivos de salida.
+
+        Returns:
+        --------
+        None
+        """
+
+        signatures = {path: _signature(path) for path in outputs}
+        with open(os.path.join(self.root, "runs", run_key + ".json"), "w") as f:
+            f.write(json.dumps(signatures, ensure_ascii=False))
+
+    def evict(self) -> int:
+        """
+        Borra las entradas menos usadas hasta que la caché ocupe como mucho `max_bytes`.
+
+        Returns:
+        --------
+        int
+            El número de entradas borradas.
+        """
+
+        entries = []
+        for name in os.listdir(self.root):
+            meta = self._meta_path(name)
+            if name == "runs" or not os.path.exists(meta):
+                continue
+            size = 0
+            for dirpath, _, filenames in os.walk(self._entry_dir(name)):
+                size += sum(
+                    os.path.getsize(os.path.join(dirpath, f)) for f in filenames
+                )
+            entries.append((os.path.getmtime(meta), size, name))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+            total -= size
+            removed += 1
+
+        # las firmas de ejecuciones antiguas ocupan poco: guardamos solo las últimas
+        runs_dir = os.path.join(self.root, "runs")
+        runs = sorted(
+            os.listdir(runs_dir),
+            key=lambda name: os.path.getmtime(os.path.join(runs_dir, name)),
+        )
+        for name in runs[:-MAX_RUNS]:
+            os.remove(os.path.join(runs_dir, name))
+
+        return removed
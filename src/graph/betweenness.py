@@ -0,0 +1,545 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from graph.csr_graph import CSRGraph
+
+# grafo abierto en cada proceso del pool (ver `_attached_csr`): la descripción de
+# sus bloques de memoria compartida, los bloques y las vistas (indptr, indices)
+_attached = None
+
+
+def _neighbors(
+    indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Obtiene de una vez todas las aristas que salen de un conjunto de nodos.
+
+    Params:
+    -------
+    indptr : np.ndarray
+        Posición de inicio de los vecinos de cada nodo en `indices`.
+    indices : np.ndarray
+        Los vecinos de todos los nodos, uno detrás de otro.
+    frontier : np.ndarray
+        Los nodos de los que salen las aristas.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        El nodo de origen y el de destino de cada arista.
+    """
+
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    positions = np.arange(counts.sum()) + np.repeat(starts - offsets, counts)
+    return np.repeat(frontier, counts), indices[positions]
+
+
+def accumulate_sources(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    sources: Sequence[int],
+    squares: bool = False,
+    targets: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Acumula la dependencia de Brandes de un conjunto de nodos origen.
+
+    Las búsquedas en anchura avanzan por niveles sobre los arrays CSR: cada nivel
+    recorre con NumPy todas las aristas de la frontera, y la acumulación de
+    dependencias recorre los niveles en orden inverso de la misma forma. Los arrays
+    se leen tal cual, así que pueden ser vistas de la memoria compartida.
+
+    Params:
+    -------
+    indptr : np.ndarray
+        Posición de inicio de los vecinos (sucesores) de cada nodo en `indices`.
+    indices : np.ndarray
+        Los vecinos de todos los nodos, uno detrás de otro.
+    sources : Sequence[int]
+        Los nodos desde los que se lanzan las búsquedas en anchura.
+    squares : bool
+        Si es True, acumula también el cuadrado de la dependencia de cada origen,
+        que la versión aproximada usa para estimar la varianza.
+    targets : Optional[Sequence[float]]
+        El peso de cada nodo como destino: los caminos hasta él cuentan esas veces
+        (1 para todos si no se da, la intermediación normal).
+
+    Returns:
+    --------
+    np.ndarray
+        La intermediación sin normalizar de cada nodo debida solo a esos orígenes.
+        Con `squares` es un array de dos filas: las sumas y las sumas de cuadrados.
+    """
+
+    n = len(indptr) - 1
+    betweenness = np.zeros(n)
+    betweenness_sq = np.zeros(n) if squares else None
+    weight = np.ones(n) if targets is None else np.asarray(targets, dtype=float)
+
+    # los arrays se reutilizan entre orígenes y solo se limpian los nodos visitados,
+    # así el coste de cada búsqueda depende del tamaño de su componente y no de n
+    sigma = np.zeros(n)
+    dist = np.full(n, -1, dtype=np.int64)
+    delta = np.zeros(n)
+
+    for s in sources:
+        sigma[s] = 1.0
+        dist[s] = 0
+        frontier = np.array([s])
+        visited = [frontier]
+        levels = []  # aristas de los caminos mínimos entre cada nivel y el siguiente
+
+        # búsqueda en anchura contando caminos mínimos
+        while True:
+            owners, reached = _neighbors(indptr, indices, frontier)
+            frontier = np.unique(reached[dist[reached] < 0])
+            if not len(frontier):
+                break
+            dist[frontier] = len(visited)
+            shortest = dist[reached] == len(visited)
+            u, w = owners[shortest], reached[shortest]
+            np.add.at(sigma, w, sigma[u])
+            levels.append((u, w))
+            visited.append(frontier)
+
+        # acumulación de dependencias en orden inverso de distancia
+        for u, w in reversed(levels):
+            np.add.at(delta, u, sigma[u] / sigma[w] * (weight[w] + delta[w]))
+
+        order = np.concatenate(visited)
+        others = order[1:]
+        betweenness[others] += delta[others]
+        if squares:
+            betweenness_sq[others] += delta[others] ** 2
+
+        sigma[order] = 0.0
+        dist[order] = -1
+        delta[order] = 0.0
+
+    if squares:
+        return np.array([betweenness, betweenness_sq])
+    return betweenness
+
+
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, tuple]:
+    """
+    Copia un array a un bloque de memoria compartida.
+
+    Returns:
+    --------
+    Tuple[shared_memory.SharedMemory, tuple]
+        El bloque (que debe cerrarse y liberarse al terminar) y la descripción
+        (nombre, forma, tipo) con la que los procesos del pool lo abren.
+    """
+
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[:] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_array(spec: tuple) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Abre desde un proceso del pool un array publicado con `_share_array`, sin copiarlo.
+
+    Returns:
+    --------
+    Tuple[shared_memory.SharedMemory, np.ndarray]
+        El bloque, que debe seguir abierto mientras se use el array, y la vista.
+    """
+
+    name, shape, dtype = spec
+    # el bloque es del proceso principal, que lo libera al terminar el cálculo
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _attached_csr(specs: Tuple[tuple, tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Obtiene en un proceso del pool las vistas del grafo en la memoria compartida.
+
+    Se abren con el primer bloque de orígenes del grafo y se reutilizan con los
+    siguientes; si llega otro grafo, se cierran las del anterior.
+    """
+
+    global _attached
+    if _attached is None or _attached[0] != specs:
+        if _attached is not None:
+            _, blocks, arrays = _attached
+            _attached = None
+            del arrays
+            for shm in blocks:
+                shm.close()
+        blocks, arrays = zip(*map(_attach_array, specs))
+        _attached = (specs, blocks, arrays)
+    return _attached[2]
+
+
+def _accumulate_chunk(
+    specs: Tuple[tuple, tuple],
+    sources: Sequence[int],
+    squares: bool,
+    targets: Optional[Sequence[float]],
+) -> np.ndarray:
+    """
+    Tarea del pool: acumula un bloque de orígenes sobre el grafo compartido.
+    """
+
+    return accumulate_sources(*_attached_csr(specs), sources, squares, targets)
+
+
+class BrandesPool:
+    """
+    Procesos que acumulan bloques de orígenes de Brandes sobre un mismo grafo.
+
+    Los arrays CSR del grafo se publican en memoria compartida y cada proceso los abre
+    con su primer bloque y recorre directamente, en lugar de recibir el grafo
+    serializado con cada tarea o hacerse su propia copia. Con un solo proceso los
+    bloques se calculan en el proceso principal sobre los arrays del grafo.
+
+    Los bloques se reparten en `executor` si se da (p. ej: el pool del planificador
+    de tareas, ver `scheduler.run_tasks`), así que no se crean más procesos que los
+    suyos; si no, en un pool propio de `jobs` procesos. Se usa como context manager
+    para liberar los procesos propios y la memoria compartida al terminar.
+    """
+
+    def __init__(
+        self,
+        graph: CSRGraph,
+        jobs: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+    ):
+        self.graph = graph
+        self.jobs = jobs or os.cpu_count() or 1
+        self._executor = executor
+        self._own_executor = None
+        self._specs = None
+        self._shared = []
+
+    def __enter__(self) -> "BrandesPool":
+        if self._executor is None and self.jobs == 1:
+            return self
+
+        try:
+            specs = []
+            for array in (self.graph.indptr, self.graph.indices):
+                shm, spec = _share_array(array)
+                self._shared.append(shm)
+                specs.append(spec)
+            self._specs = tuple(specs)
+
+            if self._executor is None:
+                self._own_executor = ProcessPoolExecutor(max_workers=self.jobs)
+                self._executor = self._own_executor
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def accumulate(
+        self,
+        chunks: List[Sequence[int]],
+        squares: bool = False,
+        targets: Optional[Sequence[float]] = None,
+    ) -> np.ndarray:
+        """
+        Acumula varios bloques de orígenes y suma los resultados parciales.
+
+        Params:
+        -------
+        chunks : List[Sequence[int]]
+            Los bloques de orígenes; cada bloque es una tarea.
+        squares : bool
+            Si es True, acumula también los cuadrados (ver `accumulate_sources`).
+        targets : Optional[Sequence[float]]
+            El peso de cada nodo como destino (ver `accumulate_sources`). Se envía
+            con cada bloque, así que conviene usar pocos bloques.
+
+        Returns:
+        --------
+        np.ndarray
+            La suma de las acumulaciones de todos los bloques.
+        """
+
+        if self._executor is None:
+            graph = self.graph
+            partials = (
+                accumulate_sources(graph.indptr, graph.indices, chunk, squares, targets)
+                for chunk in chunks
+            )
+        else:
+            partials = self._executor.map(
+                _accumulate_chunk,
+                [self._specs] * len(chunks),
+                chunks,
+                [squares] * len(chunks),
+                [targets] * len(chunks),
+            )
+
+        n = self.graph.number_of_nodes()
+        total = np.zeros((2, n) if squares else n)
+        for partial in partials:
+            total += partial
+        return total
+
+    def close(self) -> None:
+        """
+        Termina los procesos propios y libera la memoria compartida.
+        """
+
+        if self._own_executor is not None:
+            self._own_executor.shutdown()
+            self._own_executor = None
+            self._executor = None
+        for shm in self._shared:
+            shm.close()
+            shm.unlink()
+        self._shared = []
+
+
+def split_sources(sources: Sequence[int], num_chunks: int) -> List[List[int]]:
+    """
+    Reparte los orígenes en bloques intercalados, para que cada bloque tenga nodos de
+    todas las componentes y los bloques tarden más o menos lo mismo.
+
+    Params:
+    -------
+    sources : Sequence[int]
+        Los nodos origen.
+    num_chunks : int
+        El número de bloques deseado.
+
+    Returns:
+    --------
+    List[List[int]]
+        Los bloques no vacíos.
+    """
+
+    num_chunks = max(1, min(len(sources), num_chunks))
+    return [list(sources[i::num_chunks]) for i in range(num_chunks)]
+
+
+def rescale(
+    betweenness: np.ndarray, n: int, normalized: bool, directed: bool
+) -> np.ndarray:
+    """
+    Escala la intermediación como `nx.betweenness_centrality` (sin contar los extremos).
+
+    Params:
+    -------
+    betweenness : np.ndarray
+        La intermediación acumulada desde todos los orígenes.
+    n : int
+        El número de nodos del grafo.
+    normalized : bool
+        Si es True, divide entre el número de pares (s, t) posibles, (n-1)(n-2).
+    directed : bool
+        En grafos no dirigidos sin normalizar cada par se cuenta dos veces.
+
+    Returns:
+    --------
+    np.ndarray
+        La intermediación escalada.
+    """
+
+    if n <= 2:
+        return betweenness
+    if normalized:
+        return betweenness / ((n - 1) * (n - 2))
+    if not directed:
+        return betweenness / 2
+    return betweenness
+
+
+def betweenness_centrality(
+    graph: CSRGraph,
+    normalized: bool = True,
+    jobs: Optional[int] = 1,
+    num_chunks: int = 128,
+    executor: Optional[Executor] = None,
+) -> Dict[str, float]:
+    """
+    Calcula la centralidad de intermediación con el algoritmo de Brandes repartiendo
+    los nodos origen entre varios procesos.
+
+    Cada tarea del pool (`BrandesPool`) acumula un bloque de orígenes y las sumas
+    parciales se reducen en el proceso principal. El resultado coincide con `nx.betweenness_centrality` salvo por el
+    redondeo de coma flotante.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo compacto, dirigido o no dirigido.
+    normalized : bool
+        Si es True, normaliza como NetworkX dividiendo entre (n-1)(n-2).
+    jobs : Optional[int]
+        Número de procesos. Con 1 se calcula en el propio proceso y con None se
+        usan todos los núcleos.
+    num_chunks : int
+        Bloques (tareas) en que se reparten los orígenes. Más bloques reparten mejor
+        la carga cuando las componentes tienen tamaños muy distintos. No depende de
+        `jobs`, así que las sumas se hacen siempre en el mismo orden y el resultado
+        es idéntico con cualquier número de procesos.
+    executor : Optional[Executor]
+        Pool de procesos ya creado en el que repartir los bloques (ver `BrandesPool`).
+
+    Returns:
+    --------
+    Dict[str, float]
+        Un diccionario que mapea cada nodo a su centralidad de intermediación.
+    """
+
+    n = graph.number_of_nodes()
+
+    # los nodos sin vecinos no aportan caminos
+    sources = np.flatnonzero(graph.out_degree()).tolist()
+
+    with BrandesPool(graph, jobs, executor) as pool:
+        chunks = split_sources(sources, num_chunks)
+        betweenness = pool.accumulate(chunks)
+
+    betweenness = rescale(betweenness, n, normalized, graph.directed)
+    return graph.to_dict(betweenness)
+
+
+def approximate_betweenness(
+    graph: CSRGraph,
+    confidence: float = 0.95,
+    top_k: int = 10,
+    epsilon: Optional[float] = None,
+    normalized: bool = True,
+    batch_size: int = 256,
+    patience: int = 5,
+    jobs: Optional[int] = 1,
+    num_chunks: int = 32,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, Any]]:
+    """
+    Estima la centralidad de intermediación a partir de una muestra de nodos origen.
+
+    Los orígenes se toman en orden aleatorio y por lotes. La intermediación de cada nodo es proporcional a la media de su dependencia
+    sobre los orígenes, así que tras cada lote se estima esa media y una cota de error
+    de Bernstein empírica (con la varianza observada y la dependencia máxima posible,
+    el tamaño de la mayor componente). Las cotas se ajustan por el número de nodos
+    (Bonferroni), de modo que se cumplen todas a la vez con la confianza pedida.
+
+    El muestreo termina cuando:
+        - "separado": los `top_k` primeros están separados del resto por sus cotas,
+          con lo que el top-k es correcto con la confianza pedida.
+        - "precision": todas las cotas son menores que `epsilon`.
+        - "estable": el conjunto de los `top_k` primeros no cambia en `patience`
+          lotes seguidos (sin garantía de confianza).
+        - "exacto": se han usado todos los orígenes; el resultado es el exacto.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo compacto, dirigido o no dirigido.
+    confidence : float
+        Probabilidad con la que se cumplen a la vez las cotas de error de todos los nodos.
+    top_k : int
+        Número de nodos del ranking cuya estabilidad se comprueba.
+    epsilon : Optional[float]
+        Error máximo admitido en la escala del resultado. Con None no se usa.
+    normalized : bool
+        Si es True, normaliza como NetworkX dividiendo entre (n-1)(n-2).
+    batch_size : int
+        Orígenes de cada lote.
+    patience : int
+        Lotes seguidos sin cambios en el top-k para dar el ranking por estable.
+    jobs : Optional[int]
+        Número de procesos (ver `BrandesPool`).
+    num_chunks : int
+        Bloques (tareas) en que se reparte cada lote; como en el cálculo exacto, no
+        depende de `jobs` para que el resultado tampoco dependa.
+    seed : int
+        Semilla del orden aleatorio de los orígenes.
+    executor : Optional[Executor]
+        Pool de procesos ya creado en el que repartir los bloques (ver `BrandesPool`).
+
+    Returns:
+    --------
+    Tuple[Dict[str, float], Dict[str, float], Dict[str, Any]]
+        La intermediación estimada de cada nodo, su cota de error y un resumen del
+        muestreo ("samples", "sources", "confidence" y "stop").
+    """
+
+    n = graph.number_of_nodes()
+    sources = np.flatnonzero(graph.out_degree())
+    order = np.random.default_rng(seed).permutation(sources).tolist()
+    total = len(order)
+
+    # la dependencia de un origen nunca supera los nodos de su componente menos dos
+    _, labels = connected_components(
+        graph.adjacency_matrix(), directed=True, connection="weak"
+    )
+    max_dependency = max(int(np.bincount(labels).max()) - 2, 0) if n else 0
+    log_term = np.log(3 * max(n, 1) / (1 - confidence))
+
+    # la intermediación es `total` veces la dependencia media, escalada como NetworkX
+    scale = total * rescale(np.ones(1), n, normalized, graph.directed)[0]
+
+    sums = np.zeros((2, n))
+    samples = 0
+    previous_top, stable_rounds = None, 0
+    stop = "exacto"
+
+    with BrandesPool(graph, jobs, executor) as pool:
+        while samples < total:
+            batch_sources = order[samples : samples + batch_size]
+            chunks = split_sources(batch_sources, num_chunks)
+            sums += pool.accumulate(chunks, squares=True)
+            samples += len(batch_sources)
+
+            if samples == total:
+                stop = "exacto"
+                break
+
+            mean = sums[0] / samples
+            variance = np.maximum(sums[1] / samples - mean**2, 0)
+            radius = (
+                np.sqrt(2 * variance * log_term / samples)
+                + 3 * max_dependency * log_term / samples
+            )
+            estimate, error = mean * scale, radius * scale
+
+            ranking = np.argsort(-estimate, kind="stable")
+            top, rest = ranking[:top_k], ranking[top_k:]
+            if len(rest) == 0 or np.min(estimate[top] - error[top]) > np.max(
+                estimate[rest] + error[rest]
+            ):
+                stop = "separado"
+                break
+            if epsilon is not None and error.max() <= epsilon:
+                stop = "precision"
+                break
+
+            top_set = set(top.tolist())
+            stable_rounds = stable_rounds + 1 if top_set == previous_top else 0
+            previous_top = top_set
+            if stable_rounds >= patience:
+                stop = "estable"
+                break
+
+    if stop == "exacto":
+        estimate = rescale(sums[0], n, normalized, graph.directed)
+        error = np.zeros(n)
+
+    info = {
+        "samples": samples,
+        "sources": total,
+        "confidence": confidence,
+        "stop": stop,
+    }
+    return graph.to_dict(estimate), graph.to_dict(error), info
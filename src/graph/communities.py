@@ -0,0 +1,405 @@
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+from community import community_louvain
+from scipy import sparse
+
+# resoluciones de Louvain del barrido y ejecuciones (semillas) por resolución
+RESOLUTIONS = (0.8, 1.0, 1.2)
+RUNS = 10
+
+# fracción mínima de ejecuciones en que dos vecinos caen juntos para que su arista
+# se conserve en el grafo de consenso
+THRESHOLD = 0.5
+
+# semilla de la partición de consenso (las del barrido son 0, 1, 2...)
+SEED = 0
+
+
+def communities_path(filename: str) -> str:
+    """
+    Obtiene la ruta donde se guardan las comunidades de consenso de un grafo.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+
+    Returns:
+    --------
+    str
+        La ruta del archivo de comunidades (p. ej: data/thesis.communities.json).
+    """
+
+    root, _ = os.path.splitext(filename)
+    return f"{root}.communities.json"
+
+
+def louvain_run(
+    graph: nx.Graph, resolution: float, seed: int
+) -> Tuple[np.ndarray, float]:
+    """
+    Ejecuta Louvain con una resolución y una semilla.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo no dirigido.
+    resolution : float
+        La resolución de Louvain (más alta, comunidades más pequeñas).
+    seed : int
+        La semilla, que fija el orden en que se visitan los nodos.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, float]
+        La comunidad de cada nodo, en el orden de los nodos del grafo, y la
+        modularidad de la partición (con resolución 1, para poder comparar las
+        ejecuciones entre sí).
+    """
+
+    partition = community_louvain.best_partition(
+        graph, resolution=resolution, random_state=seed
+    )
+    labels = np.fromiter(
+        (partition[node] for node in graph), dtype=np.int32, count=len(partition)
+    )
+    return labels, community_louvain.modularity(partition, graph)
+
+
+def _louvain_task(
+    graph: nx.Graph, runs: List[Tuple[float, int]]
+) -> List[Tuple[np.ndarray, float]]:
+    """
+    Ejecuta un bloque de ejecuciones del barrido en un proceso del pool.
+    """
+
+    return [louvain_run(graph, *run) for run in runs]
+
+
+def louvain_sweep(
+    graph: nx.Graph,
+    resolutions: Sequence[float] = RESOLUTIONS,
+    runs: int = RUNS,
+    jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> Tuple[np.ndarray, List[dict]]:
+    """
+    Ejecuta Louvain `runs` veces (semillas 0 a runs - 1) con cada resolución.
+
+    Con más de un proceso las ejecuciones se reparten en `jobs` bloques, así que el
+    grafo se envía una vez por bloque y no con cada ejecución. Los bloques van a
+    `executor` si se da (p. ej: el pool del planificador de tareas), sin crear más
+    procesos, o a un pool propio. Cada ejecución tiene su semilla, así que el
+    resultado no depende de `jobs` ni del orden en que terminen.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo no dirigido.
+    resolutions : Sequence[float]
+        Las resoluciones del barrido.
+    runs : int
+        Ejecuciones por resolución.
+    jobs : Optional[int]
+        Número de procesos. Con None se usan todos los núcleos.
+    executor : Optional[Executor]
+        Pool de procesos ya creado en el que repartir las ejecuciones.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, List[dict]]
+        La comunidad de cada nodo en cada ejecución (una fila por ejecución) y la
+        resolución, semilla, número de comunidades y modularidad de cada una.
+    """
+
+    params = [(resolution, seed) for resolution in resolutions for seed in range(runs)]
+    jobs = min(jobs or os.cpu_count() or 1, len(params))
+    if executor is None and jobs <= 1:
+        results = [louvain_run(graph, *run) for run in params]
+    else:
+        # bloques intercalados: cada uno tiene ejecuciones de todas las resoluciones
+        chunks = [params[i::jobs] for i in range(jobs)]
+        context = nullcontext(executor) if executor else ProcessPoolExecutor(jobs)
+        with context as pool:
+            partials = list(pool.map(_louvain_task, [graph] * jobs, chunks))
+        # deshacemos el intercalado para volver al orden de `params`
+        results = [None] * len(params)
+        for i, partial in enumerate(partials):
+            results[i::jobs] = partial
+
+    labels = np.vstack([run_labels for run_labels, _ in results])
+    info = [
+        dict(
+            resolution=resolution,
+            seed=seed,
+            communities=int(run_labels.max()) + 1,
+            modularity=round(modularity, 6),
+        )
+        for (resolution, seed), (run_labels, modularity) in zip(params, results)
+    ]
+    return labels, info
+
+
+def coassociation(
+    labels: np.ndarray, src: np.ndarray, dst: np.ndarray, n: int
+) -> sparse.csr_array:
+    """
+    Calcula la matriz de co-asociación de las ejecuciones sobre las aristas del grafo.
+
+    El valor de (i, j) es la fracción de ejecuciones en que i y j caen en la misma
+    comunidad. Solo se calcula para los pares que son aristas del grafo: la matriz
+    completa tendría un valor por cada par de miembros de cada comunidad, mientras
+    que así es dispersa como el grafo y ocupa lo mismo que él.
+
+    Params:
+    -------
+    labels : np.ndarray
+        La comunidad de cada nodo en cada ejecución (ver `louvain_sweep`).
+    src, dst : np.ndarray
+        Los extremos de cada arista, como índices de los nodos.
+    n : int
+        El número de nodos.
+
+    Returns:
+    --------
+    sparse.csr_array
+        La matriz n x n (triangular: cada arista aparece una vez, como (src, dst)).
+    """
+
+    together = np.zeros(len(src), dtype=np.int32)
+    for run_labels in labels:
+        together += run_labels[src] == run_labels[dst]
+    values = together / len(labels)
+    return sparse.csr_array((values, (src, dst)), shape=(n, n))
+
+
+def community_stability(
+    consensus: np.ndarray, src: np.ndarray, dst: np.ndarray, agreement: np.ndarray
+) -> List[float]:
+    """
+    Calcula la estabilidad de cada comunidad de consenso.
+
+    Es la media, sobre las aristas con algún extremo en la comunidad, de la fracción
+    de ejecuciones que coinciden con el consenso: las aristas internas cuentan
+    cuando sus extremos caen juntos y las que salen de la comunidad, cuando caen
+    separados. Vale 1 si todas las ejecuciones encuentran exactamente esa comunidad.
+
+    Params:
+    -------
+    consensus : np.ndarray
+        La comunidad de consenso de cada nodo.
+    src, dst : np.ndarray
+        Los extremos de cada arista, como índices de los nodos.
+    agreement : np.ndarray
+        La co-asociación de cada arista (ver `coassociation`).
+
+    Returns:
+    --------
+    List[float]
+        La estabilidad de cada comunidad, por su número.
+    """
+
+    a, b = consensus[src], consensus[dst]
+    inside = a == b
+    agree = np.where(inside, agreement, 1 - agreement)
+
+    # cada arista cuenta para la comunidad de src y, si sale de ella, para la de dst
+    k = int(consensus.max()) + 1
+    sums = np.bincount(a, agree, k) + np.bincount(b[~inside], agree[~inside], k)
+    counts = np.bincount(a, minlength=k) + np.bincount(b[~inside], minlength=k)
+    return [
+        round(float(total / count), 6) if count else 1.0
+        for total, count in zip(sums, counts)
+    ]
+
+
+def detect_communities(
+    graph: nx.Graph,
+    resolutions: Sequence[float] = RESOLUTIONS,
+    runs: int = RUNS,
+    threshold: float = THRESHOLD,
+    jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> dict:
+    """
+    Obtiene una partición de consenso de Louvain y la estabilidad de sus comunidades.
+
+    Louvain da una partición distinta con cada semilla y con cada resolución. Se
+    ejecuta el barrido completo (ver `louvain_sweep`) y se calcula con qué
+    frecuencia cae cada par de vecinos en la misma comunidad (ver `coassociation`).
+    El consenso es Louvain, con semilla fija, sobre el grafo de esas frecuencias sin
+    las aristas que no llegan a `threshold`: los pares que casi siempre van juntos
+    quedan juntos y los que dependen de la semilla dejan de forzar la partición.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo no dirigido.
+    resolutions : Sequence[float]
+        Las resoluciones del barrido.
+    runs : int
+        Ejecuciones (semillas) por resolución.
+    threshold : float
+        Co-asociación mínima de las aristas del grafo de consenso.
+    jobs : Optional[int]
+        Número de procesos del barrido.
+    executor : Optional[Executor]
+        Pool de procesos ya creado para el barrido (ver `louvain_sweep`).
+
+    Returns:
+    --------
+    dict
+        La comunidad de cada nodo ("partition"), la estabilidad de cada comunidad
+        ("stability", ver `community_stability`), la modularidad del consenso
+        ("modularity") y la resolución, semilla, número de comunidades y modularidad
+        de cada ejecución ("runs").
+    """
+
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    src = np.fromiter((index[u] for u, _ in graph.edges()), dtype=np.int64)
+    dst = np.fromiter((index[v] for _, v in graph.edges()), dtype=np.int64)
+
+    labels, info = louvain_sweep(graph, resolutions, runs, jobs, executor)
+    matrix = coassociation(labels, src, dst, len(nodes))
+    agreement = matrix[src, dst]
+
+    keep = agreement >= threshold
+    consensus_graph = nx.Graph()
+    consensus_graph.add_nodes_from(nodes)
+    consensus_graph.add_weighted_edges_from(
+        zip(
+            (nodes[i] for i in src[keep]),
+            (nodes[j] for j in dst[keep]),
+            agreement[keep].tolist(),
+        )
+    )
+    partition = community_louvain.best_partition(consensus_graph, random_state=SEED)
+    consensus = np.fromiter(
+        (partition[node] for node in nodes), dtype=np.int64, count=len(nodes)
+    )
+
+    return {
+        "partition": partition,
+        "stability": community_stability(consensus, src, dst, agreement),
+        "modularity": round(community_louvain.modularity(partition, graph), 6),
+        "runs": info,
+    }
+
+
+def get_communities(
+    graph: nx.Graph,
+    filename: str,
+    digest: str,
+    resolutions: Sequence[float] = RESOLUTIONS,
+    runs: int = RUNS,
+    threshold: float = THRESHOLD,
+    jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> dict:
+    """
+    Obtiene las comunidades de consenso de un grafo: las guardadas si ni el grafo ni
+    los parámetros han cambiado, o las calcula (ver `detect_communities`) y las guarda.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo no dirigido.
+    filename : str
+        La ruta del archivo JSON de tesis junto al que se guardan las comunidades.
+    digest : str
+        El hash de las relaciones del grafo (ver `relations_digest`).
+    resolutions : Sequence[float]
+        Las resoluciones del barrido.
+    runs : int
+        Ejecuciones (semillas) por resolución.
+    threshold : float
+        Co-asociación mínima de las aristas del grafo de consenso.
+    jobs : Optional[int]
+        Número de procesos del barrido (no cambia el resultado).
+    executor : Optional[Executor]
+        Pool de procesos ya creado para el barrido (ver `louvain_sweep`).
+
+    Returns:
+    --------
+    dict
+        Las comunidades de consenso (ver `detect_communities`).
+    """
+
+    path = communities_path(filename)
+    params = dict(
+        digest=digest,
+        resolutions=[float(r) for r in resolutions],
+        runs=runs,
+        threshold=threshold,
+    )
+
+    saved = None
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            saved = json.load(f)
+    if saved is not None and all(saved.get(key) == params[key] for key in params):
+        return saved["communities"]
+
+    print(f"[INFO] Calculando las comunidades de consenso: {path}")
+    result = detect_communities(graph, resolutions, runs, threshold, jobs, executor)
+
+    # escribimos en un temporal y renombramos, para no dejar el archivo a medias
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        f.write(json.dumps(dict(params, communities=result), ensure_ascii=False))
+    os.replace(path + ".tmp", path)
+    return result
+
+
+def stability_metric(
+    communities: dict, degrees: Dict[str, float]
+) -> Tuple[List[tuple], List[str]]:
+    """
+    Ordena las comunidades de consenso por su estabilidad, con la forma de
+    `metrics.compute_metric`.
+
+    Cada comunidad se nombra por su número, su miembro de mayor grado y su número
+    de miembros; la cabecera resume el barrido.
+
+    Params:
+    -------
+    communities : dict
+        Las comunidades de consenso (ver `detect_communities`).
+    degrees : Dict[str, float]
+        La centralidad de grado de cada nodo.
+
+    Returns:
+    --------
+    Tuple[List[tuple], List[str]]
+        La lista de tuplas (comunidad, estabilidad) ordenada y las líneas de cabecera.
+    """
+
+    members = dict()
+    for node, community in communities["partition"].items():
+        members.setdefault(community, []).append(node)
+
+    values = []
+    for community, stability in enumerate(communities["stability"]):
+        hub = max(members[community], key=lambda node: degrees.get(node, 0))
+        values.append((f"{community} {hub} ({len(members[community])})", stability))
+    values.sort(key=lambda x: x[1], reverse=True)
+
+    runs = communities["runs"]
+    modularity = [run["modularity"] for run in runs]
+    resolutions = sorted({run["resolution"] for run in runs})
+    header = [
+        f"estabilidad de las comunidades de consenso: {len(runs)} ejecuciones de "
+        f"Louvain con resoluciones {', '.join(str(r) for r in resolutions)}",
+        f"modularidad de las ejecuciones: {min(modularity)} - {max(modularity)}; "
+        f"del consenso: {communities['modularity']}",
+        "comunidad (número, miembro de mayor grado y miembros): fracción de las "
+        "ejecuciones que coinciden con ella",
+    ]
+    return values, header
@@ -0,0 +1,281 @@
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+
+def build_csr(
+    src: np.ndarray, dst: np.ndarray, n: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Construye los arrays CSR (indptr, indices) de una lista de aristas.
+
+    Params:
+    -------
+    src : np.ndarray
+        Los ids de los nodos origen de cada arista.
+    dst : np.ndarray
+        Los ids de los nodos destino de cada arista.
+    n : int
+        El número de nodos.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        `indptr` (n + 1 posiciones) e `indices`: los vecinos del nodo i son
+        `indices[indptr[i]:indptr[i + 1]]`.
+    """
+
+    order = np.argsort(src, kind="stable")
+    indices = dst[order].astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, indices
+
+
+class CSRGraph:
+    """
+    Grafo compacto con los nodos numerados de 0 a n-1 y las aristas en arrays CSR de NumPy.
+
+    Los nombres se guardan una sola vez en `names` y las aristas como enteros, lo
+    que ocupa unos pocos bytes por arista frente a los cientos de un grafo de
+    NetworkX. En grafos dirigidos se guardan los sucesores (`indptr`, `indices`) y
+    los predecesores (`rev_indptr`, `rev_indices`). En no dirigidos cada arista se
+    guarda en los dos sentidos y los predecesores son los mismos arrays.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        src: np.ndarray,
+        dst: np.ndarray,
+        directed: bool,
+    ):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.directed = directed
+
+        n = len(names)
+        if directed:
+            self.indptr, self.indices = build_csr(src, dst, n)
+            self.rev_indptr, self.rev_indices = build_csr(dst, src, n)
+        else:
+            both_src = np.concatenate([src, dst])
+            both_dst = np.concatenate([dst, src])
+            self.indptr, self.indices = build_csr(both_src, both_dst, n)
+            self.rev_indptr, self.rev_indices = self.indptr, self.indices
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> "CSRGraph":
+        """
+        Convierte un grafo de NetworkX (dirigido o no) a CSR.
+
+        Params:
+        -------
+        graph : nx.Graph
+            El grafo a convertir. El orden de los ids es el de `graph.nodes`.
+
+        Returns:
+        --------
+        CSRGraph
+            El grafo compacto.
+        """
+
+        names = list(graph.nodes)
+        index = {name: i for i, name in enumerate(names)}
+        m = graph.number_of_edges()
+        src = np.fromiter((index[u] for u, _ in graph.edges), np.int64, count=m)
+        dst = np.fromiter((index[v] for _, v in graph.edges), np.int64, count=m)
+        return cls(names, src, dst, graph.is_directed())
+
+    @classmethod
+    def from_relations(cls, relations: Iterable[tuple], directed: bool) -> "CSRGraph":
+        """
+        Construye el grafo compacto directamente de las relaciones autor-director.
+
+        Params:
+        -------
+        relations : Iterable[tuple]
+            Una secuencia de tuplas (autor, director).
+        directed : bool
+            Indica si el grafo es dirigido o no dirigido.
+
+        Returns:
+        --------
+        CSRGraph
+            El grafo compacto, con los nodos en orden de aparición (como en NetworkX).
+        """
+
+        index = dict()
+        src, dst = [], []
+        for author, director in relations:
+            src.append(index.setdefault(author, len(index)))
+            dst.append(index.setdefault(director, len(index)))
+
+        pairs = np.array([src, dst], dtype=np.int64).reshape(2, -1).T
+        if not directed:
+            # en un grafo no dirigido (a, b) y (b, a) son la misma arista
+            pairs = np.sort(pairs, axis=1)
+        # quitamos aristas repetidas, como hace NetworkX
+        pairs = np.unique(pairs, axis=0)
+        src, dst = pairs[:, 0], pairs[:, 1]
+
+        return cls(list(index), src, dst, directed)
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Convierte el grafo compacto a un grafo de NetworkX con los nombres originales.
+
+        Returns:
+        --------
+        nx.Graph
+            Un nx.DiGraph si el grafo es dirigido y un nx.Graph si no lo es.
+        """
+
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.add_nodes_from(self.names)
+
+        src = np.repeat(np.arange(len(self.names)), np.diff(self.indptr))
+        names = self.names
+        graph.add_edges_from(
+            (names[u], names[v]) for u, v in zip(src.tolist(), self.indices.tolist())
+        )
+        return graph
+
+    def number_of_nodes(self) -> int:
+        """
+        Número de nodos del grafo.
+        """
+
+        return len(self.names)
+
+    def number_of_edges(self) -> int:
+        """
+        Número de aristas del grafo (en no dirigidos, cada una cuenta una vez).
+        """
+
+        edges = len(self.indices)
+        return edges if self.directed else edges // 2
+
+    def is_directed(self) -> bool:
+        """
+        Indica si el grafo es dirigido, como `nx.Graph.is_directed`.
+        """
+
+        return self.directed
+
+    def out_degree(self) -> np.ndarray:
+        """
+        Grado de salida de cada nodo (el grado en grafos no dirigidos).
+        """
+
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """
+        Grado de entrada de cada nodo (el grado en grafos no dirigidos).
+        """
+
+        return np.diff(self.rev_indptr)
+
+    def adjacency_matrix(self, reverse: bool = False) -> sparse.csr_matrix:
+        """
+        Matriz de adyacencia dispersa de SciPy que comparte los arrays CSR del grafo.
+
+        Params:
+        -------
+        reverse : bool
+            Si es True, devuelve la matriz del grafo con las aristas invertidas
+            (usa los arrays de predecesores).
+
+        Returns:
+        --------
+        sparse.csr_matrix
+            Una matriz n x n con un 1 en (u, v) por cada arista u -> v.
+        """
+
+        n = len(self.names)
+        indptr, indices = (
+            (self.rev_indptr, self.rev_indices)
+            if reverse
+            else (self.indptr, self.indices)
+        )
+        data = np.ones(len(indices), dtype=np.int8)
+        return sparse.csr_matrix((data, indices, indptr), shape=(n, n))
+
+    def to_dict(self, values: np.ndarray) -> Dict[str, float]:
+        """
+        Asocia a cada nombre su valor de un array indexado por id.
+
+        Params:
+        -------
+        values : np.ndarray
+            Un valor por nodo, en el orden de los ids.
+
+        Returns:
+        --------
+        Dict[str, float]
+            Un diccionario que mapea cada nombre a su valor.
+        """
+
+        return dict(zip(self.names, values.tolist()))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memoria aproximada ocupada por el grafo (arrays y tabla de nombres), en bytes.
+        """
+
+        arrays = [self.indptr, self.indices]
+        if self.directed:
+            arrays += [self.rev_indptr, self.rev_indices]
+        names = sum(sys.getsizeof(name) for name in self.names)
+        return sum(a.nbytes for a in arrays) + names + sys.getsizeof(self.index)
+
+
+def degree_centrality(graph: CSRGraph) -> Dict[str, float]:
+    """
+    Calcula la centralidad de grado de un grafo compacto, igual que `nx.degree_centrality`.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo compacto.
+
+    Returns:
+    --------
+    Dict[str, float]
+        Un diccionario que mapea cada nodo a su centralidad de grado.
+    """
+
+    n = graph.number_of_nodes()
+    if n <= 1:
+        return {name: 1.0 for name in graph.names}
+
+    degree = graph.out_degree()
+    if graph.directed:
+        degree = degree + graph.in_degree()
+    return graph.to_dict(degree / (n - 1))
+
+
+def in_degree_centrality(graph: CSRGraph) -> Dict[str, float]:
+    """
+    Calcula la centralidad de grado de entrada (prestigio), igual que `nx.in_degree_centrality`.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo compacto dirigido.
+
+    Returns:
+    --------
+    Dict[str, float]
+        Un diccionario que mapea cada nodo a su centralidad de grado de entrada.
+    """
+
+    n = graph.number_of_nodes()
+    if n <= 1:
+        return {name: 1.0 for name in graph.names}
+    return graph.to_dict(graph.in_degree() / (n - 1))
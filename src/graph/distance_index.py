@@ -0,0 +1,381 @@
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.sparse import csgraph
+
+from graph.csr_graph import CSRGraph
+from graph.graph_store import GraphStore
+
+
+def distance_index_path(filename: str, directed: bool) -> str:
+    """
+    Obtiene la ruta del índice de distancias asociado a un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+    directed : bool
+        Indica si el índice es del grafo dirigido o del no dirigido.
+
+    Returns:
+    --------
+    str
+        La ruta de la matriz de distancias (p. ej: data/thesis.distances.npy o
+        data/thesis.distances_digraph.npy). Sus metadatos se guardan en el mismo
+        archivo con extensión .json.
+    """
+
+    root, _ = os.path.splitext(filename)
+    return root + (".distances_digraph.npy" if directed else ".distances.npy")
+
+
+# tipos de la matriz, de menor a mayor
+DISTANCE_DTYPES = (np.uint8, np.uint16, np.uint32)
+
+
+def distance_dtype(max_distance: int) -> np.dtype:
+    """
+    Elige el tipo entero más pequeño que puede guardar una distancia.
+
+    El valor máximo del tipo se reserva para los pares sin camino.
+
+    Params:
+    -------
+    max_distance : int
+        La mayor distancia entre dos nodos conectados.
+
+    Returns:
+    --------
+    np.dtype
+        np.uint8, np.uint16 o np.uint32.
+
+    Raises:
+    -------
+    ValueError
+        Si la distancia no cabe en 32 bits.
+    """
+
+    for dtype in DISTANCE_DTYPES:
+        if max_distance < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Distancia demasiado grande para el índice: {max_distance}")
+
+
+def _widen(
+    distances: np.memmap, path: str, rows: int, dtype: np.dtype, batch: int
+) -> np.memmap:
+    """
+    Copia las primeras filas de la matriz a un .npy nuevo de un tipo más ancho.
+
+    Params:
+    -------
+    distances : np.memmap
+        La matriz a medio calcular.
+    path : str
+        La ruta del .npy de la matriz, que se sustituye por el nuevo.
+    rows : int
+        Número de filas ya calculadas.
+    dtype : np.dtype
+        El nuevo tipo.
+    batch : int
+        Número de filas que se copian a la vez.
+
+    Returns:
+    --------
+    np.memmap
+        La matriz con el nuevo tipo, guardada en `path`.
+    """
+
+    old_unreachable = np.iinfo(distances.dtype).max
+    wide_path = path + ".wide.npy"
+    wide = np.lib.format.open_memmap(
+        wide_path, mode="w+", dtype=dtype, shape=distances.shape
+    )
+    for start in range(0, rows, batch):
+        block = np.asarray(distances[start : min(start + batch, rows)]).astype(dtype)
+        block[block == old_unreachable] = np.iinfo(dtype).max
+        wide[start : start + len(block)] = block
+
+    wide.flush()
+    del distances, wide
+    os.replace(wide_path, path)
+    return np.lib.format.open_memmap(path, mode="r+")
+
+
+class DistanceIndex:
+    """
+    Distancias (número de aristas) entre todos los pares de nodos de un grafo.
+
+    La matriz se guarda como un .npy de enteros de 8, 16 o 32 bits y se abre como
+    memory-map, así que se calcula una sola vez y después cada consulta es una
+    lectura. La fila de un nodo tiene sus distancias a los demás (en grafos
+    dirigidos, siguiendo las aristas autor -> director) y los pares sin camino
+    guardan el valor máximo del tipo (`unreachable`).
+    """
+
+    def __init__(self, path: str, names: list, directed: bool, digest: str):
+        self.path = path
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.directed = directed
+        self.digest = digest
+        self.matrix = np.load(path, mmap_mode="r")
+        self.unreachable = np.iinfo(self.matrix.dtype).max
+
+    def __getstate__(self) -> dict:
+        # al enviarlo a otro proceso se pasa la ruta, no la matriz
+        return {
+            "path": self.path,
+            "names": self.names,
+            "directed": self.directed,
+            "digest": self.digest,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    @staticmethod
+    def meta_path(path: str) -> str:
+        """
+        Ruta de los metadatos (nombres, tipo de grafo y hash de las relaciones) del índice.
+        """
+
+        root, _ = os.path.splitext(path)
+        return root + ".json"
+
+    @classmethod
+    def build(
+        cls,
+        graph: CSRGraph,
+        path: str,
+        digest: str,
+        batch_entries: int = 1 << 22,
+    ) -> "DistanceIndex":
+        """
+        Calcula las distancias de todos los pares y las guarda en disco.
+
+        Las búsquedas en anchura se lanzan por lotes de orígenes con
+        `scipy.sparse.csgraph.shortest_path` y cada lote se escribe directamente en
+        el memory-map, sin tener la matriz completa en memoria. La matriz empieza
+        con 8 bits y, si un lote tiene una distancia que no cabe, las filas ya
+        escritas se copian a un tipo más ancho (ver `distance_dtype`).
+
+        Params:
+        -------
+        graph : CSRGraph
+            El grafo compacto.
+        path : str
+            La ruta del .npy donde se guarda la matriz.
+        digest : str
+            El hash de las relaciones del grafo (ver `relations_digest`).
+        batch_entries : int
+            Tamaño máximo (orígenes x nodos) de cada lote.
+
+        Returns:
+        --------
+        DistanceIndex
+            El índice recién guardado.
+        """
+
+        n = graph.number_of_nodes()
+        # se empieza con el tipo más pequeño y se ensancha si aparece una distancia
+        # que no cabe, así que el tipo final depende de la mayor distancia real
+        dtype = distance_dtype(0)
+        matrix = graph.adjacency_matrix()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npy"
+        distances = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=dtype, shape=(n, n)
+        )
+
+        batch = max(1, batch_entries // max(n, 1))
+        for start in range(0, n, batch):
+            sources = np.arange(start, min(start + batch, n))
+            dist = csgraph.shortest_path(
+                matrix, directed=graph.directed, unweighted=True, indices=sources
+            )
+            reachable = np.isfinite(dist)
+            longest = int(dist[reachable].max()) if reachable.any() else 0
+            if longest >= np.iinfo(dtype).max:
+                dtype = distance_dtype(longest)
+                distances = _widen(distances, tmp_path, start, dtype, batch)
+            dist[~reachable] = np.iinfo(dtype).max
+            distances[start : start + len(sources)] = dist.astype(dtype)
+
+        distances.flush()
+        del distances
+
+        # escribimos en temporales y renombramos, para no dejar un índice a medias
+        meta = {"digest": digest, "directed": graph.directed, "names": graph.names}
+        with open(cls.meta_path(tmp_path), "w") as f:
+            f.write(json.dumps(meta, ensure_ascii=False))
+        os.replace(tmp_path, path)
+        os.replace(cls.meta_path(tmp_path), cls.meta_path(path))
+
+        return cls(path, graph.names, graph.directed, digest)
+
+    @classmethod
+    def load(cls, path: str, digest: str) -> Optional["DistanceIndex"]:
+        """
+        Abre un índice guardado si corresponde a las relaciones actuales.
+
+        Params:
+        -------
+        path : str
+            La ruta del .npy del índice.
+        digest : str
+            El hash de las relaciones actuales.
+
+        Returns:
+        --------
+        Optional[DistanceIndex]
+            El índice, o None si no existe o se calculó con otras relaciones.
+        """
+
+        meta_path = cls.meta_path(path)
+        if not os.path.exists(path) or not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("digest") != digest:
+            return None
+
+        return cls(path, meta["names"], meta["directed"], digest)
+
+    def distance(self, source: str, target: str) -> Optional[int]:
+        """
+        Distancia entre dos nodos.
+
+        Params:
+        -------
+        source : str
+            El nodo de origen.
+        target : str
+            El nodo de destino.
+
+        Returns:
+        --------
+        Optional[int]
+            El número de aristas del camino más corto, o None si no hay camino.
+        """
+
+        value = int(self.matrix[self.index[source], self.index[target]])
+        return None if value == self.unreachable else value
+
+    def distances_from(self, source: str) -> Dict[str, int]:
+        """
+        Distancias de un nodo a todos los que alcanza, como `nx.single_source_shortest_path_length`.
+
+        Params:
+        -------
+        source : str
+            El nodo de origen.
+
+        Returns:
+        --------
+        Dict[str, int]
+            Un diccionario que mapea cada nodo alcanzable (incluido el origen) a su distancia.
+        """
+
+        row = np.asarray(self.matrix[self.index[source]])
+        reachable = np.flatnonzero(row != self.unreachable)
+        return {self.names[i]: int(row[i]) for i in reachable.tolist()}
+
+    def _row_batches(self, batch_entries: int = 1 << 22):
+        """
+        Recorre la matriz por bloques de filas consecutivas.
+        """
+
+        n = len(self.names)
+        batch = max(1, batch_entries // max(n, 1))
+        for start in range(0, n, batch):
+            yield start, np.asarray(self.matrix[start : start + batch])
+
+    def closeness_centrality(self) -> Dict[str, float]:
+        """
+        Centralidad de cercanía leída del índice, igual que `nx.closeness_centrality`
+        (Wasserman-Faust y distancias de entrada en grafos dirigidos).
+
+        Returns:
+        --------
+        Dict[str, float]
+            Un diccionario que mapea cada nodo a su centralidad de cercanía.
+        """
+
+        n = len(self.names)
+        found = np.zeros(n, dtype=np.int64)
+        total = np.zeros(n, dtype=np.int64)
+
+        # la columna de u tiene las distancias de los demás nodos hasta u
+        for _, rows in self._row_batches():
+            reachable = rows != self.unreachable
+            found += reachable.sum(axis=0)
+            total += np.where(reachable, rows, 0).sum(axis=0, dtype=np.int64)
+
+        # sin contar el propio nodo
+        found -= 1
+        closeness = np.zeros(n)
+        if n > 1:
+            mask = total > 0
+            closeness[mask] = found[mask] / total[mask] * found[mask] / (n - 1)
+        return dict(zip(self.names, closeness.tolist()))
+
+    def eccentricity(self) -> Dict[str, int]:
+        """
+        Excentricidad de cada nodo: su mayor distancia a un nodo alcanzable.
+
+        A diferencia de `nx.eccentricity`, no exige que el grafo sea conexo: en cada
+        componente coincide con la excentricidad de NetworkX sobre esa componente.
+
+        Returns:
+        --------
+        Dict[str, int]
+            Un diccionario que mapea cada nodo a su excentricidad.
+        """
+
+        eccentricity = np.zeros(len(self.names), dtype=np.int64)
+        for start, rows in self._row_batches():
+            finite = np.where(rows != self.unreachable, rows, 0)
+            eccentricity[start : start + len(rows)] = finite.max(axis=1)
+        return dict(zip(self.names, eccentricity.tolist()))
+
+    def diameter(self) -> int:
+        """
+        Mayor distancia entre dos nodos conectados (el diámetro de la mayor componente).
+        """
+
+        return max(self.eccentricity().values(), default=0)
+
+
+def get_distance_index(
+    store: GraphStore, filename: str, directed: bool
+) -> DistanceIndex:
+    """
+    Abre el índice de distancias de un grafo o lo calcula si no existe o está desactualizado.
+
+    Params:
+    -------
+    store : GraphStore
+        Los grafos de la red de tesis.
+    filename : str
+        La ruta del archivo JSON de tesis junto al que se guarda el índice.
+    directed : bool
+        Indica si se quiere el índice del grafo dirigido o del no dirigido.
+
+    Returns:
+    --------
+    DistanceIndex
+        El índice de distancias.
+    """
+
+    path = distance_index_path(filename, directed)
+    index = DistanceIndex.load(path, store.digest)
+    if index is None:
+        print(f"[INFO] Calculando el índice de distancias: {path}")
+        index = DistanceIndex.build(store.csr(directed), path, store.digest)
+    return index
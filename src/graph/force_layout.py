@@ -0,0 +1,412 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csgraph
+from scipy.spatial import cKDTree
+
+from graph.csr_graph import CSRGraph, build_csr
+
+# número de nodos hasta el que la repulsión se calcula exacta, con todos los pares
+EXACT_NODES = 1000
+
+
+def _edges(graph: CSRGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aristas de un grafo no dirigido en CSR, una vez cada una y sin bucles.
+    """
+
+    src = np.repeat(np.arange(graph.number_of_nodes()), np.diff(graph.indptr))
+    dst = graph.indices.astype(np.int64)
+    mask = src < dst
+    return src[mask], dst[mask]
+
+
+def _to_dict(names: List[str], positions: np.ndarray) -> Dict[str, Tuple[float, float]]:
+    """
+    Convierte las posiciones de los nodos en un diccionario nombre -> (x, y).
+    """
+
+    return {
+        name: (float(x), float(y)) for name, (x, y) in zip(names, positions.tolist())
+    }
+
+
+def coarsen(
+    indptr: np.ndarray, indices: np.ndarray, rng: np.random.Generator
+) -> Tuple[np.ndarray, int]:
+    """
+    Agrupa los nodos de un grafo para obtener otro más pequeño con la misma forma.
+
+    Cada nodo elige al vecino con menor prioridad aleatoria y las parejas que se
+    eligen mutuamente se juntan (un emparejamiento). Después, los nodos sin pareja se
+    juntan con la pareja del vecino que eligieron, y las hojas con su vecino, lo que
+    reduce de golpe las estrellas de un director con muchos doctorandos.
+
+    Params:
+    -------
+    indptr : np.ndarray
+        Los punteros CSR del grafo (con cada arista en los dos sentidos).
+    indices : np.ndarray
+        Los vecinos CSR del grafo.
+    rng : np.random.Generator
+        El generador de las prioridades.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, int]
+        El grupo de cada nodo (de 0 a m-1) y el número m de grupos.
+    """
+
+    n = len(indptr) - 1
+    degree = np.diff(indptr)
+    priority = rng.permutation(n)
+    by_priority = np.argsort(priority)
+
+    # vecino de menor prioridad de cada nodo con vecinos
+    choice = np.arange(n)
+    has_neighbors = degree > 0
+    if indices.size:
+        lowest = np.minimum.reduceat(priority[indices], indptr[:-1][has_neighbors])
+        choice[has_neighbors] = by_priority[lowest]
+
+    nodes = np.arange(n)
+    matched = choice[choice] == nodes
+    group = np.where(matched, np.minimum(nodes, choice), nodes)
+
+    # los nodos sin pareja se juntan con el vecino que eligieron si este tiene pareja,
+    # y las hojas sin pareja, con su único vecino
+    joins = ~matched & has_neighbors & matched[choice]
+    group[joins] = group[choice[joins]]
+    leaves = ~matched & ~joins & (degree == 1)
+    group[leaves] = group[indices[indptr[:-1][leaves]]]
+
+    _, group = np.unique(group, return_inverse=True)
+    return group, int(group.max()) + 1 if n else 0
+
+
+def _repulsion_exact(pos: np.ndarray, k: float) -> np.ndarray:
+    """
+    Repulsión k^2 / d entre todos los pares de nodos, como `nx.spring_layout`.
+    """
+
+    delta = pos[:, None, :] - pos[None, :, :]
+    distance2 = np.maximum((delta**2).sum(axis=2), 1e-9)
+    return k**2 * np.einsum("ijk,ij->ik", delta, 1 / distance2)
+
+
+def _mesh_kernel(shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Transformada de Fourier del núcleo (x + iy) / |r|^2 con celdas de lado 1, en una
+    malla del doble de tamaño (para que la convolución circular no dé la vuelta).
+    Se guarda por tamaño de malla: las mallas se redondean para que se repitan.
+    """
+
+    if shape not in _KERNELS:
+        if len(_KERNELS) >= 8:
+            _KERNELS.clear()
+        padded = (2 * shape[0], 2 * shape[1])
+        ox, oy = np.meshgrid(
+            *[np.fft.fftfreq(size, 1 / size) for size in padded], indexing="ij"
+        )
+        r2 = ox**2 + oy**2
+        r2[0, 0] = 1.0
+        kernel = (ox + 1j * oy) / r2
+        kernel[0, 0] = 0.0
+        _KERNELS[shape] = np.fft.fft2(kernel)
+    return _KERNELS[shape]
+
+
+_KERNELS = dict()
+
+
+def _repulsion_grid(pos: np.ndarray, k: float, max_grid: int) -> np.ndarray:
+    """
+    Repulsión k^2 / d aproximada con una malla (particle-particle/particle-mesh).
+
+    Las fuerzas lejanas salen de una malla: la masa de los nodos se reparte entre
+    las 4 celdas más cercanas (cloud-in-cell), el campo de toda la malla se obtiene
+    con una convolución por FFT y se interpola de vuelta en cada nodo con los mismos
+    pesos, así que la fuerza de un nodo sobre sí mismo se anula. La malla suaviza
+    las fuerzas a menos de una celda, así que para los pares más cercanos (buscados
+    con un k-d tree) se suma la diferencia entre la fuerza exacta y la de una celda.
+    Las celdas miden k mientras la malla no supere `max_grid` celdas por lado.
+    """
+
+    low = pos.min(axis=0)
+    extent = pos.max(axis=0) - low
+    cell = max(k, float(extent.max()) / (max_grid - 2))
+    # redondeamos a múltiplos de 32 para reutilizar el núcleo entre iteraciones
+    shape = tuple(int(-(-(size + 2) // 32) * 32) for size in extent / cell)
+
+    # pesos cloud-in-cell
+    rel = (pos - low) / cell
+    corner = np.floor(rel).astype(np.int64)
+    frac = rel - corner
+    corners = []
+    for dx in (0, 1):
+        for dy in (0, 1):
+            weight = (frac[:, 0] if dx else 1 - frac[:, 0]) * (
+                frac[:, 1] if dy else 1 - frac[:, 1]
+            )
+            flat = (corner[:, 0] + dx) * shape[1] + corner[:, 1] + dy
+            corners.append((flat, weight))
+
+    size = shape[0] * shape[1]
+    density = np.zeros(size)
+    for flat, weight in corners:
+        density += np.bincount(flat, weights=weight, minlength=size)
+
+    padded = (2 * shape[0], 2 * shape[1])
+    spectrum = np.fft.fft2(density.reshape(shape), s=padded)
+    field = np.fft.ifft2(spectrum * _mesh_kernel(shape))[: shape[0], : shape[1]]
+    field = field.ravel() / cell
+
+    force = np.zeros(len(pos), dtype=complex)
+    for flat, weight in corners:
+        force += weight * field[flat]
+    force = np.stack([force.real, force.imag], axis=1)
+
+    # corrección de los pares a menos de una celda
+    pairs = cKDTree(pos).query_pairs(cell, output_type="ndarray")
+    if len(pairs):
+        i, j = pairs[:, 0], pairs[:, 1]
+        delta = pos[i] - pos[j]
+        distance = np.maximum(np.sqrt((delta**2).sum(axis=1)), 1e-9)
+        push = delta * ((1 / distance - 1 / cell) / distance)[:, None]
+        n = len(pos)
+        for axis in (0, 1):
+            force[:, axis] += np.bincount(i, weights=push[:, axis], minlength=n)
+            force[:, axis] -= np.bincount(j, weights=push[:, axis], minlength=n)
+
+    return k**2 * force
+
+
+def _simulate(
+    pos: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    k: float,
+    iterations: int,
+    temperature: float,
+    fixed: Optional[np.ndarray] = None,
+    max_grid: int = 256,
+) -> np.ndarray:
+    """
+    Simulación de Fruchterman-Reingold: repulsión k^2 / d entre todos los nodos,
+    atracción d^2 / k en las aristas y un desplazamiento máximo por iteración (la
+    temperatura) que baja linealmente hasta 0.
+    """
+
+    n = len(pos)
+    pos = pos.copy()
+    step = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if n <= EXACT_NODES:
+            disp = _repulsion_exact(pos, k)
+        else:
+            disp = _repulsion_grid(pos, k, max_grid)
+
+        delta = pos[src] - pos[dst]
+        pull = delta * np.sqrt((delta**2).sum(axis=1))[:, None] / k
+        for axis in (0, 1):
+            disp[:, axis] -= np.bincount(src, weights=pull[:, axis], minlength=n)
+            disp[:, axis] += np.bincount(dst, weights=pull[:, axis], minlength=n)
+
+        if fixed is not None:
+            disp[fixed] = 0.0
+        length = np.maximum(np.sqrt((disp**2).sum(axis=1)), 1e-9)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= step
+    return pos
+
+
+def _multilevel(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    k: float,
+    rng: np.random.Generator,
+    iterations: int,
+    max_grid: int,
+) -> np.ndarray:
+    """
+    Layout multinivel de un grafo conexo en CSR.
+
+    El grafo se simplifica con `coarsen` hasta que tiene pocos nodos o deja de
+    reducirse. Cada nodo de un nivel representa varios del grafo completo, así que
+    su distancia óptima crece con la raíz de cuántos representa: el nivel más simple
+    ya tiene el tamaño del dibujo final, y al pasar a cada nivel más detallado los
+    nodos de un grupo solo tienen que separarse hasta la distancia de su grupo.
+    """
+
+    n = len(indptr) - 1
+    src = np.repeat(np.arange(n), np.diff(indptr))
+    mask = src < indices
+    levels = [(src[mask], indices[mask].astype(np.int64), n)]
+    groups = []
+    while levels[-1][2] > 50:
+        src, dst, size = levels[-1]
+        group, m = coarsen(indptr, indices, rng)
+        if m > 0.9 * size:
+            break
+        coarse = np.unique(np.sort(np.stack([group[src], group[dst]]), axis=0), axis=1)
+        coarse = coarse[:, coarse[0] != coarse[1]]
+        levels.append((coarse[0], coarse[1], m))
+        groups.append(group)
+        indptr, indices = build_csr(
+            np.concatenate([coarse[0], coarse[1]]),
+            np.concatenate([coarse[1], coarse[0]]),
+            m,
+        )
+
+    # el nivel más simple se coloca al azar en un cuadrado de unas k^2 por nodo del
+    # grafo completo
+    src, dst, size = levels[-1]
+    level_k = k * np.sqrt(n / size)
+    side = k * np.sqrt(n)
+    positions = rng.uniform(0, side, size=(size, 2))
+    positions = _simulate(
+        positions, src, dst, level_k, iterations, side / 10, max_grid=max_grid
+    )
+
+    # cada nivel parte de las posiciones de su grupo, con un pequeño desplazamiento
+    for (src, dst, size), group in zip(reversed(levels[:-1]), reversed(groups)):
+        coarse_k, level_k = level_k, k * np.sqrt(n / size)
+        positions = positions[group] + rng.normal(scale=level_k / 10, size=(size, 2))
+        positions = _simulate(
+            positions, src, dst, level_k, iterations, coarse_k, max_grid=max_grid
+        )
+
+    return positions
+
+
+def pack_components(layouts: List[np.ndarray], k: float) -> List[np.ndarray]:
+    """
+    Coloca los layouts de varias componentes en filas, sin que se solapen.
+
+    Las componentes, en el orden dado (de mayor a menor), se van poniendo de
+    izquierda a derecha en filas de la anchura de la mayor componente o de la raíz
+    del área total (lo que sea mayor), separadas por 2k.
+
+    Params:
+    -------
+    layouts : List[np.ndarray]
+        Las posiciones (m, 2) de los nodos de cada componente.
+    k : float
+        La distancia óptima entre nodos.
+
+    Returns:
+    --------
+    List[np.ndarray]
+        Las posiciones desplazadas de cada componente.
+    """
+
+    gap = 2 * k
+    boxes = [(p.min(axis=0), p.max(axis=0) - p.min(axis=0) + gap) for p in layouts]
+    area = sum(float(size.prod()) for _, size in boxes)
+    width = max(max(float(size[0]) for _, size in boxes), np.sqrt(area))
+
+    packed = []
+    x = y = row_height = 0.0
+    for positions, (low, size) in zip(layouts, boxes):
+        if x > 0 and x + size[0] > width:
+            x, y, row_height = 0.0, y - row_height, 0.0
+        # las filas crecen hacia abajo desde la esquina superior izquierda
+        packed.append(positions - low + np.array([x, y - size[1]]))
+        x += size[0]
+        row_height = max(row_height, float(size[1]))
+    return packed
+
+
+def force_layout(
+    graph: Union[nx.Graph, CSRGraph],
+    k: float,
+    seed: int = 12,
+    iterations: int = 50,
+    pos: Optional[Dict[str, Tuple[float, float]]] = None,
+    fixed: Optional[List[str]] = None,
+    max_grid: int = 256,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Layout de fuerzas multinivel para grafos grandes, en NumPy.
+
+    Usa las mismas fuerzas que `nx.spring_layout` (Fruchterman-Reingold), pero:
+        - La repulsión entre todos los pares se aproxima con una malla y FFT (ver
+          `_repulsion_grid`), en O(n + G^2 log G) por iteración en lugar de O(n^2).
+          Hasta `EXACT_NODES` nodos se calcula exacta.
+        - Cada componente se simplifica varias veces (ver `coarsen`), se coloca la
+          versión más pequeña y cada nivel parte de las posiciones del anterior, así
+          que en el grafo completo basta con ajustar localmente (ver `_multilevel`).
+        - Las componentes se colocan por separado y se juntan en filas (ver
+          `pack_components`), en lugar de dejar que se repelan sin límite.
+    Con `pos` y `fixed` no se simplifica: los nodos de `fixed` no se mueven y solo se
+    ajustan los demás desde sus posiciones iniciales.
+
+    El resultado depende solo de la semilla, y está en las unidades de la simulación
+    (sin reescalar), como `layout.spring_layout`.
+
+    Params:
+    -------
+    graph : Union[nx.Graph, CSRGraph]
+        El grafo no dirigido.
+    k : float
+        La distancia óptima entre nodos.
+    seed : int
+        La semilla de las posiciones iniciales y de la simplificación.
+    iterations : int
+        Iteraciones de la simulación en cada nivel.
+    pos : Optional[Dict[str, Tuple[float, float]]]
+        Posiciones iniciales de todos los nodos.
+    fixed : Optional[List[str]]
+        Nodos que no se mueven (requiere `pos`).
+    max_grid : int
+        Número máximo de celdas por lado de la malla de repulsión.
+
+    Returns:
+    --------
+    Dict[str, Tuple[float, float]]
+        La posición de cada nodo.
+    """
+
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_networkx(graph)
+
+    n = graph.number_of_nodes()
+    rng = np.random.default_rng(seed)
+    if n == 0:
+        return dict()
+
+    if pos is not None:
+        src, dst = _edges(graph)
+        start = np.array([pos[name] for name in graph.names], dtype=float)
+        mask = None
+        if fixed:
+            mask = np.zeros(n, dtype=bool)
+            mask[[graph.index[name] for name in fixed]] = True
+        result = _simulate(start, src, dst, k, iterations, k, mask, max_grid)
+        return _to_dict(graph.names, result)
+
+    # componentes de mayor a menor (las de igual tamaño, en el orden de sus nodos)
+    matrix = graph.adjacency_matrix()
+    count, labels = csgraph.connected_components(matrix, directed=False)
+    sizes = np.bincount(labels)
+    ranking = np.argsort(-sizes, kind="stable")
+    order = np.argsort(np.argsort(ranking)[labels], kind="stable")
+    bounds = np.concatenate([[0], np.cumsum(sizes[ranking])])
+
+    layouts = []
+    for c in range(count):
+        nodes = order[bounds[c] : bounds[c + 1]]
+        if len(nodes) <= 2:
+            # uno o dos nodos: no hace falta simular
+            layouts.append(np.array([[0.0, 0.0], [k, 0.0]])[: len(nodes)])
+            continue
+        sub = matrix[nodes][:, nodes]
+        layouts.append(
+            _multilevel(sub.indptr, sub.indices, k, rng, iterations, max_grid)
+        )
+
+    positions = np.zeros((n, 2))
+    for c, packed in enumerate(pack_components(layouts, k)):
+        positions[order[bounds[c] : bounds[c + 1]]] = packed
+    return _to_dict(graph.names, positions)
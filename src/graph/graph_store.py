@@ -0,0 +1,119 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Dict, Iterable
+
+import networkx as nx
+
+from graph.csr_graph import CSRGraph
+
+
+def relations_digest(relations: Iterable[tuple]) -> str:
+    """
+    Calcula un hash del conjunto de relaciones autor-director.
+
+    No depende del orden ni de las relaciones repetidas, así que solo cambia cuando
+    cambia el grafo. Sirve para invalidar los resultados guardados en disco.
+
+    Params:
+    -------
+    relations : Iterable[tuple]
+        Una secuencia de tuplas (autor, director).
+
+    Returns:
+    --------
+    str
+        El hash SHA-256 en hexadecimal.
+    """
+
+    unique = sorted({tuple(relation) for relation in relations})
+    encoded = json.dumps(unique, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class GraphStore:
+    """
+    Grafos de la red de tesis construidos una sola vez y compartidos por todas las etapas.
+
+    Los grafos y los resultados derivados (centralidad de grado) se
+    calculan la primera vez que se piden y se reutilizan después. `build_counts`
+    cuenta cuántas veces se ha ejecutado cada constructor.
+    """
+
+    def __init__(self, relations: Iterable[tuple]):
+        # ordenadas, para que el orden de los nodos (y con él los empates en las
+        # métricas y las posiciones de los dibujos) no cambie de una ejecución a otra
+        self.relations = sorted(relations)
+        self.build_counts = Counter()
+        self._graph = None
+        self._digraph = None
+        self._degrees = None
+        self._csr = dict()
+        self._digest = None
+
+    @property
+    def digraph(self) -> nx.DiGraph:
+        """
+        Grafo dirigido autor -> director.
+        """
+
+        if self._digraph is None:
+            self.build_counts["digraph"] += 1
+            self._digraph = nx.DiGraph()
+            self._digraph.add_edges_from(self.relations)
+        return self._digraph
+
+    @property
+    def graph(self) -> nx.Graph:
+        """
+        Grafo no dirigido con las mismas relaciones.
+        """
+
+        if self._graph is None:
+            self.build_counts["graph"] += 1
+            self._graph = nx.Graph()
+            self._graph.add_edges_from(self.relations)
+        return self._graph
+
+    @property
+    def degrees(self) -> Dict[str, float]:
+        """
+        Centralidad de grado de cada nodo del grafo no dirigido.
+        """
+
+        if self._degrees is None:
+            self.build_counts["degrees"] += 1
+            self._degrees = nx.degree_centrality(self.graph)
+        return self._degrees
+
+    @property
+    def digest(self) -> str:
+        """
+        Hash de las relaciones (ver `relations_digest`).
+        """
+
+        if self._digest is None:
+            self._digest = relations_digest(self.relations)
+        return self._digest
+
+    def csr(self, directed: bool) -> CSRGraph:
+        """
+        Versión compacta (CSR) del grafo dirigido o no dirigido, con los ids en el
+        mismo orden que los nodos del grafo de NetworkX.
+
+        Params:
+        -------
+        directed : bool
+            Indica si se quiere el grafo dirigido o el no dirigido.
+
+        Returns:
+        --------
+        CSRGraph
+            El grafo compacto.
+        """
+
+        if directed not in self._csr:
+            self.build_counts["csr_digraph" if directed else "csr_graph"] += 1
+            graph = self.digraph if directed else self.graph
+            self._csr[directed] = CSRGraph.from_networkx(graph)
+        return self._csr[directed]
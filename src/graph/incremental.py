@@ -0,0 +1,708 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csgraph
+
+from graph import betweenness, closeness, csr_graph
+from graph.csr_graph import CSRGraph
+
+# métricas que se mantienen (las del grafo dirigido incluyen además "in_degree")
+METRICS = ("degree", "in_degree", "betweenness", "closeness")
+
+# diferencia máxima con el recálculo completo que se acepta en el modo de
+# comprobación (la intermediación se actualiza restando y sumando, así que puede
+# diferir en el redondeo)
+TOLERANCE = 1e-9
+
+
+def metrics_state_path(filename: str, directed: bool) -> str:
+    """
+    Obtiene la ruta del estado de las métricas asociado a un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+    directed : bool
+        Indica si el estado es del grafo dirigido o del no dirigido.
+
+    Returns:
+    --------
+    str
+        La ruta de los arrays del estado (p. ej: data/thesis.metrics.npz o
+        data/thesis.metrics_digraph.npz). Sus metadatos se guardan en el mismo
+        archivo con extensión .json.
+    """
+
+    root, _ = os.path.splitext(filename)
+    return root + (".metrics_digraph.npz" if directed else ".metrics.npz")
+
+
+def _edges(graph: CSRGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Obtiene las aristas de un grafo compacto, cada una una sola vez.
+    """
+
+    src = np.repeat(np.arange(graph.number_of_nodes()), graph.out_degree())
+    dst = graph.indices.astype(np.int64)
+    if not graph.directed:
+        # cada arista está en los dos sentidos: nos quedamos con uno
+        keep = src <= dst
+        src, dst = src[keep], dst[keep]
+    return src, dst
+
+
+def _brandes(
+    graph: CSRGraph,
+    sources: Sequence[int],
+    jobs: Optional[int],
+    targets: Optional[np.ndarray] = None,
+    executor: Optional[Executor] = None,
+) -> np.ndarray:
+    """
+    Intermediación sin normalizar debida solo a unos orígenes (ver `BrandesPool`),
+    con el peso de cada nodo como destino si se da `targets`.
+    """
+
+    if not len(sources):
+        return np.zeros(graph.number_of_nodes())
+    with betweenness.BrandesPool(graph, jobs, executor) as pool:
+        # los pesos viajan con cada bloque: pocos bloques
+        num_chunks = 128 if targets is None else 4 * pool.jobs
+        chunks = betweenness.split_sources(list(sources), num_chunks)
+        if targets is None:
+            return pool.accumulate(chunks)
+        return pool.accumulate(chunks, targets=targets.tolist())
+
+
+def _distance_sums(
+    graph: CSRGraph,
+    sources: Sequence[int],
+    symmetric: Optional[np.ndarray] = None,
+    batch_entries: int = 1 << 22,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cuenta, para cada nodo, cuántos de los orígenes lo alcanzan y a qué distancia total.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo compacto.
+    sources : Sequence[int]
+        Los nodos origen de las búsquedas en anchura.
+    symmetric : Optional[np.ndarray]
+        En grafos no dirigidos, los nodos que se cuentan además como orígenes que
+        alcanzan a cada uno de `sources` (la distancia es la misma en los dos
+        sentidos).
+    batch_entries : int
+        Tamaño máximo (orígenes x nodos) de cada matriz de distancias.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Los orígenes que alcanzan cada nodo (contando el propio nodo si es origen) y
+        la suma de sus distancias hasta él.
+    """
+
+    n = graph.number_of_nodes()
+    reached = np.zeros(n, dtype=np.int64)
+    total = np.zeros(n, dtype=np.int64)
+    if not len(sources):
+        return reached, total
+
+    matrix = graph.adjacency_matrix()
+    sources = np.asarray(sources)
+    batch = max(1, batch_entries // max(n, 1))
+    for start in range(0, len(sources), batch):
+        indices = sources[start : start + batch]
+        dist = csgraph.shortest_path(
+            matrix, directed=graph.directed, unweighted=True, indices=indices
+        )
+        reachable = np.isfinite(dist)
+        finite = np.where(reachable, dist, 0).astype(np.int64)
+        reached += reachable.sum(axis=0)
+        total += finite.sum(axis=0)
+        if symmetric is not None:
+            reached[indices] += (reachable & symmetric).sum(axis=1)
+            total[indices] += np.where(symmetric, finite, 0).sum(axis=1)
+    return reached, total
+
+
+def virtual_edges(
+    src: np.ndarray, dst: np.ndarray, n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resume las aristas nuevas de un grafo no dirigido como atajos entre nodos anteriores.
+
+    Una arista entre dos nodos anteriores es un atajo de longitud 1. Los nodos
+    nuevos solo cambian los caminos entre nodos anteriores si hay un camino por
+    ellos de un nodo anterior a otro: es un atajo con la longitud de ese camino.
+
+    Params:
+    -------
+    src, dst : np.ndarray
+        Los extremos de las aristas nuevas.
+    n : int
+        El número de nodos anteriores (los índices a partir de n son nodos nuevos).
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Los extremos y la longitud de cada atajo.
+    """
+
+    old = (src < n) & (dst < n)
+    shortcuts = [(a, b, 1) for a, b in zip(src[old].tolist(), dst[old].tolist())]
+
+    # grafo de las aristas con algún nodo nuevo
+    neighbors = dict()
+    for a, b in zip(src[~old].tolist(), dst[~old].tolist()):
+        neighbors.setdefault(a, []).append(b)
+        neighbors.setdefault(b, []).append(a)
+
+    # desde cada nodo anterior, búsqueda en anchura que solo atraviesa nodos nuevos
+    for anchor in sorted(node for node in neighbors if node < n):
+        dist = {anchor: 0}
+        queue = deque([anchor])
+        while queue:
+            v = queue.popleft()
+            for w in neighbors[v]:
+                if w in dist:
+                    continue
+                dist[w] = dist[v] + 1
+                if w >= n:
+                    queue.append(w)
+                elif anchor < w:
+                    shortcuts.append((anchor, w, dist[w]))
+
+    shortcuts = np.array(shortcuts, dtype=np.int64).reshape(-1, 3)
+    return shortcuts[:, 0], shortcuts[:, 1], shortcuts[:, 2]
+
+
+def affected_sources(
+    graph: CSRGraph,
+    src: np.ndarray,
+    dst: np.ndarray,
+    length: Optional[np.ndarray] = None,
+    batch_entries: int = 1 << 22,
+) -> np.ndarray:
+    """
+    Obtiene los orígenes cuyos caminos mínimos cambian al añadir unas aristas.
+
+    Una arista nueva u -> v de longitud L solo cambia los caminos mínimos desde s
+    (y con ellos su aportación a la intermediación y sus distancias) si s alcanza u
+    y d(s, u) + L <= d(s, v): si no, la arista no está en ningún camino mínimo desde
+    s. En grafos no dirigidos vale en los dos sentidos. Como una arista que no
+    afecta a s tampoco cambia sus distancias, el criterio sigue siendo exacto con
+    varias aristas a la vez. Los orígenes de las componentes que no tocan ninguna
+    arista nueva nunca se ven afectados.
+
+    Params:
+    -------
+    graph : CSRGraph
+        El grafo anterior.
+    src, dst : np.ndarray
+        Los extremos de las aristas nuevas. Los índices a partir del número de nodos
+        del grafo son nodos nuevos, a los que no llega ningún origen.
+    length : Optional[np.ndarray]
+        La longitud de cada arista (1 si no se da; ver `virtual_edges`).
+    batch_entries : int
+        Tamaño máximo (extremos x nodos) de cada matriz de distancias.
+
+    Returns:
+    --------
+    np.ndarray
+        Los índices de los orígenes afectados del grafo anterior.
+    """
+
+    n = graph.number_of_nodes()
+    affected = np.zeros(n, dtype=bool)
+    if length is None:
+        length = np.ones(len(src), dtype=np.int64)
+
+    # distancias de todos los nodos hasta cada extremo: búsquedas en el grafo invertido
+    matrix = graph.adjacency_matrix(reverse=graph.directed)
+    unreachable = np.full(n, np.inf)
+    batch = max(1, batch_entries // max(2 * n, 1))
+    for start in range(0, len(src), batch):
+        end = start + batch
+        u, v = src[start:end], dst[start:end]
+        endpoints = np.unique(np.concatenate([u, v]))
+        endpoints = endpoints[endpoints < n]
+        rows = dict()
+        if len(endpoints):
+            dist = csgraph.shortest_path(
+                matrix, directed=graph.directed, unweighted=True, indices=endpoints
+            )
+            rows = dict(zip(endpoints.tolist(), dist))
+
+        for a, b, steps in zip(u.tolist(), v.tolist(), length[start:end].tolist()):
+            du, dv = rows.get(a, unreachable), rows.get(b, unreachable)
+            affected |= np.isfinite(du) & (du + steps <= dv)
+            if not graph.directed:
+                affected |= np.isfinite(dv) & (dv + steps <= du)
+
+    return np.flatnonzero(affected)
+
+
+class MetricsState:
+    """
+    Grafo y métricas de centralidad que se actualizan al añadir relaciones.
+
+    Guarda las aristas del grafo, los grados, la intermediación sin normalizar (la
+    suma de las dependencias de Brandes de todos los orígenes) y, para la cercanía,
+    cuántos nodos alcanzan a cada nodo y la suma de sus distancias. Con esto las
+    métricas finales se obtienen sin recorrer el grafo, y al añadir relaciones solo
+    se recalculan los orígenes afectados (ver `update`). Los nodos nuevos se
+    numeran a continuación de los anteriores, así que los índices no cambian.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        src: np.ndarray,
+        dst: np.ndarray,
+        directed: bool,
+        digest: str,
+        raw_betweenness: np.ndarray,
+        reached: np.ndarray,
+        total: np.ndarray,
+    ):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.src = src
+        self.dst = dst
+        self.directed = directed
+        self.digest = digest
+        self.raw_betweenness = raw_betweenness
+        self.reached = reached
+        self.total = total
+        # orígenes recalculados en la última actualización (ver `update`)
+        self.affected = None
+
+        n = len(names)
+        self.out_degree = np.bincount(src, minlength=n)
+        self.in_degree = np.bincount(dst, minlength=n)
+        if not directed:
+            self.out_degree = self.in_degree = self.out_degree + self.in_degree
+
+    @staticmethod
+    def meta_path(path: str) -> str:
+        """
+        Ruta de los metadatos (nombres, tipo de grafo y hash de las relaciones) del estado.
+        """
+
+        root, _ = os.path.splitext(path)
+        return root + ".json"
+
+    def csr(self) -> CSRGraph:
+        """
+        Grafo compacto con las aristas del estado, con los mismos índices.
+        """
+
+        return CSRGraph(self.names, self.src, self.dst, self.directed)
+
+    @classmethod
+    def build(
+        cls,
+        graph: CSRGraph,
+        digest: str,
+        jobs: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+    ) -> "MetricsState":
+        """
+        Calcula el estado de un grafo desde cero.
+
+        Params:
+        -------
+        graph : CSRGraph
+            El grafo compacto.
+        digest : str
+            El hash de las relaciones del grafo (ver `relations_digest`).
+        jobs : Optional[int]
+            Número de procesos de la intermediación (ver `BrandesPool`).
+        executor : Optional[Executor]
+            Pool de procesos ya creado para la intermediación (ver `BrandesPool`).
+
+        Returns:
+        --------
+        MetricsState
+            El estado del grafo.
+        """
+
+        sources = np.arange(graph.number_of_nodes())
+        src, dst = _edges(graph)
+        reached, total = _distance_sums(graph, sources)
+        return cls(
+            list(graph.names),
+            src,
+            dst,
+            graph.directed,
+            digest,
+            _brandes(graph, sources, jobs, executor=executor),
+            reached,
+            total,
+        )
+
+    def new_relations(self, relations: Iterable[tuple]) -> Optional[List[tuple]]:
+        """
+        Obtiene las relaciones que no están en el estado.
+
+        Params:
+        -------
+        relations : Iterable[tuple]
+            Todas las relaciones (autor, director) actuales.
+
+        Returns:
+        --------
+        Optional[List[tuple]]
+            Las relaciones nuevas, ordenadas, o None si falta alguna de las del
+            estado (solo se soporta añadir relaciones).
+        """
+
+        def pair(a: str, b: str) -> tuple:
+            return (a, b) if self.directed or a <= b else (b, a)
+
+        current = {pair(a, b) for a, b in relations}
+        names = self.names
+        previous = {
+            pair(names[u], names[v])
+            for u, v in zip(self.src.tolist(), self.dst.tolist())
+        }
+        if previous - current:
+            return None
+        return sorted(current - previous)
+
+    def update(
+        self,
+        relations: Iterable[tuple],
+        digest: str,
+        jobs: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+    ) -> "MetricsState":
+        """
+        Añade relaciones al estado actualizando las métricas.
+
+        Los grados se vuelven a contar con las aristas (es exacto y lineal en el
+        número de aristas, sin búsquedas). Para la intermediación y la cercanía se
+        restan las aportaciones de los orígenes afectados (ver `affected_sources`)
+        en el grafo anterior y se suman las suyas y las de los nodos nuevos en el
+        grafo nuevo; las de los demás orígenes no cambian. En grafos no dirigidos
+        los nodos nuevos solo afectan a un origen si abren un camino más corto entre
+        nodos anteriores (ver `virtual_edges`): los caminos de los demás orígenes
+        hasta los nodos nuevos son los de los nodos nuevos hasta ellos, y se
+        cuentan en las búsquedas desde los nodos nuevos. El coste es el de dos
+        búsquedas por origen afectado y una por nodo nuevo, en lugar de una por
+        nodo; si eso es más, el estado se calcula desde cero sobre el grafo nuevo.
+
+        Params:
+        -------
+        relations : Iterable[tuple]
+            Las relaciones (autor, director) nuevas. Las que ya están se ignoran.
+        digest : str
+            El hash de todas las relaciones después de añadirlas.
+        jobs : Optional[int]
+            Número de procesos de la intermediación.
+        executor : Optional[Executor]
+            Pool de procesos ya creado para la intermediación (ver `BrandesPool`).
+
+        Returns:
+        --------
+        MetricsState
+            El estado nuevo (el anterior no se modifica).
+        """
+
+        names = list(self.names)
+        index = dict(self.index)
+        existing = set(zip(self.src.tolist(), self.dst.tolist()))
+        pairs = set()
+        for author, director in relations:
+            for name in (author, director):
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+            u, v = index[author], index[director]
+            if not self.directed and u > v:
+                u, v = v, u
+            if (u, v) not in existing:
+                pairs.add((u, v))
+
+        n_old, n = len(self.names), len(names)
+        if not pairs:
+            return MetricsState(
+                names,
+                self.src,
+                self.dst,
+                self.directed,
+                digest,
+                self.raw_betweenness,
+                self.reached,
+                self.total,
+            )
+
+        new = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+        old_graph = self.csr()
+        src = np.concatenate([self.src, new[:, 0]])
+        dst = np.concatenate([self.dst, new[:, 1]])
+        graph = CSRGraph(names, src, dst, self.directed)
+        added = np.arange(n_old, n)
+
+        # en no dirigidos, los orígenes no afectados solo ganan los caminos hasta los
+        # nodos nuevos, que son los mismos que desde los nodos nuevos hasta ellos
+        symmetric = None
+        if self.directed:
+            sources = affected_sources(old_graph, new[:, 0], new[:, 1])
+        else:
+            sources = affected_sources(
+                old_graph, *virtual_edges(new[:, 0], new[:, 1], n_old)
+            )
+            symmetric = np.zeros(n, dtype=bool)
+            symmetric[:n_old] = True
+            symmetric[sources] = False
+
+        # si los nuevos caminos cambian casi todo, es más barato calcularlo de nuevo
+        if 2 * len(sources) + len(added) >= n:
+            state = MetricsState.build(graph, digest, jobs, executor)
+            state.affected = n_old
+            return state
+
+        def grow(values: np.ndarray) -> np.ndarray:
+            return np.concatenate([values, np.zeros(n - n_old, dtype=values.dtype)])
+
+        brandes = partial(_brandes, jobs=jobs, executor=executor)
+        raw = grow(self.raw_betweenness - brandes(old_graph, sources))
+        raw += brandes(graph, sources)
+        targets = None if symmetric is None else 1.0 + symmetric
+        raw += brandes(graph, added, targets=targets)
+        # los nodos sin caminos que pasen por ellos quedan a 0 y no con el error de
+        # redondeo de la resta (una aportación no nula es al menos 1 / caminos)
+        raw[np.abs(raw) < TOLERANCE] = 0.0
+
+        old_reached, old_total = _distance_sums(old_graph, sources)
+        new_reached, new_total = _distance_sums(graph, sources)
+        add_reached, add_total = _distance_sums(graph, added, symmetric)
+        reached = grow(self.reached - old_reached) + new_reached + add_reached
+        total = grow(self.total - old_total) + new_total + add_total
+
+        state = MetricsState(
+            names, src, dst, self.directed, digest, raw, reached, total
+        )
+        state.affected = len(sources)
+        return state
+
+    def centrality(self, metric: str) -> Dict[str, float]:
+        """
+        Obtiene una métrica de centralidad del estado, igual que las de `metrics`.
+
+        Params:
+        -------
+        metric : str
+            "degree", "in_degree" (solo en grafos dirigidos), "betweenness"
+            (normalizada) o "closeness".
+
+        Returns:
+        --------
+        Dict[str, float]
+            Un diccionario que mapea cada nodo a su centralidad.
+
+        Raises:
+        -------
+        ValueError
+            Si la métrica no es una de `METRICS` o es "in_degree" en un grafo no
+            dirigido.
+        """
+
+        if metric not in METRICS or (metric == "in_degree" and not self.directed):
+            raise ValueError("Metrica no soportada: {}".format(metric))
+
+        n = len(self.names)
+        if metric in ("degree", "in_degree") and n <= 1:
+            return {name: 1.0 for name in self.names}
+
+        if metric == "degree":
+            degree = self.out_degree
+            if self.directed:
+                degree = degree + self.in_degree
+            values = degree / (n - 1)
+        elif metric == "in_degree":
+            values = self.in_degree / (n - 1)
+        elif metric == "betweenness":
+            values = betweenness.rescale(
+                self.raw_betweenness, n, normalized=True, directed=self.directed
+            )
+        else:
+            # como en `closeness.closeness_centrality`, sin contar el propio nodo
+            found = self.reached - 1
+            values = np.zeros(n)
+            if n > 1:
+                mask = self.total > 0
+                values[mask] = found[mask] / self.total[mask] * found[mask] / (n - 1)
+        return dict(zip(self.names, values.tolist()))
+
+    def save(self, path: str) -> None:
+        """
+        Guarda el estado: los arrays en `path` (.npz) y los metadatos junto a ellos.
+        """
+
+        # escribimos en temporales y renombramos, para no dejar un estado a medias
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                src=self.src,
+                dst=self.dst,
+                raw_betweenness=self.raw_betweenness,
+                reached=self.reached,
+                total=self.total,
+            )
+        meta = {"digest": self.digest, "directed": self.directed, "names": self.names}
+        with open(self.meta_path(tmp_path), "w") as f:
+            f.write(json.dumps(meta, ensure_ascii=False))
+        os.replace(tmp_path, path)
+        os.replace(self.meta_path(tmp_path), self.meta_path(path))
+
+    @classmethod
+    def load(cls, path: str) -> Optional["MetricsState"]:
+        """
+        Lee un estado guardado con `save`, o None si no existe.
+        """
+
+        meta_path = cls.meta_path(path)
+        if not os.path.exists(path) or not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with np.load(path) as arrays:
+            return cls(
+                meta["names"],
+                arrays["src"],
+                arrays["dst"],
+                meta["directed"],
+                meta["digest"],
+                arrays["raw_betweenness"],
+                arrays["reached"],
+                arrays["total"],
+            )
+
+
+def get_metrics_state(
+    relations: Iterable[tuple],
+    filename: str,
+    digest: str,
+    directed: bool,
+    jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> MetricsState:
+    """
+    Obtiene el estado de las métricas de las relaciones actuales: el guardado si no
+    han cambiado, el guardado actualizado con las relaciones nuevas o, si no hay
+    estado o se ha quitado alguna relación, uno calculado desde cero. Se guarda
+    junto al archivo de tesis.
+
+    Params:
+    -------
+    relations : Iterable[tuple]
+        Todas las relaciones (autor, director) actuales.
+    filename : str
+        La ruta del archivo JSON de tesis junto al que se guarda el estado.
+    digest : str
+        El hash de las relaciones (ver `relations_digest`).
+    directed : bool
+        Indica si se quiere el estado del grafo dirigido o del no dirigido.
+    jobs : Optional[int]
+        Número de procesos de la intermediación.
+    executor : Optional[Executor]
+        Pool de procesos ya creado para la intermediación (ver `BrandesPool`).
+
+    Returns:
+    --------
+    MetricsState
+        El estado de las métricas.
+    """
+
+    path = metrics_state_path(filename, directed)
+    state = MetricsState.load(path)
+    if state is not None and state.digest == digest:
+        return state
+
+    batch = state.new_relations(relations) if state is not None else None
+    if batch is None:
+        print(f"[INFO] Calculando las métricas desde cero: {path}")
+        graph = CSRGraph.from_relations(relations, directed)
+        state = MetricsState.build(graph, digest, jobs, executor)
+    else:
+        state = state.update(batch, digest, jobs, executor)
+        print(
+            f"[INFO] Métricas actualizadas con {len(batch)} relaciones nuevas "
+            f"({state.affected} de {len(state.names)} orígenes "
+            f"recalculados): {path}"
+        )
+    state.save(path)
+    return state
+
+
+def state_metric(
+    state: MetricsState, graph: CSRGraph, metric: str
+) -> Tuple[List[tuple], None]:
+    """
+    Ordena de mayor a menor una métrica del estado, con la forma de
+    `metrics.compute_metric`.
+
+    Los nodos se recorren en el orden de `graph` (el del resto del análisis), para
+    que los empates queden en el mismo orden que sin el estado.
+    """
+
+    values = state.centrality(metric)
+    ordered = ((name, values[name]) for name in graph.names)
+    return sorted(ordered, key=lambda x: x[1], reverse=True), None
+
+
+def check_state(
+    state: MetricsState,
+    jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+) -> Dict[str, float]:
+    """
+    Compara las métricas del estado con las calculadas desde cero sobre su grafo.
+
+    Params:
+    -------
+    state : MetricsState
+        El estado de las métricas.
+    jobs : Optional[int]
+        Número de procesos de la intermediación.
+    executor : Optional[Executor]
+        Pool de procesos ya creado para la intermediación (ver `BrandesPool`).
+
+    Returns:
+    --------
+    Dict[str, float]
+        La mayor diferencia absoluta de cada métrica.
+    """
+
+    graph = state.csr()
+    full = {
+        "degree": csr_graph.degree_centrality(graph),
+        "betweenness": betweenness.betweenness_centrality(
+            graph, jobs=jobs, executor=executor
+        ),
+        "closeness": closeness.closeness_centrality(graph),
+    }
+    if state.directed:
+        full["in_degree"] = csr_graph.in_degree_centrality(graph)
+
+    errors = dict()
+    for metric, expected in full.items():
+        values = state.centrality(metric)
+        errors[metric] = max(
+            (abs(values[node] - value) for node, value in expected.items()),
+            default=0.0,
+        )
+    return errors
@@ -0,0 +1,291 @@
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph.force_layout import force_layout
+
+# motores de layout: el de NetworkX y el multinivel para grafos grandes
+ENGINES = ("spring", "multilevel")
+
+
+def layout_path(filename: str, k: float) -> str:
+    """
+    Obtiene la ruta donde se guardan las posiciones de un grafo para una distancia k.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+    k : float
+        La distancia óptima entre nodos del layout.
+
+    Returns:
+    --------
+    str
+        La ruta del archivo de posiciones (p. ej: data/thesis.layout_k0.14.json).
+    """
+
+    root, _ = os.path.splitext(filename)
+    return f"{root}.layout_k{k}.json"
+
+
+def load_layout(path: str) -> Optional[dict]:
+    """
+    Lee un layout guardado con `save_layout`.
+
+    Params:
+    -------
+    path : str
+        La ruta del archivo de posiciones.
+
+    Returns:
+    --------
+    Optional[dict]
+        Un diccionario con el hash de las relaciones ("digest"), los parámetros ("k",
+        "seed", "engine") y las posiciones sin reescalar de cada nodo ("positions"), o None
+        si no existe.
+    """
+
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_layout(
+    path: str,
+    positions: Dict[str, Tuple[float, float]],
+    digest: str,
+    k: float,
+    seed: int,
+    engine: str = "spring",
+) -> None:
+    """
+    Guarda las posiciones de un grafo junto al hash de sus relaciones.
+
+    Params:
+    -------
+    path : str
+        La ruta del archivo de posiciones.
+    positions : Dict[str, Tuple[float, float]]
+        La posición de cada nodo.
+    digest : str
+        El hash de las relaciones del grafo (ver `relations_digest`).
+    k : float
+        La distancia óptima entre nodos con la que se calculó.
+    seed : int
+        La semilla con la que se calculó.
+    engine : str
+        El motor con el que se calculó (ver `ENGINES`).
+
+    Returns:
+    --------
+    None
+    """
+
+    layout = {
+        "digest": digest,
+        "k": k,
+        "seed": seed,
+        "engine": engine,
+        "positions": {node: [float(x), float(y)] for node, (x, y) in positions.items()},
+    }
+
+    # escribimos en un temporal y renombramos, para no dejar un layout a medias
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        f.write(json.dumps(layout, ensure_ascii=False))
+    os.replace(path + ".tmp", path)
+
+
+def initial_positions(
+    graph: nx.Graph, previous: Dict[str, list], k: float, seed: int
+) -> Dict[str, np.ndarray]:
+    """
+    Coloca los nodos nuevos de un grafo junto a sus vecinos ya colocados.
+
+    Los nodos que ya estaban conservan su posición. Cada nodo nuevo va al centro de
+    sus vecinos colocados, con un pequeño desplazamiento aleatorio (para que no
+    coincidan); los que no tienen ningún vecino colocado van a un punto al azar del
+    rectángulo que ocupa el layout anterior.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo actual.
+    previous : Dict[str, list]
+        Las posiciones del layout anterior.
+    k : float
+        La distancia óptima entre nodos, que fija el tamaño del desplazamiento.
+    seed : int
+        La semilla de los desplazamientos.
+
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        La posición inicial de cada nodo del grafo.
+    """
+
+    rng = np.random.default_rng(seed)
+    pos = {
+        node: np.asarray(previous[node], dtype=float)
+        for node in graph
+        if node in previous
+    }
+    coords = np.array(list(pos.values())) if pos else np.zeros((1, 2))
+    low, high = coords.min(axis=0), coords.max(axis=0)
+
+    pending = [node for node in graph if node not in pos]
+    while pending:
+        # cada pasada coloca los nodos con algún vecino ya colocado
+        placed = []
+        for node in pending:
+            neighbors = [pos[v] for v in graph[node] if v in pos]
+            if neighbors:
+                jitter = rng.normal(scale=k / 10, size=2)
+                placed.append((node, np.mean(neighbors, axis=0) + jitter))
+        if not placed:
+            # componentes nuevas sin ningún nodo colocado: una al azar
+            placed = [(pending[0], rng.uniform(low, high))]
+        for node, position in placed:
+            pos[node] = position
+        done = {node for node, _ in placed}
+        pending = [node for node in pending if node not in done]
+
+    return pos
+
+
+def spring_layout(
+    graph: nx.Graph,
+    k: float,
+    seed: int = 12,
+    previous: Optional[Dict[str, list]] = None,
+    iterations: int = 50,
+    max_new: float = 0.5,
+    engine: str = "spring",
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Calcula un layout de fuerzas, partiendo de uno anterior si lo hay.
+
+    Sin layout anterior es `nx.spring_layout(graph, seed=seed, k=k)`, o
+    `force_layout.force_layout` con el motor "multilevel". Con él, los
+    nodos que ya estaban se quedan fijos y solo se mueven los nuevos, colocados antes
+    junto a sus vecinos (ver `initial_positions`): el dibujo no cambia de una
+    ejecución a otra y solo hay que simular los nodos nuevos. Si los nodos nuevos son
+    más de `max_new` del total, el layout anterior se parece poco al grafo y se
+    calcula desde cero.
+
+    Las posiciones no se reescalan: k solo tiene sentido en las unidades de la
+    simulación, así que es en ellas donde hay que continuarla (ver `get_layout`).
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo.
+    k : float
+        La distancia óptima entre nodos.
+    seed : int
+        La semilla del layout.
+    previous : Optional[Dict[str, list]]
+        Las posiciones de un layout anterior del mismo grafo.
+    iterations : int
+        Iteraciones de la simulación de fuerzas.
+    max_new : float
+        Fracción máxima de nodos nuevos para partir del layout anterior.
+    engine : str
+        "spring" (NetworkX) o "multilevel" (`force_layout.force_layout`).
+
+    Returns:
+    --------
+    Dict[str, Tuple[float, float]]
+        La posición de cada nodo.
+
+    Raises:
+    -------
+    ValueError
+        Si el motor no es uno de `ENGINES`.
+    """
+
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de layout no soportado: {engine}")
+    layout = nx.spring_layout if engine == "spring" else force_layout
+
+    n = graph.number_of_nodes()
+    fixed = [node for node in graph if previous and node in previous]
+    if not fixed or (n - len(fixed)) > max_new * n:
+        if engine == "spring":
+            pos = layout(graph, seed=seed, k=k, iterations=iterations, scale=None)
+        else:
+            pos = layout(graph, k, seed=seed, iterations=iterations)
+    elif len(fixed) == n:
+        pos = {node: previous[node] for node in graph}
+    else:
+        pos = layout(
+            graph,
+            k=k,
+            pos=initial_positions(graph, previous, k, seed),
+            fixed=fixed,
+            seed=seed,
+            iterations=iterations,
+        )
+
+    return {node: (float(x), float(y)) for node, (x, y) in pos.items()}
+
+
+def get_layout(
+    graph: nx.Graph,
+    filename: str,
+    digest: str,
+    k: float,
+    seed: int = 12,
+    engine: str = "spring",
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Obtiene las posiciones de un grafo: las guardadas si no ha cambiado, o las calcula
+    partiendo del último layout guardado y las guarda.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo.
+    filename : str
+        La ruta del archivo JSON de tesis junto al que se guarda el layout.
+    digest : str
+        El hash de las relaciones del grafo (ver `relations_digest`).
+    k : float
+        La distancia óptima entre nodos.
+    seed : int
+        La semilla del layout.
+    engine : str
+        El motor del layout (ver `ENGINES`). Un layout guardado con otro motor o
+        con otra semilla no se reutiliza.
+
+    Returns:
+    --------
+    Dict[str, Tuple[float, float]]
+        La posición de cada nodo, centrada y reescalada a [-1, 1] como en
+        `nx.spring_layout`.
+    """
+
+    path = layout_path(filename, k)
+    layout = load_layout(path)
+    if layout is not None and (
+        layout["seed"] != seed or layout.get("engine", "spring") != engine
+    ):
+        layout = None
+
+    if layout is not None and layout["digest"] == digest:
+        positions = layout["positions"]
+    else:
+        print(f"[INFO] Calculando el layout: {path}")
+        previous = layout["positions"] if layout is not None else None
+        positions = spring_layout(graph, k, seed=seed, previous=previous, engine=engine)
+        save_layout(path, positions, digest, k, seed, engine)
+
+    # se guardan en las unidades de la simulación y se reescalan al devolverlas
+    positions = {node: np.asarray(xy, dtype=float) for node, xy in positions.items()}
+    positions = nx.rescale_layout_dict(positions)
+    return {node: (float(x), float(y)) for node, (x, y) in positions.items()}
@@ -1,10 +1,16 @@
 import os
-from typing import List
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 
+from graph import betweenness, closeness, csr_graph, render
+from graph.csr_graph import CSRGraph
+from graph.distance_index import DistanceIndex
+
 
 def plot_metric(metric_list: List[tuple], output_dir: str, filename: str):
     """
@@ -28,43 +34,42 @@ def plot_metric(metric_list: List[tuple], output_dir: str, filename: str):
     names = [item[0] for item in metric_list[:10]]
     values = [item[1] for item in metric_list[:10]]
 
+    # las métricas aproximadas llevan su cota de error como tercer elemento
+    errors = [item[2] for item in metric_list[:10] if len(item) > 2]
+
     metric = filename.split(".")[0]
 
     # Creamos un rango de colores basado en los valores de la métrica usando el colormap 'viridis'
     colors = plt.cm.viridis(np.linspace(0, 1, len(values)))
 
-    plt.figure(figsize=(10, 6))
-    plt.bar(names, values, color=colors)
-    plt.ylabel(f"Valor de {metric}")
-    plt.title(f"Top 10 Individuos por {metric}")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
+    # la figura de los barplots se reutiliza y se vacía al terminar (ver `render.figure`)
+    with render.figure("barplot", (10, 6)):
+        plt.bar(names, values, color=colors, yerr=errors or None, capsize=4)
+        plt.ylabel(f"Valor de {metric}")
+        plt.title(f"Top 10 Individuos por {metric}")
+        plt.xticks(rotation=45, ha="right")
+        plt.tight_layout()
 
-    # Guardamos el gráfico en la misma ruta que el archivo de métricas
-    graph_filename = metric + "_barplot.svg"
-    graph_output_file = os.path.join(output_dir, graph_filename)
-    plt.savefig(graph_output_file)
+        # Guardamos el gráfico en la misma ruta que el archivo de métricas
+        graph_filename = metric + "_barplot.svg"
+        graph_output_file = os.path.join(output_dir, graph_filename)
+        plt.savefig(graph_output_file)
 
-    # Cerramos el gráfico para liberar recursos
-    plt.close()
 
-
-def save_metric(metric_list: List[tuple], is_digraph: bool, filename: str) -> None:
+def metric_output_dir(is_digraph: bool) -> str:
     """
-    Guarda una lista de métricas en un archivo y los barplots asociados en el mismo directorio.
+    Obtiene (y crea si no existe) el directorio donde se guardan las métricas de un grafo.
 
     Params:
     -------
-    metric_list : List[tuple]
-        La lista de tuplas que contienen nodos y valores de métricas.
     is_digraph : bool
         Indica si el grafo es dirigido o no dirigido.
-    filename : str
-        El nombre del archivo donde se guardará la métrica.
 
     Returns:
     --------
-    - None
+    str
+        outputs/interactive/metrics para el grafo dirigido y outputs/static/metrics
+        para el no dirigido.
     """
 
     metrics_dir = "interactive" if is_digraph else "static"
@@ -72,52 +77,142 @@ def save_metric(metric_list: List[tuple], is_digraph: bool, filename: str) -> No
 
     output_dir = os.path.join("outputs", metrics_dir)
     os.makedirs(output_dir, exist_ok=True)
+    return output_dir
 
-    output_file = os.path.join(output_dir, filename)
 
-    with open(output_file, "w") as f:
-        for node, metric_value in metric_list:
-            f.write(f"{node}: {str(metric_value)}\n")
+def write_metric(
+    metric_list: List[tuple],
+    is_digraph: bool,
+    filename: str,
+    header: Optional[List[str]] = None,
+) -> None:
+    """
+    Escribe una lista de métricas en un archivo de texto, sin el barplot.
+
+    Params:
+    -------
+    metric_list : List[tuple]
+        La lista de tuplas que contienen nodos y valores de métricas. Si una tupla
+        tiene un tercer elemento, es la cota de error del valor y se escribe como
+        "nodo: valor ± error".
+    is_digraph : bool
+        Indica si el grafo es dirigido o no dirigido.
+    filename : str
+        El nombre del archivo donde se guardará la métrica.
+    header : Optional[List[str]]
+        Líneas de comentario (precedidas de "# ") que se escriben al principio del
+        archivo, p. ej. para indicar que los valores son aproximados.
 
-    plot_metric(metric_list, output_dir, filename)
+    Returns:
+    --------
+    None
+    """
 
+    output_file = os.path.join(metric_output_dir(is_digraph), filename)
 
-def get_metric(graph: nx.Graph, metric: str, is_digraph: bool, filename: str) -> None:
+    with open(output_file, "w") as f:
+        for line in header or []:
+            f.write(f"# {line}\n")
+        for node, metric_value, *error in metric_list:
+            if error:
+                f.write(f"{node}: {str(metric_value)} ± {str(error[0])}\n")
+            else:
+                f.write(f"{node}: {str(metric_value)}\n")
+
+
+def compute_metric(
+    graph: Union[nx.Graph, CSRGraph],
+    metric: str,
+    jobs: Optional[int] = 1,
+    approximate: bool = False,
+    confidence: float = 0.95,
+    top_k: int = 10,
+    distances: Optional[DistanceIndex] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[List[tuple], Optional[List[str]]]:
     """
-    Calcula y guarda una métrica de centralidad para un grafo dado.
+    Calcula una métrica de centralidad y la ordena de mayor a menor, sin guardarla.
 
     Params:
     -------
-    graph : nx.Graph
+    graph : Union[nx.Graph, CSRGraph]
         El grafo para el cual se calculará la métrica.
     metric : str
-        La métrica de centralidad a calcular. Puede tomar los valores: "betweenness", "closeness" o "in_degree".
-    is_digraph : bool
-        Indica si el grafo es dirigido o no dirigido.
-    filename : str
-        El nombre del archivo donde se guardará la métrica calculada.
+        La métrica de centralidad: "betweenness", "closeness" o "in_degree".
+    jobs : Optional[int]
+        Número de procesos para la betweenness sobre el grafo compacto.
+    approximate : bool
+        Si es True, estima la betweenness con su cota de error.
+    confidence : float
+        Confianza de las cotas de error del modo aproximado.
+    top_k : int
+        Tamaño del ranking que debe estabilizarse en el modo aproximado.
+    distances : Optional[DistanceIndex]
+        Índice de distancias del mismo grafo, del que se lee la closeness.
+    executor : Optional[Executor]
+        Pool de procesos ya creado para la betweenness (ver `BrandesPool`).
 
     Returns:
     --------
-    None
+    Tuple[List[tuple], Optional[List[str]]]
+        La lista de tuplas (nodo, valor) o (nodo, valor, error) ordenada y las líneas
+        de cabecera del archivo (None si la métrica es exacta).
 
     Raises:
     -------
     ValueError
-        Si la métrica especificada no es soportada.
+        Si la métrica especificada no es soportada o no tiene modo aproximado.
     """
 
     metrics_map = {
         "betweenness": nx.betweenness_centrality,
-        "closeness": nx.closeness_centrality,
+        "closeness": closeness.closeness_centrality,
         "in_degree": nx.in_degree_centrality,
     }
 
-    if metric in metrics_map:
-        compute_metric = metrics_map[metric]
-        values = compute_metric(graph)
-    else:
+    # implementaciones que trabajan directamente sobre el grafo compacto
+    csr_metrics_map = {
+        "betweenness": partial(
+            betweenness.betweenness_centrality, jobs=jobs, executor=executor
+        ),
+        "closeness": closeness.closeness_centrality,
+        "in_degree": csr_graph.in_degree_centrality,
+    }
+
+    if metric not in metrics_map:
         raise ValueError("Metrica no soportada: {}".format(metric))
 
+    if approximate:
+        if metric != "betweenness":
+            raise ValueError("Metrica sin modo aproximado: {}".format(metric))
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_networkx(graph)
+
+        values, errors, info = betweenness.approximate_betweenness(
+            graph, confidence=confidence, top_k=top_k, jobs=jobs, executor=executor
+        )
+        sorted_values = sorted(
+            ((node, value, errors[node]) for node, value in values.items()),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        header = [
+            f"{metric} aproximada: {info['samples']} de {info['sources']} nodos origen",
+            f"cota de error con confianza {info['confidence']:.0%} "
+            f"(simultánea para todos los nodos)",
+            f"parada: {info['stop']} (top-{top_k})",
+        ]
+        return sorted_values, header
+
+    if distances is not None and metric == "closeness":
+        values = distances.closeness_centrality()
+    elif isinstance(graph, CSRGraph) and metric in csr_metrics_map:
+        values = csr_metrics_map[metric](graph)
+    else:
+        if isinstance(graph, CSRGraph):
+            graph = graph.to_networkx()
+        metric_function = metrics_map[metric]
+        values = metric_function(graph)
+
     sorted_values = sorted(values.items(), key=lambda x: x[1], reverse=True)
-    save_metric(sorted_values, is_digraph, filename)
+    return sorted_values, None
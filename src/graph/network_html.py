@@ -0,0 +1,182 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+import networkx as nx
+import pyvis
+from jinja2 import Environment, FileSystemLoader
+from pyvis.options import Options
+
+# plantilla de las páginas de pyvis: se usa la misma para que el resultado no cambie
+TEMPLATE_DIR = os.path.join(os.path.dirname(pyvis.__file__), "templates")
+
+# valores por defecto de los nodos y aristas de pyvis (`Network.from_nx`)
+DEFAULT_NODE_SIZE = 10
+DEFAULT_NODE_COLOR = "#97c2fc"
+DEFAULT_EDGE_WIDTH = 1
+
+# marcadores que se sustituyen por los nodos y las aristas al escribir la página
+NODES_MARKER = "@@nodes@@"
+EDGES_MARKER = "@@edges@@"
+
+
+class _Placeholder(list):
+    """
+    Una lista con un solo marcador que dice tener `size` elementos.
+
+    La plantilla usa el número de nodos para decidir qué partes muestra (la barra
+    de carga, con más de 100) y `tojson` para escribirlos: así se obtiene la página
+    con el marcador en el sitio de los datos sin construir la lista.
+    """
+
+    def __init__(self, marker: str, size: int):
+        super().__init__([marker])
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def _dumps(value: Any) -> str:
+    """
+    Serializa un valor como el filtro `tojson` de Jinja (claves ordenadas y sin
+    caracteres que rompan el HTML).
+    """
+
+    return (
+        json.dumps(value, sort_keys=True)
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+        .replace("'", "\\u0027")
+    )
+
+
+def _node_order(graph: nx.Graph) -> Iterator[str]:
+    """
+    Recorre los nodos en el orden en que los añade pyvis: según aparecen en las
+    aristas y después los aislados.
+    """
+
+    seen = set()
+    for u, v in graph.edges():
+        for node in (u, v):
+            if node not in seen:
+                seen.add(node)
+                yield node
+    for node in nx.isolates(graph):
+        yield node
+
+
+def _write_list(f: TextIO, items: Iterator[dict]) -> None:
+    """
+    Escribe una lista JSON elemento a elemento.
+    """
+
+    f.write("[")
+    for i, item in enumerate(items):
+        if i:
+            f.write(", ")
+        f.write(_dumps(item))
+    f.write("]")
+
+
+def write_network_html(
+    graph: nx.Graph,
+    path: str,
+    sizes: Optional[Dict[str, float]] = None,
+    groups: Optional[Dict[str, int]] = None,
+    directed: bool = True,
+    width: str = "1920px",
+    height: str = "1080px",
+    bgcolor: str = "#222222",
+    font_color: str = "white",
+) -> None:
+    """
+    Escribe la página interactiva de un grafo sin construir una red de pyvis.
+
+    El resultado es el mismo que `Network.from_nx` seguido de `save_graph` (la
+    misma plantilla, opciones, orden y formato de nodos y aristas), pero los nodos
+    y las aristas se escriben en el archivo uno a uno según se recorre el grafo: la
+    memoria no crece con el número de aristas y el grafo no se modifica. Como en
+    pyvis, el tamaño de los nodos con aristas se trunca a entero.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo.
+    path : str
+        La ruta de la página.
+    sizes : Optional[Dict[str, float]]
+        El tamaño de cada nodo (`DEFAULT_NODE_SIZE` si no se da).
+    groups : Optional[Dict[str, int]]
+        El grupo de cada nodo, que decide su color. Sin grupo, los nodos son de
+        `DEFAULT_NODE_COLOR`.
+    directed : bool
+        Si las aristas se dibujan con flecha.
+    width, height : str
+        El tamaño del lienzo.
+    bgcolor : str
+        El color de fondo.
+    font_color : str
+        El color de las etiquetas.
+
+    Returns:
+    --------
+    None
+    """
+
+    sizes = sizes or {}
+    groups = groups or {}
+
+    def nodes() -> Iterator[dict]:
+        for node in _node_order(graph):
+            size = sizes.get(node, DEFAULT_NODE_SIZE)
+            options = {"size": int(size) if graph.degree(node) else size}
+            if node in groups:
+                options["group"] = groups[node]
+            else:
+                options["color"] = DEFAULT_NODE_COLOR
+            options.update(id=node, label=node, shape="dot", font={"color": font_color})
+            yield options
+
+    def edges() -> Iterator[dict]:
+        for u, v, data in graph.edges(data=True):
+            edge = {"width": data.get("weight", DEFAULT_EDGE_WIDTH), "from": u, "to": v}
+            if directed:
+                edge["arrows"] = "to"
+            yield edge
+
+    options = Options(None)
+    template = Environment(loader=FileSystemLoader(TEMPLATE_DIR)).get_template(
+        "template.html"
+    )
+    page = template.render(
+        height=height,
+        width=width,
+        nodes=_Placeholder(NODES_MARKER, graph.number_of_nodes()),
+        edges=_Placeholder(EDGES_MARKER, graph.number_of_edges()),
+        heading="",
+        options=options.to_json(),
+        physics_enabled=options.physics.enabled,
+        use_DOT=False,
+        dot_lang="",
+        widget=False,
+        bgcolor=bgcolor,
+        conf=False,
+        tooltip_link=False,
+        neighborhood_highlight=False,
+        select_menu=False,
+        filter_menu=False,
+        notebook=False,
+        cdn_resources="local",
+    )
+    head, rest = page.split(_dumps([NODES_MARKER]))
+    middle, tail = rest.split(_dumps([EDGES_MARKER]))
+
+    with open(path, "w+") as f:
+        f.write(head)
+        _write_list(f, nodes())
+        f.write(middle)
+        _write_list(f, edges())
+        f.write(tail)
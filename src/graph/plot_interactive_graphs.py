@@ -2,7 +2,8 @@ import os
 from typing import Dict
 
 import networkx as nx
-from pyvis.network import Network
+
+from graph.network_html import write_network_html
 
 
 def plot_DiGraph(graph: nx.DiGraph, filename: str) -> None:
@@ -22,17 +23,7 @@ def plot_DiGraph(graph: nx.DiGraph, filename: str) -> None:
     None
     """
 
-    dinet = Network(
-        notebook=True,
-        width="1920px",
-        height="1080px",
-        bgcolor="#222222",
-        font_color="white",
-        directed=True,
-    )
-
-    dinet.from_nx(graph)
-    dinet.save_graph(os.path.join("outputs", "interactive", filename))
+    write_network_html(graph, os.path.join("outputs", "interactive", filename))
 
 
 def plot_graph_with_degree_size(
@@ -60,17 +51,10 @@ def plot_graph_with_degree_size(
     # modificamos las puntuaciones para visualizarlas mejor
     node_sizes = {k: v * 800 for k, v in degrees.items()}
 
-    dinet = Network(
-        notebook=True,
-        width="1920px",
-        height="1080px",
-        bgcolor="#222222",
-        font_color="white",
-        directed=True,
+    # los tamaños se pasan aparte: el grafo es compartido y no se modifica
+    write_network_html(
+        graph, os.path.join("outputs", "interactive", filename), sizes=node_sizes
     )
-    nx.set_node_attributes(graph, node_sizes, "size")
-    dinet.from_nx(graph)
-    dinet.save_graph(os.path.join("outputs", "interactive", filename))
 
 
 def plot_graph_with_communities(
@@ -103,15 +87,9 @@ def plot_graph_with_communities(
 
     node_sizes = {k: v * 800 for k, v in degrees.items()}
 
-    dinet = Network(
-        notebook=True,
-        width="1920px",
-        height="1080px",
-        bgcolor="#222222",
-        font_color="white",
-        directed=True,
+    write_network_html(
+        graph,
+        os.path.join("outputs", "interactive", filename),
+        sizes=node_sizes,
+        groups=communities,
     )
-    nx.set_node_attributes(graph, node_sizes, "size")
-    nx.set_node_attributes(graph, communities, "group")
-    dinet.from_nx(graph)
-    dinet.save_graph(os.path.join("outputs", "interactive", filename))
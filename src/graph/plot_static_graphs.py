@@ -1,11 +1,237 @@
 import os
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
 
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection
 
+from graph import render as rendering
 
-def plot_graph(graph: nx.Graph, filename: str) -> None:
+# formas de dibujar los grafos: todo en vectorial, o aristas rasterizadas y pocas etiquetas
+RENDER_MODES = ("full", "fast")
+
+# a partir de cuántos nodos "fast" rasteriza también los nodos
+RASTER_NODES = 5000
+
+# lado en píxeles de las teselas PNG
+TILE_SIZE = 256
+
+
+def top_nodes(scores: Dict[str, float], n: int) -> List[str]:
+    """
+    Obtiene los n nodos con mayor puntuación (a igualdad, en el orden del diccionario).
+    """
+
+    return sorted(scores, key=lambda node: -scores[node])[:n]
+
+
+def community_hubs(
+    communities: Dict[str, int], degrees: Dict[str, float], n: int
+) -> List[str]:
+    """
+    Obtiene el nodo de mayor grado de cada una de las n comunidades más grandes.
+
+    Params:
+    -------
+    communities : Dict[str, int]
+        La comunidad de cada nodo.
+    degrees : Dict[str, float]
+        El grado (o la centralidad de grado) de cada nodo.
+    n : int
+        El número de comunidades.
+
+    Returns:
+    --------
+    List[str]
+        Los nodos, de la comunidad más grande a la más pequeña.
+    """
+
+    members = dict()
+    for node, community in communities.items():
+        members.setdefault(community, []).append(node)
+    largest = sorted(members.values(), key=len, reverse=True)[:n]
+    return [max(nodes, key=lambda node: degrees.get(node, 0)) for nodes in largest]
+
+
+def draw_fast(
+    graph: nx.Graph,
+    pos: Dict,
+    labels: Iterable[str],
+    width: float,
+    font_size: float,
+    node_size=100,
+    node_color="#1f78b4",
+    cmap=None,
+    alpha=None,
+) -> None:
+    """
+    Dibuja un grafo en los ejes actuales con pocos objetos de matplotlib.
+
+    Todas las aristas van en una sola `LineCollection` rasterizada (en un SVG se
+    guardan como una imagen incrustada), los nodos en un solo `scatter` (también
+    rasterizado si hay más de `RASTER_NODES`) y solo se escriben las etiquetas de
+    `labels`, que siguen siendo texto. Admite los mismos argumentos de estilo que
+    `nx.draw`.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo que se dibujará.
+    pos : Dict
+        La posición de cada nodo.
+    labels : Iterable[str]
+        Los nodos cuyo nombre se escribe.
+    width : float
+        El grosor de las aristas.
+    font_size : float
+        El tamaño de letra de las etiquetas.
+    node_size, node_color, cmap, alpha
+        El estilo de los nodos, como en `nx.draw` (en el orden de `graph.nodes`).
+
+    Returns:
+    --------
+    None
+    """
+
+    ax = plt.gca()
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    xy = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
+
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.int64)
+    if len(edges):
+        lines = LineCollection(
+            xy[edges], colors="k", linewidths=width, rasterized=True, zorder=1
+        )
+        ax.add_collection(lines)
+
+    ax.scatter(
+        xy[:, 0],
+        xy[:, 1],
+        s=node_size,
+        c=node_color,
+        cmap=cmap,
+        alpha=alpha,
+        linewidths=0,
+        rasterized=len(nodes) > RASTER_NODES,
+        zorder=2,
+    )
+    for node in labels:
+        x, y = pos[node]
+        ax.text(x, y, node, fontsize=font_size, ha="center", va="center", zorder=3)
+
+    ax.autoscale_view()
+    ax.set_axis_off()
+
+
+def tile_paths(filename: str, levels: int) -> List[str]:
+    """
+    Obtiene las rutas de las teselas PNG de un gráfico (ver `save_tiles`).
+
+    Params:
+    -------
+    filename : str
+        El nombre del archivo del gráfico (p. ej: thesis_simple.svg).
+    levels : int
+        El número de niveles de zoom.
+
+    Returns:
+    --------
+    List[str]
+        outputs/static/tiles/<nombre>/<zoom>/<x>_<y>.png para cada tesela.
+    """
+
+    root = os.path.join("outputs", "static", "tiles", os.path.splitext(filename)[0])
+    return [
+        os.path.join(root, str(zoom), f"{x}_{y}.png")
+        for zoom in range(levels)
+        for x in range(2**zoom)
+        for y in range(2**zoom)
+    ]
+
+
+def save_tiles(fig: plt.Figure, filename: str, levels: int) -> None:
+    """
+    Guarda un gráfico cuadrado como teselas PNG de `TILE_SIZE` píxeles en varios zooms.
+
+    En el zoom z la figura se rasteriza con 2^z x 2^z teselas de lado, como los
+    mapas web (z/x_y.png, con y hacia abajo).
+
+    Params:
+    -------
+    fig : plt.Figure
+        La figura ya dibujada.
+    filename : str
+        El nombre del archivo del gráfico (ver `tile_paths`).
+    levels : int
+        El número de niveles de zoom.
+
+    Returns:
+    --------
+    None
+    """
+
+    # con el backend Agg (ver `render`) el lienzo de la figura ya es un mapa de bits
+    canvas = fig.canvas
+    dpi = fig.dpi
+    paths = iter(tile_paths(filename, levels))
+    for zoom in range(levels):
+        tiles = 2**zoom
+        fig.set_dpi(TILE_SIZE * tiles / fig.get_figwidth())
+        canvas.draw()
+        image = np.asarray(canvas.buffer_rgba())
+        for x in range(tiles):
+            for y in range(tiles):
+                path = next(paths)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tile = image[
+                    y * TILE_SIZE : (y + 1) * TILE_SIZE,
+                    x * TILE_SIZE : (x + 1) * TILE_SIZE,
+                ]
+                plt.imsave(path, tile)
+    fig.set_dpi(dpi)
+
+
+def _draw(
+    graph: nx.Graph,
+    pos: Dict,
+    figsize: float,
+    filename: str,
+    labels: List[str],
+    render: str,
+    tiles: int,
+    **style,
+) -> None:
+    """
+    Dibuja el grafo en el modo pedido en la figura de los grafos (ver
+    `render.figure`), lo guarda y, si se piden, guarda sus teselas.
+    """
+
+    if render not in RENDER_MODES:
+        raise ValueError(f"Modo de dibujo no soportado: {render}")
+
+    with rendering.figure("graph", (figsize, figsize)) as fig:
+        if render == "full":
+            nx.draw(graph, pos=pos, with_labels=True, **style)
+        else:
+            style.pop("font_color", None)
+            draw_fast(graph, pos, labels, **style)
+        plt.axis("equal")
+
+        fig.savefig(os.path.join("outputs", "static", filename))
+        if tiles:
+            save_tiles(fig, filename, tiles)
+
+
+def plot_graph(
+    graph: nx.Graph,
+    filename: str,
+    pos: Optional[Dict] = None,
+    render: str = "full",
+    labels: int = 30,
+    tiles: int = 0,
+) -> None:
     """
     Crea y guarda un gráfico de un grafo dado.
 
@@ -15,21 +241,47 @@ def plot_graph(graph: nx.Graph, filename: str) -> None:
         El grafo que se dibujará.
     filename : str
         El nombre del archivo donde se guardará el gráfico.
+    pos : Optional[Dict]
+        La posición de cada nodo (ver `layout.get_layout`). Si no se da, se calcula
+        con `nx.spring_layout`.
+    render : str
+        "full" dibuja todo en vectorial con todas las etiquetas; "fast" usa
+        `draw_fast` y solo escribe `labels` etiquetas.
+    labels : int
+        Número de etiquetas en el modo "fast": se etiquetan los nodos de mayor grado.
+    tiles : int
+        Niveles de zoom de las teselas PNG (ver `save_tiles`); 0 para no guardarlas.
 
     Returns:
     --------
     None
     """
 
-    fig = plt.figure(figsize=(15, 15))
-    pos = nx.spring_layout(graph, seed=12, k=0.1)
-    nx.draw(graph, pos=pos, with_labels=True, width=0.5, node_size=100, font_size=4)
-    plt.axis("equal")
-
-    fig.savefig(os.path.join("outputs", "static", filename))
+    if pos is None:
+        pos = nx.spring_layout(graph, seed=12, k=0.1)
+    _draw(
+        graph,
+        pos,
+        15,
+        filename,
+        top_nodes(dict(graph.degree), labels),
+        render,
+        tiles,
+        width=0.5,
+        node_size=100,
+        font_size=4,
+    )
 
 
-def plot_graph_with_degree_size(graph: nx.Graph, degrees: dict, filename: str) -> None:
+def plot_graph_with_degree_size(
+    graph: nx.Graph,
+    degrees: dict,
+    filename: str,
+    pos: Optional[Dict] = None,
+    render: str = "full",
+    labels: int = 30,
+    tiles: int = 0,
+) -> None:
     """
     Crea y guarda un gráfico de un grafo con nodos de tamaño proporcional a su grado.
 
@@ -41,6 +293,16 @@ def plot_graph_with_degree_size(graph: nx.Graph, degrees: dict, filename: str) -
         Un diccionario que mapea nodos a sus grados.
     filename : str
         El nombre del archivo donde se guardará el gráfico.
+    pos : Optional[Dict]
+        La posición de cada nodo (ver `layout.get_layout`). Si no se da, se calcula
+        con `nx.spring_layout`.
+    render : str
+        "full" dibuja todo en vectorial con todas las etiquetas; "fast" usa
+        `draw_fast` y solo escribe `labels` etiquetas.
+    labels : int
+        Número de etiquetas en el modo "fast": se etiquetan los nodos de mayor grado.
+    tiles : int
+        Niveles de zoom de las teselas PNG (ver `save_tiles`); 0 para no guardarlas.
 
     Returns:
     --------
@@ -50,13 +312,16 @@ def plot_graph_with_degree_size(graph: nx.Graph, degrees: dict, filename: str) -
     node_sizes = [deg * 10000 for deg in degrees.values()]
     node_colors = list(degrees.values())
 
-    fig = plt.figure(figsize=(13, 13))
-
-    pos = nx.spring_layout(graph, seed=12, k=0.14)
-    nx.draw(
+    if pos is None:
+        pos = nx.spring_layout(graph, seed=12, k=0.14)
+    _draw(
         graph,
-        pos=pos,
-        with_labels=True,
+        pos,
+        13,
+        filename,
+        top_nodes(degrees, labels),
+        render,
+        tiles,
         width=0.5,
         font_size=3.5,
         font_color="black",
@@ -65,12 +330,17 @@ def plot_graph_with_degree_size(graph: nx.Graph, degrees: dict, filename: str) -
         cmap=plt.cm.viridis,
         alpha=0.9,
     )
-    plt.axis("equal")
-    fig.savefig(os.path.join("outputs", "static", filename))
 
 
 def plot_graph_with_communities(
-    graph: nx.Graph, communities: Dict, degrees: Dict, filename: str
+    graph: nx.Graph,
+    communities: Dict,
+    degrees: Dict,
+    filename: str,
+    pos: Optional[Dict] = None,
+    render: str = "full",
+    labels: int = 30,
+    tiles: int = 0,
 ) -> None:
     """
     Crea y guarda un gráfico de un grafo con nodos coloreados según comunidades y tamaño proporcional a su grado.
@@ -85,6 +355,17 @@ def plot_graph_with_communities(
         Un diccionario que mapea nodos a sus grados.
     filename : str
         El nombre del archivo donde se guardará el gráfico.
+    pos : Optional[Dict]
+        La posición de cada nodo (ver `layout.get_layout`). Si no se da, se calcula
+        con `nx.spring_layout`.
+    render : str
+        "full" dibuja todo en vectorial con todas las etiquetas; "fast" usa
+        `draw_fast` y solo escribe `labels` etiquetas.
+    labels : int
+        Número de etiquetas en el modo "fast": se etiqueta el nodo de mayor grado de
+        cada una de las `labels` comunidades más grandes.
+    tiles : int
+        Niveles de zoom de las teselas PNG (ver `save_tiles`); 0 para no guardarlas.
 
     Returns:
     --------
@@ -94,13 +375,16 @@ def plot_graph_with_communities(
     node_sizes = [deg * 10000 for deg in degrees.values()]
     node_colors = list(communities.values())
 
-    fig = plt.figure(figsize=(13, 13))
-
-    pos = nx.spring_layout(graph, seed=12, k=0.14)
-    nx.draw(
+    if pos is None:
+        pos = nx.spring_layout(graph, seed=12, k=0.14)
+    _draw(
         graph,
-        pos=pos,
-        with_labels=True,
+        pos,
+        13,
+        filename,
+        community_hubs(communities, degrees, labels),
+        render,
+        tiles,
         width=0.5,
         font_size=3.5,
         font_color="black",
@@ -109,5 +393,3 @@ def plot_graph_with_communities(
         cmap=plt.cm.viridis,
         alpha=0.9,
     )
-    plt.axis("equal")
-    fig.savefig(os.path.join("outputs", "static", filename))
@@ -0,0 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+# los gráficos solo se guardan en archivos: nunca hace falta una ventana (pyplot
+# elige el backend al crear la primera figura, así que basta con fijarlo aquí)
+BACKEND = "Agg"
+matplotlib.use(BACKEND)
+
+
+def init_worker() -> None:
+    """
+    Configura matplotlib en un proceso de dibujo: backend sin ventanas e
+    identificadores fijos en los SVG, para que no cambien entre ejecuciones.
+    """
+
+    matplotlib.use(BACKEND, force=True)
+    matplotlib.rcParams["svg.hashsalt"] = "thesis"
+
+
+@contextmanager
+def figure(name: str, figsize: Tuple[float, float]) -> Iterator[plt.Figure]:
+    """
+    Obtiene la figura de un tipo de gráfico, vacía, y la vacía de nuevo al terminar.
+
+    Cada proceso tiene como mucho una figura por nombre, que se reutiliza de un
+    gráfico al siguiente: aunque el dibujo falle, sus elementos se liberan al salir
+    del bloque y la memoria no crece con el número de gráficos.
+
+    Params:
+    -------
+    name : str
+        El tipo de gráfico (p. ej: "graph" o "barplot").
+    figsize : Tuple[float, float]
+        El tamaño de la figura en pulgadas.
+
+    Returns:
+    --------
+    Iterator[plt.Figure]
+        La figura, que además es la actual de pyplot.
+    """
+
+    fig = plt.figure(num=name, clear=True)
+    fig.set_size_inches(figsize)
+    try:
+        yield fig
+    finally:
+        fig.clf()
+
+
+def render_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Crea el pool de procesos que dibujan los gráficos.
+
+    Como cada proceso reutiliza una figura por tipo de gráfico (ver `figure`), la
+    memoria de dibujo está acotada por `workers` veces la de una figura, sea cual
+    sea el número de gráficos, y el proceso principal, que guarda los grafos, no
+    dibuja nada.
+
+    Params:
+    -------
+    workers : int
+        Número máximo de procesos de dibujo a la vez.
+
+    Returns:
+    --------
+    ProcessPoolExecutor
+        El pool de procesos.
+    """
+
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
@@ -0,0 +1,173 @@
+// Visor de los grafos interactivos: carga los datos del grafo (ver web_export.py)
+// después de la página y lo dibuja con vis-network en las posiciones ya calculadas,
+// sin simulación de física salvo que se active.
+(function () {
+  "use strict";
+
+  var container = document.getElementById("graph");
+  var status = document.getElementById("status");
+  var physics = document.getElementById("physics");
+  var back = document.getElementById("back");
+  var source = container.dataset.src;
+  var network = null;
+
+  // los datos en .js llaman a esta función al cargarse con <script>, que también
+  // funciona al abrir la página del disco (file://)
+  window.graphViewerData = function (script, data) {
+    script.graphData = data;
+  };
+
+  function loadScript(url) {
+    return new Promise(function (resolve, reject) {
+      var script = document.createElement("script");
+      script.src = url;
+      script.onload = function () {
+        script.remove();
+        resolve(script.graphData);
+      };
+      script.onerror = function () {
+        script.remove();
+        reject(new Error(url));
+      };
+      document.head.appendChild(script);
+    });
+  }
+
+  // el JSON comprimido con gzip (.json.gz) se descarga con fetch, que los
+  // navegadores no permiten desde file://: hay que servir el directorio por HTTP
+  function load(url) {
+    if (url.endsWith(".js")) {
+      return loadScript(url);
+    }
+    if (window.location.protocol === "file:") {
+      return Promise.reject(
+        new Error(url + ": abre la página desde un servidor HTTP (p. ej: python -m http.server)")
+      );
+    }
+    return fetch(url).then(function (response) {
+      if (!response.ok) {
+        throw new Error(url + ": " + response.status);
+      }
+      if (url.endsWith(".gz")) {
+        var stream = response.body.pipeThrough(new DecompressionStream("gzip"));
+        return new Response(stream).json();
+      }
+      return response.json();
+    });
+  }
+
+  // "plain": nodos iguales; "degree": tamaño según el grado; "communities":
+  // además, color según la comunidad
+  function buildNodes(data, view) {
+    return data.nodes.map(function (name, i) {
+      var node = { id: i, label: name, x: data.x[i], y: data.y[i] };
+      if (view !== "plain") {
+        node.size = data.degree[i] * data.size_scale;
+      }
+      if (view === "communities") {
+        node.group = data.community[i];
+      }
+      return node;
+    });
+  }
+
+  function buildEdges(data) {
+    var edges = new Array(data.edges.length / 2);
+    for (var i = 0; i < edges.length; i++) {
+      edges[i] = { from: data.edges[2 * i], to: data.edges[2 * i + 1] };
+      if (data.weights) {
+        edges[i].width = Math.max(1, Math.log2(1 + data.weights[i]));
+        edges[i].title = data.weights[i] + (data.weights[i] === 1 ? " relación" : " relaciones");
+      }
+    }
+    return edges;
+  }
+
+  // resumen de las comunidades: un nodo por comunidad, con el nombre de su
+  // miembro de mayor grado y tamaño según su número de miembros
+  function buildCommunities(data) {
+    return data.community.map(function (community, i) {
+      return {
+        id: i,
+        label: data.nodes[i] + " (" + data.members[i] + ")",
+        title: "Comunidad " + community + ": " + data.members[i] + " personas",
+        x: data.x[i],
+        y: data.y[i],
+        size: 5 + 5 * Math.sqrt(data.members[i]),
+        group: community,
+      };
+    });
+  }
+
+  function draw(nodes, edges, directed) {
+    var data = { nodes: new vis.DataSet(nodes), edges: new vis.DataSet(edges) };
+    if (network !== null) {
+      network.setOptions({ edges: { arrows: directed ? "to" : "" } });
+      network.setData(data);
+      network.fit();
+      return network;
+    }
+    network = new vis.Network(container, data, {
+      nodes: { shape: "dot", size: 10, font: { color: "white" } },
+      edges: {
+        arrows: directed ? "to" : "",
+        color: { inherit: true },
+        smooth: false,
+      },
+      interaction: { hideEdgesOnDrag: nodes.length > 2000 },
+      physics: { enabled: false, stabilization: false },
+      layout: { improvedLayout: false },
+    });
+    physics.addEventListener("change", function () {
+      network.setOptions({ physics: { enabled: physics.checked } });
+    });
+    return network;
+  }
+
+  function showGraph(data, view) {
+    draw(buildNodes(data, view), buildEdges(data), data.directed);
+    status.textContent = data.nodes.length + " nodos, " + data.edges.length / 2 + " relaciones";
+  }
+
+  function showOverview(overview) {
+    var base = source.substring(0, source.lastIndexOf("/") + 1);
+    back.hidden = true;
+    draw(buildCommunities(overview), buildEdges(overview), false);
+    status.textContent = overview.community.length + " comunidades: pulsa una para abrirla";
+
+    // al pulsar una comunidad se carga solo su archivo
+    network.off("click");
+    network.on("click", function (event) {
+      if (!event.nodes.length) {
+        return;
+      }
+      var i = event.nodes[0];
+      status.textContent = "Cargando la comunidad " + overview.community[i] + "…";
+      load(base + overview.files[i])
+        .then(function (data) {
+          network.off("click");
+          showGraph(data, "communities");
+          back.hidden = false;
+        })
+        .catch(fail);
+    });
+  }
+
+  function fail(error) {
+    status.textContent = "No se ha podido cargar el grafo: " + error.message;
+  }
+
+  load(source)
+    .then(function (data) {
+      var view = container.dataset.view;
+      if (view === "overview") {
+        back.addEventListener("click", function () {
+          showOverview(data);
+        });
+        showOverview(data);
+      } else {
+        showGraph(data, view);
+      }
+    })
+    .catch(fail);
+})();
@@ -0,0 +1,366 @@
+import gzip
+import json
+import os
+import shutil
+from collections import Counter
+from string import Template
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+
+# plantilla de las páginas y visor compartido por todas
+WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web")
+VIEWER = "graph_viewer.js"
+
+# vistas del visor: nodos iguales, tamaño según el grado, color según la comunidad y
+# una con un nodo por comunidad que se abre al pulsarlo
+VIEWS = ("plain", "degree", "communities", "overview")
+
+# escala de las posiciones ([-1, 1]) a píxeles, por raíz del número de nodos
+PIXELS_PER_NODE = 50
+
+# escala del tamaño de los nodos según su centralidad de grado (la de pyvis)
+SIZE_SCALE = 800
+
+# función del visor a la que llaman los datos en .js al cargarse con <script>
+DATA_CALLBACK = "graphViewerData"
+
+
+def data_suffix(compress: bool = False) -> str:
+    """
+    Obtiene la extensión de los datos que cargan las páginas.
+
+    Sin comprimir, los datos van en un .js que el visor carga con una etiqueta
+    <script>, así que las páginas se abren también directamente del disco
+    (file://). El JSON comprimido se descarga con fetch, que los navegadores solo
+    permiten desde un servidor HTTP (p. ej: python -m http.server).
+    """
+
+    return ".json.gz" if compress else ".js"
+
+
+def graph_data_path(output_dir: str, compress: bool = False) -> str:
+    """
+    Obtiene la ruta de los datos del grafo que cargan las páginas.
+
+    Params:
+    -------
+    output_dir : str
+        El directorio de las páginas (p. ej: outputs/interactive).
+    compress : bool
+        Si los datos se guardan en JSON comprimido con gzip (ver `data_suffix`).
+
+    Returns:
+    --------
+    str
+        La ruta del archivo (p. ej: outputs/interactive/thesis_graph.js o
+        outputs/interactive/thesis_graph.json.gz).
+    """
+
+    return os.path.join(output_dir, "thesis_graph" + data_suffix(compress))
+
+
+def communities_dir(output_dir: str) -> str:
+    """
+    Obtiene el directorio con el resumen de las comunidades y un archivo por comunidad.
+    """
+
+    return os.path.join(output_dir, "communities")
+
+
+def _scale(n: int) -> float:
+    """
+    Escala de las posiciones a píxeles para un grafo de n nodos.
+    """
+
+    return PIXELS_PER_NODE * max(n, 1) ** 0.5
+
+
+def graph_data(
+    graph: nx.Graph,
+    pos: Dict[str, Tuple[float, float]],
+    degrees: Dict[str, float],
+    communities: Dict[str, int],
+    scale: Optional[float] = None,
+) -> dict:
+    """
+    Codifica un grafo de forma compacta para el visor.
+
+    Los nodos van en una lista y todo lo demás en listas paralelas por índice: las
+    posiciones en píxeles enteros, el grado, la comunidad y las aristas como pares
+    de índices seguidos ([origen, destino, origen, destino...]).
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo (dirigido o no).
+    pos : Dict[str, Tuple[float, float]]
+        La posición de cada nodo, reescalada a [-1, 1] (ver `layout.get_layout`).
+    degrees : Dict[str, float]
+        La centralidad de grado de cada nodo.
+    communities : Dict[str, int]
+        La comunidad de cada nodo.
+    scale : Optional[float]
+        Píxeles por unidad de las posiciones; por defecto, según el número de nodos.
+
+    Returns:
+    --------
+    dict
+        Los datos del grafo, serializables en JSON.
+    """
+
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    scale = scale or _scale(len(nodes))
+
+    edges = []
+    for u, v in graph.edges():
+        edges += [index[u], index[v]]
+
+    return {
+        "directed": graph.is_directed(),
+        "size_scale": SIZE_SCALE,
+        "nodes": nodes,
+        "x": [round(pos[node][0] * scale) for node in nodes],
+        # el eje y del canvas crece hacia abajo
+        "y": [round(-pos[node][1] * scale) for node in nodes],
+        "degree": [round(degrees.get(node, 0), 5) for node in nodes],
+        "community": [communities.get(node, -1) for node in nodes],
+        "edges": edges,
+    }
+
+
+def write_graph_data(data: dict, path: str) -> None:
+    """
+    Guarda los datos del grafo en JSON sin espacios: comprimido si la ruta acaba en
+    .gz y, si acaba en .js, como argumento de `DATA_CALLBACK` (ver `data_suffix`).
+    """
+
+    encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    if path.endswith(".js"):
+        encoded = f"{DATA_CALLBACK}(document.currentScript,{encoded});\n"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".gz"):
+        # sin fecha en la cabecera, para que el archivo no cambie entre ejecuciones
+        with open(path, "wb") as f, gzip.GzipFile(
+            fileobj=f, mode="wb", filename="", mtime=0
+        ) as gz:
+            gz.write(encoded.encode("utf-8"))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(encoded)
+
+
+def write_communities(
+    graph: nx.Graph,
+    communities: Dict[str, int],
+    degrees: Dict[str, float],
+    pos: Dict[str, Tuple[float, float]],
+    directory: str,
+    compress: bool = False,
+) -> str:
+    """
+    Escribe el resumen de las comunidades de un grafo y un archivo por comunidad.
+
+    El resumen tiene un nodo por comunidad, en el centro de sus miembros, con su
+    número de miembros y el nombre del de mayor grado, y una arista entre cada par
+    de comunidades relacionadas con el número de relaciones entre ellas. Cada
+    comunidad se guarda aparte (`<comunidad>.js`) con el subgrafo de sus
+    miembros en el formato de `graph_data` y sus posiciones en el grafo completo,
+    para cargarla solo cuando se abre.
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo (dirigido o no).
+    communities : Dict[str, int]
+        La comunidad de cada nodo (ver `community_louvain.best_partition`).
+    degrees : Dict[str, float]
+        La centralidad de grado de cada nodo.
+    pos : Dict[str, Tuple[float, float]]
+        La posición de cada nodo (ver `layout.get_layout`).
+    directory : str
+        El directorio donde se guardan, que se vacía antes.
+    compress : bool
+        Si los archivos se guardan en JSON comprimido con gzip (ver `data_suffix`).
+
+    Returns:
+    --------
+    str
+        La ruta del resumen (index.js).
+    """
+
+    suffix = data_suffix(compress)
+    scale = _scale(graph.number_of_nodes())
+
+    members = dict()
+    for node in graph:
+        members.setdefault(communities.get(node, -1), []).append(node)
+    ids = sorted(members)
+
+    # relaciones entre comunidades distintas, sin dirección
+    weights = Counter()
+    for u, v in graph.edges():
+        a, b = communities.get(u, -1), communities.get(v, -1)
+        if a != b:
+            weights[min(a, b), max(a, b)] += 1
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    for community in ids:
+        data = graph_data(
+            graph.subgraph(members[community]), pos, degrees, communities, scale
+        )
+        write_graph_data(data, os.path.join(directory, f"{community}{suffix}"))
+
+    def center(community: int, axis: int) -> float:
+        return sum(pos[node][axis] for node in members[community]) / len(
+            members[community]
+        )
+
+    index = {community: i for i, community in enumerate(ids)}
+    edges, counts = [], []
+    for (a, b), count in sorted(weights.items()):
+        edges += [index[a], index[b]]
+        counts.append(count)
+
+    overview = {
+        "nodes": [max(members[c], key=lambda node: degrees.get(node, 0)) for c in ids],
+        "community": ids,
+        "members": [len(members[c]) for c in ids],
+        "x": [round(center(c, 0) * scale) for c in ids],
+        "y": [round(-center(c, 1) * scale) for c in ids],
+        "files": [f"{community}{suffix}" for community in ids],
+        "edges": edges,
+        "weights": counts,
+    }
+    path = os.path.join(directory, "index" + suffix)
+    write_graph_data(overview, path)
+    return path
+
+
+def write_view(path: str, view: str, data_file: str, title: str) -> None:
+    """
+    Escribe la página de una vista, que carga los datos del grafo al abrirse.
+
+    Params:
+    -------
+    path : str
+        La ruta de la página.
+    view : str
+        La vista (ver `VIEWS`).
+    data_file : str
+        La ruta de los datos del grafo, relativa a la página.
+    title : str
+        El título de la página.
+
+    Returns:
+    --------
+    None
+
+    Raises:
+    -------
+    ValueError
+        Si la vista no es una de `VIEWS`.
+    """
+
+    if view not in VIEWS:
+        raise ValueError(f"Vista no soportada: {view}")
+
+    with open(os.path.join(WEB_DIR, "view.html"), "r", encoding="utf-8") as f:
+        template = Template(f.read())
+    page = template.substitute(
+        title=title, view=view, data=data_file, viewer=f"lib/{VIEWER}"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def export_paths(
+    output_dir: str, views: Dict[str, str], compress: bool = False
+) -> List[str]:
+    """
+    Obtiene las rutas de todos los archivos que escribe `export_interactive`.
+    """
+
+    pages = [os.path.join(output_dir, filename) for filename in views.values()]
+    paths = pages + [
+        graph_data_path(output_dir, compress),
+        os.path.join(output_dir, "lib", VIEWER),
+    ]
+    if "overview" in views:
+        paths.append(communities_dir(output_dir))
+    return paths
+
+
+def export_interactive(
+    graph: nx.Graph,
+    degrees: Dict[str, float],
+    communities: Dict[str, int],
+    pos: Dict[str, Tuple[float, float]],
+    views: Dict[str, str],
+    output_dir: str = os.path.join("outputs", "interactive"),
+    compress: bool = False,
+) -> None:
+    """
+    Exporta las vistas interactivas ligeras de un grafo.
+
+    El grafo se escribe una sola vez, con las posiciones ya calculadas (ver
+    `graph_data`), en un archivo que cada página carga después de abrirse. Las páginas solo
+    tienen el contenedor del grafo y comparten el visor (lib/graph_viewer.js) y
+    vis-network, así que el navegador los descarga una vez. La física está
+    desactivada por defecto: el grafo aparece ya colocado. La vista "overview"
+    carga el resumen de las comunidades y cada comunidad al pulsarla (ver
+    `write_communities`).
+
+    Params:
+    -------
+    graph : nx.Graph
+        El grafo (dirigido o no).
+    degrees : Dict[str, float]
+        La centralidad de grado de cada nodo.
+    communities : Dict[str, int]
+        La comunidad de cada nodo.
+    pos : Dict[str, Tuple[float, float]]
+        La posición de cada nodo (ver `layout.get_layout`).
+    views : Dict[str, str]
+        El nombre de la página de cada vista (ver `VIEWS`).
+    output_dir : str
+        El directorio donde se guardan las páginas.
+    compress : bool
+        Si los datos se guardan en JSON comprimido con gzip (el visor lo
+        descomprime), que las páginas solo cargan servidas por HTTP (ver
+        `data_suffix`).
+
+    Returns:
+    --------
+    None
+    """
+
+    data_path = graph_data_path(output_dir, compress)
+    write_graph_data(graph_data(graph, pos, degrees, communities), data_path)
+
+    os.makedirs(os.path.join(output_dir, "lib"), exist_ok=True)
+    shutil.copyfile(
+        os.path.join(WEB_DIR, VIEWER), os.path.join(output_dir, "lib", VIEWER)
+    )
+
+    data_files = {view: os.path.basename(data_path) for view in views}
+    if "overview" in views:
+        directory = communities_dir(output_dir)
+        overview = write_communities(
+            graph, communities, degrees, pos, directory, compress
+        )
+        # es una URL relativa a la página: siempre con "/"
+        data_files["overview"] = "/".join(
+            [os.path.basename(directory), os.path.basename(overview)]
+        )
+
+    for view, filename in views.items():
+        title = os.path.splitext(filename)[0]
+        write_view(
+            os.path.join(output_dir, filename),
+            view,
+            data_files[view],
+            title,
+        )
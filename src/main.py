@@ -1,86 +1,244 @@
+import argparse
 import os
 
-from graph import graph_maker, metrics
-from scraper.json_generator import load_thesis_json, save_thesis_json
+from artifact_cache import ArtifactCache, cache_key, file_digest, source_digest
 
 
-def main():
-
-    # hacemos el scrapping si no tenemos los datos
-    filename = os.path.join("data", "thesis.json")
-    if not os.path.exists(filename):
-        os.makedirs("data", exist_ok=True)
-        save_thesis_json(filename)
-
-    # cargamos los datos
-    data = load_thesis_json(filename)
-    relations = graph_maker.get_relations(data)
+def parse_args() -> argparse.Namespace:
+    """
+    Lee los argumentos de la línea de comandos.
 
-    # creamos directorios para guardar grafos
-    static_graphs_dir = os.path.join("outputs", "static")
-    interactive_graphs_dir = os.path.join("outputs", "interactive")
+    Returns:
+    --------
+    argparse.Namespace
+        Los argumentos del programa.
+    """
 
-    for dir in [static_graphs_dir, interactive_graphs_dir]:
-        os.makedirs(dir, exist_ok=True)
-
-    # obtenemos grafos simples
-    simple_graph, simple_digraph = graph_maker.get_simple_graphs(relations)
-
-    # obtenemos grafos con centralidad de grado
-    graph_deg, degrees, degrees_DiG = graph_maker.get_degree_graphs(relations)
-
-    degrees_sorted = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-    metrics.save_metric(
-        degrees_sorted,
-        is_digraph=False,
-        filename="degree_centrality.txt",
+    parser = argparse.ArgumentParser(
+        description="Análisis de la red de tesis del departamento de informática."
     )
-
-    degrees_DiG_sorted = sorted(degrees_DiG.items(), key=lambda x: x[1], reverse=True)
-    metrics.save_metric(
-        degrees_DiG_sorted,
-        is_digraph=True,
-        filename="degree_centrality_digraph.txt",
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="descarga solo los años nuevos o modificados y los une a los datos existentes",
     )
-
-    # obtenemos grafos con comunidades
-    graph_maker.get_communities_graphs(relations, graph_deg, degrees, degrees_DiG)
-
-    # BETWEENNESS
-    metrics.get_metric(
-        simple_graph,
-        "betweenness",
-        is_digraph=False,
-        filename="betweenness_centrality.txt",
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="con --update, comprueba también los años antiguos",
     )
-    metrics.get_metric(
-        simple_digraph,
-        "betweenness",
-        is_digraph=True,
-        filename="betweenness_centrality_digraph.txt",
+    parser.add_argument(
+        "--units",
+        nargs="+",
+        help="extrae estas unidades del portal y analiza el dataset conjunto",
     )
-
-    # CLOSENESS
-    metrics.get_metric(
-        simple_graph,
-        "closeness",
-        is_digraph=False,
-        filename="closeness_centrality.txt",
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="unidades que se extraen a la vez con --units",
     )
-    metrics.get_metric(
-        simple_digraph,
-        "closeness",
-        is_digraph=True,
-        filename="closeness_centrality_digraph.txt",
+    parser.add_argument(
+        "--resolve-names",
+        action="store_true",
+        help="unifica los nombres que parecen de la misma persona al extraer los datos",
     )
-
-    # PRESTIGIO
-    metrics.get_metric(
-        simple_digraph,
-        "in_degree",
-        is_digraph=True,
-        filename="in_degree_centrality.txt",
+    parser.add_argument(
+        "--backend",
+        choices=["selenium", "http"],
+        default="selenium",
+        help="forma de obtener el listado del portal",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="procesos para las tareas del análisis y la intermediación (0 para usar todos los núcleos)",
+    )
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="estima la intermediación muestreando nodos hasta que el top-10 es estable",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="confianza de las cotas de error con --approximate",
+    )
+    parser.add_argument(
+        "--distance-index",
+        action="store_true",
+        help="guarda las distancias entre todos los pares junto a los datos y las reutiliza",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="guarda las centralidades junto a los datos y, con relaciones nuevas, solo recalcula lo afectado",
+    )
+    parser.add_argument(
+        "--check-incremental",
+        action="store_true",
+        help="con --incremental, compara las centralidades con un recálculo completo",
     )
+    parser.add_argument(
+        "--resolutions",
+        type=float,
+        nargs="+",
+        default=[0.8, 1.0, 1.2],
+        help="resoluciones del barrido de Louvain de las comunidades de consenso",
+    )
+    parser.add_argument(
+        "--louvain-runs",
+        type=int,
+        default=10,
+        help="ejecuciones de Louvain (semillas) por resolución del barrido",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["spring", "multilevel"],
+        default="spring",
+        help="motor del layout de los gráficos estáticos (multilevel para grafos grandes)",
+    )
+    parser.add_argument(
+        "--render",
+        choices=["full", "fast"],
+        default="full",
+        help="dibujo de los SVG: todo vectorial o aristas rasterizadas y pocas etiquetas (grafos grandes)",
+    )
+    parser.add_argument(
+        "--labels",
+        type=int,
+        default=30,
+        help="número de etiquetas de los SVG con --render fast",
+    )
+    parser.add_argument(
+        "--tiles",
+        type=int,
+        default=0,
+        help="guarda además los SVG como teselas PNG con este número de niveles de zoom",
+    )
+    parser.add_argument(
+        "--render-jobs",
+        type=int,
+        default=2,
+        help="máximo de procesos que dibujan gráficos a la vez (acota la memoria)",
+    )
+    parser.add_argument(
+        "--interactive",
+        choices=["pyvis", "light"],
+        default="pyvis",
+        help="exportación interactiva: pyvis o páginas ligeras que cargan un JSON con posiciones",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="comprime con gzip el JSON del grafo de --interactive light (las páginas "
+        "se abren entonces desde un servidor HTTP, p. ej: python -m http.server)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="recalcula todas las salidas sin usar la caché de artefactos",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        help="tamaño máximo en MB de la caché de artefactos (.cache/artifacts)",
+    )
+    return parser.parse_args()
+
+
+def update_data(args: argparse.Namespace, filename: str) -> None:
+    """
+    Descarga los datos del portal según los argumentos (scraping inicial, --update o --units).
+
+    Params:
+    -------
+    args : argparse.Namespace
+        Los argumentos del programa.
+    filename : str
+        La ruta del archivo de tesis donde se guardan los datos.
+
+    Returns:
+    --------
+    None
+    """
+
+    # el scraper importa selenium y requests: solo lo cargamos si hay que usarlo
+    from scraper.crawler import crawl_units
+    from scraper.json_generator import save_thesis_json, update_thesis_json
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    if args.units:
+        crawl_units(
+            args.units,
+            filename,
+            max_workers=args.workers,
+            backend=args.backend,
+            resolve_names=args.resolve_names,
+        )
+    elif args.update:
+        update_thesis_json(
+            filename,
+            backend=args.backend,
+            full=args.full,
+            resolve_names=args.resolve_names,
+        )
+    else:
+        save_thesis_json(
+            filename, backend=args.backend, resolve_names=args.resolve_names
+        )
+
+
+def main():
+
+    args = parse_args()
+
+    # hacemos el scrapping si no tenemos los datos
+    filename = os.path.join("data", "thesis.json")
+    if args.units:
+        filename = os.path.join("data", "thesis_units.json")
+    if args.units or args.update or not os.path.exists(filename):
+        update_data(args, filename)
+
+    # si los datos, el código y las opciones no han cambiado y las salidas siguen
+    # intactas, no hay nada que hacer
+    cache, run_key, code_digest = None, None, ""
+    if not args.no_cache:
+        cache = ArtifactCache(max_bytes=args.cache_size * 2**20)
+        code_digest = source_digest(os.path.dirname(os.path.abspath(__file__)))
+        options = dict(
+            approximate=args.approximate,
+            confidence=args.confidence,
+            distance_index=args.distance_index,
+            incremental=args.incremental,
+            check_incremental=args.check_incremental,
+            resolutions=args.resolutions,
+            louvain_runs=args.louvain_runs,
+            layout=args.layout,
+            render=args.render,
+            labels=args.labels,
+            tiles=args.tiles,
+            interactive=args.interactive,
+            gzip=args.gzip,
+        )
+        run_key = cache_key(file_digest(filename), code_digest, filename, options)
+        if cache.run_is_fresh(run_key):
+            print("[INFO] Sin cambios desde la última ejecución: salidas al día")
+            return
+
+    # el análisis importa NetworkX, matplotlib y pyvis: solo si hay que ejecutarlo
+    from pipeline import run_analysis
+
+    outputs = run_analysis(args, filename, cache=cache, code_digest=code_digest)
+
+    if cache is not None:
+        cache.save_run(run_key, outputs)
+        removed = cache.evict()
+        if removed:
+            print(f"[INFO] {removed} entradas antiguas borradas de la caché")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,490 @@
+import argparse
+import os
+from concurrent.futures import Executor
+from functools import partial
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from artifact_cache import ArtifactCache, cache_key
+from graph import (
+    communities,
+    graph_maker,
+    incremental,
+    metrics,
+    plot_interactive_graphs,
+    plot_static_graphs,
+    web_export,
+)
+from graph.csr_graph import CSRGraph
+from graph.distance_index import (
+    DistanceIndex,
+    distance_index_path,
+    get_distance_index,
+)
+from graph.graph_store import GraphStore
+from graph.layout import get_layout, layout_path
+from scheduler import Task, print_timings, run_tasks
+from scraper.json_generator import load_thesis_json
+
+
+def write_metric_task(
+    result: Tuple[List[tuple], Optional[List[str]]], is_digraph: bool, filename: str
+) -> None:
+    """
+    Tarea de escritura: guarda en texto el resultado de `metrics.compute_metric`.
+    """
+
+    metric_list, header = result
+    metrics.write_metric(metric_list, is_digraph, filename, header=header)
+
+
+def plot_metric_task(
+    result: Tuple[List[tuple], Optional[List[str]]], is_digraph: bool, filename: str
+) -> None:
+    """
+    Tarea de gráfico: dibuja el barplot del resultado de `metrics.compute_metric`.
+    """
+
+    metrics.plot_metric(result[0], metrics.metric_output_dir(is_digraph), filename)
+
+
+def sorted_metric(values: Dict[str, float]) -> Tuple[List[tuple], None]:
+    """
+    Ordena de mayor a menor una métrica ya calculada, con la forma de `metrics.compute_metric`.
+    """
+
+    return sorted(values.items(), key=lambda x: x[1], reverse=True), None
+
+
+def print_diameters(distances: DistanceIndex, distances_DiG: DistanceIndex) -> None:
+    """
+    Muestra el diámetro de los dos grafos leído de sus índices de distancias.
+    """
+
+    print(f"[INFO] Diámetro del grafo: {distances.diameter()}")
+    print(f"[INFO] Diámetro del grafo dirigido: {distances_DiG.diameter()}")
+
+
+def print_incremental_check(
+    state: incremental.MetricsState,
+    state_digraph: incremental.MetricsState,
+    jobs: int,
+    executor: Optional[Executor] = None,
+) -> None:
+    """
+    Compara las métricas incrementales de los dos grafos con un recálculo completo.
+    """
+
+    for name, state in [("grafo", state), ("grafo dirigido", state_digraph)]:
+        for metric, error in incremental.check_state(state, jobs, executor).items():
+            if error > incremental.TOLERANCE:
+                print(f"[ERROR] {metric} incremental del {name}: diferencia {error}")
+            else:
+                print(
+                    f"[INFO] {metric} incremental del {name}: OK (diferencia {error})"
+                )
+
+
+def closeness_task(
+    graph: CSRGraph, distances: Optional[DistanceIndex] = None
+) -> Tuple[List[tuple], None]:
+    """
+    Tarea de la closeness: la lee del índice de distancias si se ha calculado.
+    """
+
+    return metrics.compute_metric(graph, "closeness", distances=distances)
+
+
+def build_tasks(
+    store: GraphStore, args: argparse.Namespace, filename: str
+) -> List[Task]:
+    """
+    Declara los pasos del análisis y sus dependencias.
+
+    Los grafos se construyen en el proceso principal y se comparten; los gráficos y
+    las métricas son independientes entre sí y, con --jobs, se calculan en paralelo.
+    Cada métrica tiene después una tarea que escribe el texto y otra que dibuja el
+    barplot. El orden de declaración es el del análisis en serie.
+
+    Params:
+    -------
+    store : GraphStore
+        Los grafos de la red de tesis.
+    args : argparse.Namespace
+        Los argumentos del programa.
+    filename : str
+        La ruta del archivo de tesis (junto a él se guardan los índices de distancias).
+
+    Returns:
+    --------
+    List[Task]
+        Las tareas en orden de declaración.
+    """
+
+    tasks = [
+        # grafos compartidos
+        Task("graph", lambda: store.graph, kind="main"),
+        Task("digraph", lambda: store.digraph, kind="main"),
+        Task("csr_graph", lambda: store.csr(directed=False), kind="main"),
+        Task("csr_digraph", lambda: store.csr(directed=True), kind="main"),
+        Task("degrees", lambda: store.degrees, kind="main"),
+    ]
+
+    # comunidades de consenso de un barrido de Louvain con semillas y resoluciones:
+    # se guardan junto a los datos y solo se recalculan si cambian las relaciones.
+    # Como la betweenness, el barrido reparte sus ejecuciones en el pool de procesos
+    sweep = dict(resolutions=args.resolutions, runs=args.louvain_runs)
+    tasks += [
+        Task(
+            "communities",
+            communities.get_communities,
+            deps=["graph"],
+            kind="pool",
+            params=sweep,
+            outputs=[communities.communities_path(filename)],
+            filename=filename,
+            digest=store.digest,
+            jobs=args.jobs or None,
+            **sweep,
+        ),
+        Task("partition", lambda result: result["partition"], ["communities"], "main"),
+    ]
+
+    # posiciones de los gráficos estáticos, una vez por distancia k: se guardan
+    # junto a los datos y, si llegan tesis nuevas, se parte de las anteriores
+    layouts = {"layout_simple": 0.1, "layout": 0.14}
+    for name, k in layouts.items():
+        tasks.append(
+            Task(
+                name,
+                get_layout,
+                deps=["graph"],
+                params=dict(k=k, engine=args.layout),
+                outputs=[layout_path(filename, k)],
+                filename=filename,
+                digest=store.digest,
+                k=k,
+                engine=args.layout,
+            )
+        )
+
+    # gráficos: (nombre, función, dependencias, layout, archivo); el dirigido usa
+    # los grados del no dirigido. El tamaño de figura está en el propio código de
+    # cada función, que forma parte de la clave de la caché. Los estáticos se
+    # dibujan en los procesos de dibujo, como los barplots
+    plots = [
+        (
+            "plot_simple",
+            plot_static_graphs.plot_graph,
+            ["graph"],
+            "layout_simple",
+            "thesis_simple.svg",
+        ),
+        (
+            "plot_simple_interactive",
+            plot_interactive_graphs.plot_DiGraph,
+            ["digraph"],
+            None,
+            "thesis_interactive.html",
+        ),
+        (
+            "plot_degree",
+            plot_static_graphs.plot_graph_with_degree_size,
+            ["graph", "degrees"],
+            "layout",
+            "thesis_degree.svg",
+        ),
+        (
+            "plot_degree_interactive",
+            plot_interactive_graphs.plot_graph_with_degree_size,
+            ["digraph", "degrees"],
+            None,
+            "thesis_degree_interactive.html",
+        ),
+        (
+            "plot_communities",
+            plot_static_graphs.plot_graph_with_communities,
+            ["graph", "partition", "degrees"],
+            "layout",
+            "thesis_communities.svg",
+        ),
+        (
+            "plot_communities_interactive",
+            plot_interactive_graphs.plot_graph_with_communities,
+            ["digraph", "partition", "degrees"],
+            None,
+            "thesis_communities_interactive.html",
+        ),
+    ]
+
+    # con --interactive light las tres vistas interactivas comparten un JSON con el
+    # grafo y sus posiciones en lugar de ser tres exportaciones de pyvis, y hay una
+    # cuarta con una sola figura por comunidad que carga la comunidad que se pulsa
+    interactive_dir = os.path.join("outputs", "interactive")
+    if args.interactive == "light":
+        views = dict(
+            plain="thesis_interactive.html",
+            degree="thesis_degree_interactive.html",
+            communities="thesis_communities_interactive.html",
+            overview="thesis_communities_overview.html",
+        )
+        plots = [plot for plot in plots if plot[4] not in views.values()]
+        export = dict(views=views, compress=args.gzip)
+        tasks.append(
+            Task(
+                "interactive",
+                web_export.export_interactive,
+                deps=["digraph", "degrees", "partition"],
+                kwdeps=dict(pos="layout"),
+                cache=True,
+                params=export,
+                outputs=web_export.export_paths(interactive_dir, **export),
+                **export,
+            )
+        )
+
+    # opciones de dibujo de los estáticos (--render, --labels, --tiles)
+    render = dict(render=args.render, labels=args.labels, tiles=args.tiles)
+    for name, func, deps, layout, output in plots:
+        output_dir = "interactive" if output.endswith(".html") else "static"
+        outputs = [os.path.join("outputs", output_dir, output)]
+        kind, options = "cpu", dict()
+        if layout:
+            outputs += plot_static_graphs.tile_paths(output, args.tiles)
+            kind, options = "render", render
+        tasks.append(
+            Task(
+                name,
+                func,
+                deps=deps,
+                kind=kind,
+                kwdeps=dict(pos=layout) if layout else None,
+                cache=True,
+                params=dict(filename=output, **options),
+                outputs=outputs,
+                filename=output,
+                **options,
+            )
+        )
+
+    # índices de distancias, calculados solo si cambian las relaciones
+    distance_deps = {False: [], True: []}
+    if args.distance_index:
+        for directed, name in [(False, "distances"), (True, "distances_digraph")]:
+            path = distance_index_path(filename, directed)
+            tasks.append(
+                Task(
+                    name,
+                    partial(get_distance_index, store, filename, directed),
+                    kind="main",
+                    outputs=[path, DistanceIndex.meta_path(path)],
+                )
+            )
+            distance_deps[directed] = [name]
+        tasks.append(
+            Task(
+                "diameters",
+                print_diameters,
+                distance_deps[False] + distance_deps[True],
+                "main",
+            )
+        )
+
+    # métricas: (nombre, función, dependencias, tipo, dirigido, argumentos)
+    jobs = args.jobs or None
+    approximate = dict(approximate=args.approximate, confidence=args.confidence)
+    metric_tasks = [
+        ("degree_centrality", sorted_metric, ["degrees"], "main", False, {}),
+        ("degree_centrality_digraph", sorted_metric, ["degrees"], "main", True, {}),
+        (
+            "community_stability",
+            communities.stability_metric,
+            ["communities", "degrees"],
+            "main",
+            False,
+            {},
+        ),
+        # la betweenness reparte sus bloques de orígenes en el pool de procesos
+        (
+            "betweenness_centrality",
+            partial(metrics.compute_metric, metric="betweenness"),
+            ["csr_graph"],
+            "pool",
+            False,
+            dict(jobs=jobs, **approximate),
+        ),
+        (
+            "betweenness_centrality_digraph",
+            partial(metrics.compute_metric, metric="betweenness"),
+            ["csr_digraph"],
+            "pool",
+            True,
+            dict(jobs=jobs, **approximate),
+        ),
+        (
+            "closeness_centrality",
+            closeness_task,
+            ["csr_graph"] + distance_deps[False],
+            "cpu",
+            False,
+            {},
+        ),
+        (
+            "closeness_centrality_digraph",
+            closeness_task,
+            ["csr_digraph"] + distance_deps[True],
+            "cpu",
+            True,
+            {},
+        ),
+        (
+            "in_degree_centrality",
+            partial(metrics.compute_metric, metric="in_degree"),
+            ["csr_digraph"],
+            "cpu",
+            True,
+            {},
+        ),
+    ]
+
+    # con --incremental las centralidades se leen del estado guardado junto a los
+    # datos, que al llegar relaciones nuevas solo recalcula los orígenes afectados
+    if args.incremental:
+        states = {False: "metrics_state", True: "metrics_state_digraph"}
+        for directed, name in states.items():
+            path = incremental.metrics_state_path(filename, directed)
+            tasks.append(
+                Task(
+                    name,
+                    incremental.get_metrics_state,
+                    kind="pool",
+                    outputs=[path, incremental.MetricsState.meta_path(path)],
+                    relations=store.relations,
+                    filename=filename,
+                    digest=store.digest,
+                    directed=directed,
+                    jobs=jobs,
+                )
+            )
+        if args.check_incremental:
+            tasks.append(
+                Task(
+                    "incremental_check",
+                    print_incremental_check,
+                    list(states.values()),
+                    "pool",
+                    jobs=jobs,
+                )
+            )
+
+        # métrica y grafo (dirigido o no) del estado de cada una; la centralidad de
+        # grado del dirigido es, como sin el estado, la del no dirigido
+        state_metrics = {
+            "degree_centrality": ("degree", False),
+            "degree_centrality_digraph": ("degree", False),
+            "betweenness_centrality": ("betweenness", False),
+            "betweenness_centrality_digraph": ("betweenness", True),
+            "closeness_centrality": ("closeness", False),
+            "closeness_centrality_digraph": ("closeness", True),
+            "in_degree_centrality": ("in_degree", True),
+        }
+        csr_tasks = {False: "csr_graph", True: "csr_digraph"}
+        for i, (name, _, _, _, is_digraph, _) in enumerate(metric_tasks):
+            if name in state_metrics:
+                metric, directed = state_metrics[name]
+                func = partial(incremental.state_metric, metric=metric)
+                deps = [states[directed], csr_tasks[directed]]
+                metric_tasks[i] = (name, func, deps, "main", is_digraph, {})
+
+    for name, func, deps, kind, is_digraph, kwargs in metric_tasks:
+        # las que solo ordenan los grados no merece la pena guardarlas
+        params = {key: kwargs[key] for key in approximate if key in kwargs}
+        tasks.append(
+            Task(
+                name,
+                func,
+                deps=deps,
+                kind=kind,
+                cache=kind != "main",
+                params=params,
+                **kwargs,
+            )
+        )
+
+        output = dict(is_digraph=is_digraph, filename=f"{name}.txt")
+        output_dir = os.path.join("outputs", "interactive" if is_digraph else "static")
+        output_dir = os.path.join(output_dir, "metrics")
+        for step, step_func, kind, path in [
+            ("txt", write_metric_task, "io", f"{name}.txt"),
+            ("barplot", plot_metric_task, "render", f"{name}_barplot.svg"),
+        ]:
+            tasks.append(
+                Task(
+                    f"{name}:{step}",
+                    step_func,
+                    [name],
+                    kind,
+                    cache=True,
+                    params=output,
+                    outputs=[os.path.join(output_dir, path)],
+                    **output,
+                )
+            )
+
+    return tasks
+
+
+def run_analysis(
+    args: argparse.Namespace,
+    filename: str,
+    cache: Optional[ArtifactCache] = None,
+    code_digest: str = "",
+) -> List[str]:
+    """
+    Carga los datos, construye los grafos y ejecuta todas las tareas del análisis.
+
+    Params:
+    -------
+    args : argparse.Namespace
+        Los argumentos del programa.
+    filename : str
+        La ruta del archivo de tesis.
+    cache : Optional[ArtifactCache]
+        La caché de artefactos, o None para recalcularlo todo.
+    code_digest : str
+        El hash del código (ver `source_digest`), que forma parte de las claves.
+
+    Returns:
+    --------
+    List[str]
+        Las rutas de todos los archivos generados.
+    """
+
+    # cargamos los datos
+    data = load_thesis_json(filename)
+    relations = graph_maker.get_relations(data)
+
+    # construimos los grafos una sola vez y los compartimos entre todas las etapas
+    store = GraphStore(relations)
+
+    # creamos directorios para guardar grafos
+    static_graphs_dir = os.path.join("outputs", "static")
+    interactive_graphs_dir = os.path.join("outputs", "interactive")
+
+    for dir in [static_graphs_dir, interactive_graphs_dir]:
+        os.makedirs(dir, exist_ok=True)
+
+    # ejecutamos el grafo de tareas: grafos -> métricas -> salidas
+    tasks = build_tasks(store, args, filename)
+    jobs = args.jobs or os.cpu_count() or 1
+    start = perf_counter()
+    _, timings = run_tasks(
+        tasks,
+        jobs=jobs,
+        cache=cache,
+        base_key=cache_key(store.digest, code_digest),
+        render_jobs=min(args.render_jobs, jobs),
+    )
+    print_timings(timings, perf_counter() - start)
+
+    return [output for task in tasks for output in task.outputs]
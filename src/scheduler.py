@@ -0,0 +1,405 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
+from multiprocessing import resource_tracker
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from artifact_cache import ArtifactCache, cache_key
+from graph.render import render_executor
+
+# formas de ejecutar una tarea
+KINDS = ("main", "cpu", "io", "render", "pool")
+
+
+class Task:
+    """
+    Un paso del análisis y las tareas de las que depende.
+
+    La función recibe, por posición, los resultados de sus dependencias en el orden
+    de `deps`, después los de las dependencias con nombre de `kwdeps` (parámetro ->
+    tarea) y después `kwargs`. El tipo indica dónde se ejecuta:
+        - "main": en el propio proceso principal (construcción de grafos compartidos).
+        - "cpu": en un proceso del pool (métricas y cálculos pesados).
+        - "io": en un hilo (escritura de archivos).
+        - "render": en un proceso de dibujo (gráficos de matplotlib, que no puede
+          usarse desde varios hilos; ver `render.render_executor`), también sin
+          --jobs, para que el proceso principal no acumule figuras.
+        - "pool": en el proceso principal, como "main", pero después de lanzar las
+          demás tareas listas y con el pool de procesos de las "cpu" como argumento
+          `executor` (None con un solo proceso). La tarea reparte su trabajo en él
+          en lugar de crear su propio pool, así que nunca hay más de `jobs`
+          procesos calculando a la vez.
+    Las funciones de las tareas "cpu" y "render" y sus argumentos se envían a otro
+    proceso, así que deben poder serializarse con pickle.
+
+    Las tareas con `cache` guardan su resultado y los archivos de `outputs` en la
+    caché de artefactos. Su clave se calcula con `params`, que debe incluir todo lo
+    que cambia el resultado además de las dependencias (no `jobs`, por ejemplo).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        deps: Iterable[str] = (),
+        kind: str = "cpu",
+        kwdeps: Optional[Dict[str, str]] = None,
+        cache: bool = False,
+        params: Optional[dict] = None,
+        outputs: Iterable[str] = (),
+        **kwargs,
+    ):
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de tarea no soportado: {kind}")
+        self.name = name
+        self.func = func
+        self.kwdeps = dict(kwdeps or {})
+        # todas las dependencias: primero las de posición y después las con nombre
+        self.deps = tuple(deps) + tuple(self.kwdeps.values())
+        self.positional = len(self.deps) - len(self.kwdeps)
+        self.kind = kind
+        self.cache = cache
+        self.params = params or {}
+        self.outputs = list(outputs)
+        self.kwargs = kwargs
+
+    def arguments(self, results: Dict[str, Any]) -> Tuple[list, dict]:
+        """
+        Obtiene los argumentos de la función a partir de los resultados de las dependencias.
+        """
+
+        args = [results[dep] for dep in self.deps[: self.positional]]
+        kwargs = {param: results[dep] for param, dep in self.kwdeps.items()}
+        return args, {**kwargs, **self.kwargs}
+
+
+def _timed(func: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    """
+    Ejecuta una función y devuelve su resultado y los segundos que ha tardado.
+    """
+
+    start = perf_counter()
+    result = func(*args, **kwargs)
+    return result, perf_counter() - start
+
+
+def _report_error(task: Task, error: Exception) -> None:
+    """
+    Muestra qué tarea ha fallado antes de cancelar las demás.
+    """
+
+    print(f"[ERROR] Tarea {task.name}: {type(error).__name__}: {error}")
+
+
+def check_tasks(tasks: List[Task]) -> None:
+    """
+    Comprueba que los nombres son únicos y que cada tarea se declara después de sus
+    dependencias (lo que además impide los ciclos).
+
+    Params:
+    -------
+    tasks : List[Task]
+        Las tareas en el orden en que se declaran.
+
+    Returns:
+    --------
+    None
+
+    Raises:
+    -------
+    ValueError
+        Si hay nombres repetidos o una dependencia desconocida o declarada después.
+    """
+
+    declared = set()
+    for task in tasks:
+        if task.name in declared:
+            raise ValueError(f"Tarea repetida: {task.name}")
+        for dep in task.deps:
+            if dep not in declared:
+                raise ValueError(
+                    f"Dependencia no declarada antes de {task.name}: {dep}"
+                )
+        declared.add(task.name)
+
+
+def task_keys(tasks: List[Task], base_key: str) -> Dict[str, str]:
+    """
+    Calcula la clave de caché de cada tarea.
+
+    La clave depende de `base_key` (las relaciones y el código), del nombre, los
+    parámetros y las salidas de la tarea, y de las claves de sus dependencias, así
+    que cambia si cambia cualquier cosa de la que se derive su resultado.
+
+    Params:
+    -------
+    tasks : List[Task]
+        Las tareas, cada una declarada después de sus dependencias.
+    base_key : str
+        La clave común a todas las tareas de la ejecución.
+
+    Returns:
+    --------
+    Dict[str, str]
+        Un diccionario que mapea el nombre de cada tarea a su clave.
+    """
+
+    keys = dict()
+    for task in tasks:
+        keys[task.name] = cache_key(
+            base_key,
+            task.name,
+            task.params,
+            task.outputs,
+            [keys[dep] for dep in task.deps],
+        )
+    return keys
+
+
+def required_tasks(tasks: List[Task], hits: Set[str]) -> Set[str]:
+    """
+    Obtiene las tareas que hay que ejecutar cuando algunas están en la caché.
+
+    Una tarea hace falta si no está en la caché y, o bien nadie depende de ella (es
+    una salida del análisis), o bien la necesita otra tarea que hay que ejecutar.
+    Así, si todos los gráficos de un grafo están en la caché, el grafo no se construye.
+
+    Params:
+    -------
+    tasks : List[Task]
+        Las tareas, cada una declarada después de sus dependencias.
+    hits : Set[str]
+        Los nombres de las tareas que están en la caché.
+
+    Returns:
+    --------
+    Set[str]
+        Los nombres de las tareas que hay que ejecutar.
+    """
+
+    dependents = {task.name: [] for task in tasks}
+    for task in tasks:
+        for dep in task.deps:
+            dependents[dep].append(task.name)
+
+    required = set()
+    for task in reversed(tasks):
+        if task.name in hits:
+            continue
+        if not dependents[task.name] or any(
+            name in required for name in dependents[task.name]
+        ):
+            required.add(task.name)
+    return required
+
+
+def run_tasks(
+    tasks: List[Task],
+    jobs: int = 1,
+    cache: Optional[ArtifactCache] = None,
+    base_key: str = "",
+    render_jobs: int = 1,
+) -> Tuple[Dict[str, Any], Dict[str, Tuple[str, float]]]:
+    """
+    Ejecuta un grafo de tareas lanzando a la vez las que no dependen unas de otras.
+
+    Con `jobs` = 1 las tareas se ejecutan una detrás de otra en el orden declarado,
+    en el proceso principal salvo las "render", que esperan a su proceso de dibujo.
+    Con más, las tareas "cpu" van a un pool de `jobs` procesos, las "io" a un pool
+    de `jobs` hilos y las "render" a un pool de `render_jobs` procesos de dibujo, y
+    cada tarea se lanza en cuanto terminan sus dependencias (por orden de
+    declaración entre las que están listas). Las "pool" se ejecutan de una en una
+    en el proceso principal cuando ya se han lanzado todas las demás listas, y
+    reparten su trabajo en el pool de las "cpu".
+    Cada tarea escribe sus propios archivos, así que el resultado no depende del
+    orden en que terminen.
+
+    Con `cache`, las tareas cacheables que ya están en ella restauran sus archivos en
+    lugar de ejecutarse, y solo se ejecutan las tareas que hacen falta para el resto
+    (ver `required_tasks`). Su tiempo aparece con el tipo "cache".
+
+    Params:
+    -------
+    tasks : List[Task]
+        Las tareas, cada una declarada después de sus dependencias.
+    jobs : int
+        Número de procesos (y de hilos) que se usan a la vez.
+    cache : Optional[ArtifactCache]
+        La caché de artefactos, o None para ejecutarlo todo.
+    base_key : str
+        La clave común a todas las tareas (ver `task_keys`).
+    render_jobs : int
+        Número máximo de procesos de dibujo a la vez, que acota la memoria de los
+        gráficos.
+
+    Returns:
+    --------
+    Tuple[Dict[str, Any], Dict[str, Tuple[str, float]]]
+        El resultado de cada tarea y su tipo y segundos de ejecución.
+
+    Raises:
+    -------
+    Exception
+        El error de la primera tarea que falle; las pendientes se cancelan.
+    """
+
+    check_tasks(tasks)
+    results, timings = dict(), dict()
+
+    keys, hits = dict(), set()
+    if cache is not None:
+        keys = task_keys(tasks, base_key)
+        hits = {
+            task.name for task in tasks if task.cache and cache.has(keys[task.name])
+        }
+    required = required_tasks(tasks, hits)
+
+    # restauramos las tareas de la caché y cargamos solo los resultados que se usan
+    needed = {dep for task in tasks if task.name in required for dep in task.deps}
+    for task in tasks:
+        if task.name in hits:
+            start = perf_counter()
+            cache.restore(keys[task.name])
+            if task.name in needed:
+                results[task.name] = cache.load(keys[task.name])
+            timings[task.name] = ("cache", perf_counter() - start)
+    tasks = [task for task in tasks if task.name in required]
+
+    def finish(task: Task, result: Any, seconds: float) -> None:
+        results[task.name] = result
+        timings[task.name] = (task.kind, seconds)
+        if cache is not None and task.cache:
+            cache.store(keys[task.name], result, task.outputs)
+
+    # el pool de dibujo solo se crea si hay algo que dibujar
+    renders = None
+    if any(task.kind == "render" for task in tasks):
+        renders = render_executor(max(1, render_jobs))
+
+    if jobs <= 1:
+        with renders or nullcontext():
+            for task in tasks:
+                args, kwargs = task.arguments(results)
+                try:
+                    if task.kind == "render":
+                        future = renders.submit(_timed, task.func, *args, **kwargs)
+                        outcome = future.result()
+                    else:
+                        if task.kind == "pool":
+                            kwargs["executor"] = None
+                        outcome = _timed(task.func, *args, **kwargs)
+                except Exception as e:
+                    _report_error(task, e)
+                    raise
+                finish(task, *outcome)
+        return results, timings
+
+    pending = list(tasks)
+    running = dict()
+
+    # los procesos del pool heredan el registro de la memoria compartida del proceso
+    # principal, que la libera (ver `betweenness.BrandesPool`); si no, cada uno
+    # arranca el suyo y al terminar intenta liberar los bloques otra vez
+    resource_tracker.ensure_running()
+
+    with ProcessPoolExecutor(max_workers=jobs) as processes, ThreadPoolExecutor(
+        max_workers=jobs
+    ) as threads, renders or nullcontext():
+        executors = {"cpu": processes, "io": threads, "render": renders}
+        try:
+            while pending or running:
+                # lanzamos todas las tareas cuyas dependencias ya han terminado
+                launched = True
+                while launched:
+                    launched = False
+                    for task in list(pending):
+                        if task.kind == "pool" or not all(
+                            dep in results for dep in task.deps
+                        ):
+                            continue
+                        pending.remove(task)
+                        args, kwargs = task.arguments(results)
+                        if task.kind == "main":
+                            try:
+                                outcome = _timed(task.func, *args, **kwargs)
+                            except Exception as e:
+                                _report_error(task, e)
+                                raise
+                            finish(task, *outcome)
+                            # puede haber dejado listas tareas anteriores de la lista
+                            launched = True
+                        else:
+                            future = executors[task.kind].submit(
+                                _timed, task.func, *args, **kwargs
+                            )
+                            running[future] = task
+
+                # con todo lo demás lanzado, una tarea "pool" usa el pool de
+                # procesos; al terminar se vuelven a lanzar las que hayan quedado listas
+                ready = [
+                    task
+                    for task in pending
+                    if task.kind == "pool" and all(dep in results for dep in task.deps)
+                ]
+                if ready:
+                    task = ready[0]
+                    pending.remove(task)
+                    args, kwargs = task.arguments(results)
+                    try:
+                        outcome = _timed(task.func, *args, executor=processes, **kwargs)
+                    except Exception as e:
+                        _report_error(task, e)
+                        raise
+                    finish(task, *outcome)
+                    continue
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        _report_error(task, e)
+                        raise
+                    finish(task, *outcome)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    return results, timings
+
+
+def print_timings(timings: Dict[str, Tuple[str, float]], elapsed: float) -> None:
+    """
+    Muestra los segundos de cada tarea, de la más lenta a la más rápida.
+
+    Params:
+    -------
+    timings : Dict[str, Tuple[str, float]]
+        El tipo y los segundos de cada tarea (ver `run_tasks`).
+    elapsed : float
+        Los segundos totales de la ejecución.
+
+    Returns:
+    --------
+    None
+    """
+
+    busy = sum(seconds for _, seconds in timings.values())
+    print(
+        f"[INFO] {len(timings)} tareas en {elapsed:.1f}s "
+        f"({busy:.1f}s sumando el tiempo de cada una)"
+    )
+    for name, (kind, seconds) in sorted(
+        timings.items(), key=lambda x: x[1][1], reverse=True
+    ):
+        print(f"    {name}: {seconds:.2f}s ({kind})")
@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+from time import sleep
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import requests
+from selenium.common.exceptions import WebDriverException
+
+# errores que merece la pena reintentar (caídas del navegador, timeouts del portal...)
+TRANSIENT_ERRORS = (WebDriverException, requests.RequestException)
+
+# varias unidades pueden extraerse a la vez y escribir en el mismo checkpoint
+_write_lock = threading.Lock()
+
+
+def checkpoint_path(filename: str) -> str:
+    """
+    Obtiene la ruta del checkpoint asociado a un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+
+    Returns:
+    --------
+    str
+        La ruta del checkpoint (p. ej: data/thesis.checkpoint.jsonl).
+    """
+
+    root, _ = os.path.splitext(filename)
+    return root + ".checkpoint.jsonl"
+
+
+def append_checkpoint(path: str, record: Dict[str, Any]) -> None:
+    """
+    Añade un registro al final del checkpoint y lo fuerza a disco.
+
+    Params:
+    -------
+    path : str
+        La ruta del checkpoint (un registro JSON por línea).
+    record : Dict[str, Any]
+        El registro a guardar. Siempre lleva la clave "unit" y además "year",
+        "page" (con sus "rows") o "done".
+
+    Returns:
+    --------
+    None
+    """
+
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Carga el progreso guardado en un checkpoint.
+
+    Params:
+    -------
+    path : str
+        La ruta del checkpoint.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Any]]
+        Un diccionario que mapea cada unidad a su progreso: los años ("years") y
+        páginas ("pages") ya extraídos y si la unidad se completó ("done").
+    """
+
+    progress = dict()
+    if not os.path.exists(path):
+        return progress
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # la última línea puede haber quedado a medias si el proceso murió escribiendo
+                continue
+
+            unit = progress.setdefault(
+                str(record["unit"]), {"years": {}, "pages": {}, "done": False}
+            )
+            if "year" in record:
+                unit["years"][record["year"]] = record["rows"]
+            elif "page" in record:
+                unit["pages"][record["page"]] = record["rows"]
+            elif record.get("done"):
+                unit["done"] = True
+
+    return progress
+
+
+def with_retries(
+    func: Callable,
+    *args,
+    retries: int = 3,
+    backoff: float = 2,
+    exceptions: Tuple[Type[Exception], ...] = TRANSIENT_ERRORS,
+    progress: Optional[Callable[[], int]] = None,
+    **kwargs,
+):
+    """
+    Ejecuta una función reintentándola con espera exponencial si falla por un error transitorio.
+
+    Params:
+    -------
+    func : Callable
+        La función a ejecutar.
+    *args
+        Argumentos posicionales de la función.
+    retries : int
+        Número máximo de reintentos tras el primer fallo.
+    backoff : float
+        Espera antes del primer reintento, en segundos. Se duplica en cada reintento.
+    exceptions : Tuple[Type[Exception], ...]
+        Excepciones que se consideran transitorias.
+    progress : Optional[Callable[[], int]]
+        Función que mide el avance de una función que se reanuda desde donde falló
+        (p. ej: los años ya extraídos). Si ha avanzado desde el fallo anterior, la
+        cuenta de reintentos y la espera vuelven a empezar, de modo que los
+        reintentos son por cada paso y no por la tarea completa.
+    **kwargs
+        Argumentos con nombre de la función.
+
+    Returns:
+    --------
+    Any
+        El valor devuelto por la función.
+
+    Raises:
+    -------
+    Exception
+        La última excepción si se agotan los reintentos.
+    """
+
+    attempt = 0
+    done = progress() if progress is not None else 0
+
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except exceptions as e:
+            if progress is not None and progress() > done:
+                done, attempt = progress(), 0
+            if attempt == retries:
+                raise
+            wait = backoff * 2**attempt
+            print(f"[WARN] {type(e).__name__}: reintentando en {wait:.1f}s")
+            sleep(wait)
+            attempt += 1
@@ -1,4 +1,5 @@
-from typing import Dict
+from collections import Counter
+from typing import Dict, List, Optional
 
 from unidecode import unidecode
 
@@ -49,6 +50,72 @@ def unify_duplicated_names(name1: str, name2: str) -> str:
         return name2
 
 
+class NameIndex:
+    """
+    Índice de nombres para buscar con qué nombre se unifica otro sin compararlo con todos.
+
+    Cada nombre se normaliza una sola vez (sin acentos, en minúsculas y dividido en
+    palabras) y se guarda un índice invertido de palabra a nombres que la contienen.
+    Dos nombres solo pueden unificarse si comparten alguna palabra, así que basta con
+    comparar contra esos candidatos. El resultado es el mismo que llamar a
+    `unify_duplicated_names` con cada nombre del índice, en orden, y quedarse con el
+    último que coincida.
+    """
+
+    def __init__(self, names: List[str]):
+        self.counts = []
+        self.lengths = []
+        self.unified = []
+        self.postings = dict()
+
+        for position, name in enumerate(names):
+            words = unidecode(name.lower()).split(" ")
+            self.counts.append(Counter(words))
+            self.lengths.append(len(words))
+            self.unified.append(" ".join(words).title())
+            for word in set(words):
+                self.postings.setdefault(word, []).append(position)
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        Busca el nombre unificado de un nombre dado.
+
+        Params:
+        -------
+        name : str
+            El nombre a unificar.
+
+        Returns:
+        --------
+        Optional[str]
+            El nombre unificado del último nombre del índice que coincide, o None si no coincide ninguno.
+        """
+
+        words = unidecode(name.lower()).split(" ")
+        counts = Counter(words)
+        length = len(words)
+
+        # solo los nombres que comparten alguna palabra pueden coincidir
+        candidates = set()
+        for word in counts:
+            candidates.update(self.postings.get(word, ()))
+
+        for position in sorted(candidates, reverse=True):
+            other = self.counts[position]
+
+            # misma cuenta que unify_duplicated_names: cada palabra suma las veces que
+            # aparece en el otro nombre si aparece el mismo número de veces en ambos
+            counter = 0
+            for word, count in counts.items():
+                if count == other.get(word, 0):
+                    counter += count * count
+
+            if counter == min(length, self.lengths[position]):
+                return self.unified[position]
+
+        return None
+
+
 def clean_data(
     data: Dict[str, Dict[str, Dict[str, str]]]
 ) -> Dict[str, Dict[str, Dict[str, str]]]:
@@ -74,8 +141,9 @@ def clean_data(
             names = data[year][id]["directors"]
             directors_names_set.update(names)
 
-    # convertimos a lista para poder iterarlo
+    # convertimos a lista para poder iterarlo e indexamos los nombres
     directors_names_list = list(directors_names_set)
+    directors_index = NameIndex(directors_names_list)
 
     # iteramos sobre todos los nombres del json (autores y directores)
     for year in data.keys():
@@ -96,9 +164,8 @@ def clean_data(
 
             # para los directores, comprobar si su nombre aparece mas de una vez
             # y quedarnos con un formato de nombre unificado
-            for director in directors_names_list:
-                result_name = unify_duplicated_names(author, director)
-                if result_name:
-                    data[year][id]["author"] = result_name
+            result_name = directors_index.find(author)
+            if result_name:
+                data[year][id]["author"] = result_name
 
     return data
@@ -1,7 +1,17 @@
 from time import sleep
+from typing import Callable, List, Optional
 
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+ITEM_SELECTOR = "li.c-doc"
+YEAR_SELECTOR = "h3.unidad-docs__grupo-titulo"
 
 
 def click_button(driver):
@@ -30,3 +40,115 @@ def click_button(driver):
                 "[INFO] Se ha completado el proceso de clic en el botón 'See more'. Es posible que el botón ya no exista."
             )
             break
+
+
+def count_items(driver) -> int:
+    """
+    Cuenta las tesis cargadas actualmente en el listado.
+
+    Params:
+    -------
+    driver : WebDriver
+        El controlador WebDriver para interactuar con la página web.
+
+    Returns:
+    --------
+    int
+        El número de elementos `li.c-doc` de la página.
+    """
+
+    return driver.execute_script(
+        f"return document.querySelectorAll('{ITEM_SELECTOR}').length;"
+    )
+
+
+def oldest_loaded_year(driver) -> Optional[int]:
+    """
+    Obtiene el año más antiguo cargado en el listado (los años aparecen de más reciente a más antiguo).
+
+    Params:
+    -------
+    driver : WebDriver
+        El controlador WebDriver para interactuar con la página web.
+
+    Returns:
+    --------
+    Optional[int]
+        El último año del listado, o None si todavía no hay ninguno.
+    """
+
+    year = driver.execute_script(
+        f"const years = document.querySelectorAll('{YEAR_SELECTOR}');"
+        "return years.length ? years[years.length - 1].innerText.trim() : null;"
+    )
+    return int(year) if year and year.isdigit() else None
+
+
+def expand_results(
+    driver,
+    timeout: float = 10,
+    stop_year: Optional[str] = None,
+    on_load: Optional[Callable] = None,
+) -> List[int]:
+    """
+    Haz clic en el botón 'See more' esperando a que cada clic cargue nuevas tesis.
+
+    En vez de dormir un tiempo fijo tras cada clic, espera a que aparezcan nuevos
+    `li.c-doc` o a que el botón quede obsoleto (la página lo ha sustituido).
+
+    Params:
+    -------
+    driver : WebDriver
+        El controlador WebDriver para interactuar con la página web.
+    timeout : float
+        Tiempo máximo de espera tras cada clic, en segundos.
+    stop_year : Optional[str]
+        Si se indica, deja de expandir en cuanto aparece un año anterior a este,
+        lo que garantiza que `stop_year` y los años posteriores están completos.
+        Útil para no recargar años que ya están en el dataset local.
+    on_load : Optional[Callable]
+        Función que se llama con el driver tras cada clic que carga nuevas tesis,
+        p. ej: para ir guardando los años que ya están completos.
+
+    Returns:
+    --------
+    List[int]
+        El número de tesis que ha añadido cada clic.
+    """
+
+    added = []
+    count = count_items(driver)
+
+    while True:
+        if stop_year is not None:
+            oldest = oldest_loaded_year(driver)
+            if oldest is not None and oldest < int(stop_year):
+                print(f"[INFO] Alcanzado el año {oldest}, anterior a {stop_year}.")
+                break
+
+        try:
+            verMas = driver.find_element(By.ID, "verMasButton")
+            verMas.click()
+        except (NoSuchElementException, StaleElementReferenceException):
+            print("[INFO] No quedan más tesis por cargar con el botón 'See more'.")
+            break
+
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: count_items(d) > count or EC.staleness_of(verMas)(d)
+            )
+        except TimeoutException:
+            print(f"[WARN] El clic no ha cargado nuevas tesis en {timeout}s.")
+            break
+
+        new_count = count_items(driver)
+        added.append(new_count - count)
+        print(
+            f"[INFO] Clic {len(added)}: {new_count - count} tesis nuevas ({new_count} en total)"
+        )
+        count = new_count
+
+        if on_load is not None:
+            on_load(driver)
+
+    return added
@@ -2,6 +2,19 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
+# ruta al ejecutable de chromedriver
+CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
+
+# listado de tesis de una unidad del portal de investigacion
+PORTAL_URL = "https://portalinvestigacion.uniovi.es/unidades/{unit}/tesis"
+DEFAULT_UNIT = "6069"
+
+# peticion que lanza el botón 'See more' para cargar la siguiente página del listado
+PAGE_URL = PORTAL_URL + "?page={page}"
+
+# user-agent para evitar que detecte el programa como bot
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+
 
 def set_driver_options() -> Options:
     """
@@ -15,9 +28,7 @@ def set_driver_options() -> Options:
 
     options = Options()
     # agregamos user-agent para evitar que detecte el programa como bot
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-    )
+    options.add_argument(f"user-agent={USER_AGENT}")
     options.add_argument("--headless")  # si queremos que el proceso ocurra en 2o plano
     return options
 
@@ -0,0 +1,194 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import perf_counter
+from typing import Dict, Iterable, Optional
+
+from .checkpoint import checkpoint_path
+from .driver_pool import DriverPool
+from .json_generator import (
+    fetch_thesis_data,
+    load_thesis_json,
+    write_clean_thesis_json,
+)
+from .manifest import raw_data_path, year_hashes
+
+
+def scrape_unit(
+    unit: str,
+    output_dir: str,
+    backend: str,
+    checkpoint: str,
+    pool: Optional[DriverPool],
+) -> Dict[str, float]:
+    """
+    Extrae, limpia y guarda el dataset de una unidad, junto a su copia sin limpiar.
+
+    Params:
+    -------
+    unit : str
+        El identificador de la unidad en el portal de investigación.
+    output_dir : str
+        Directorio donde se guarda el dataset de la unidad (`{unit}.json`).
+    backend : str
+        Forma de obtener el listado: "selenium" (navegador) o "http" (peticiones HTTP concurrentes).
+    checkpoint : str
+        Ruta del checkpoint compartido por todas las unidades del crawl.
+    pool : Optional[DriverPool]
+        Pool de navegadores reutilizables para el backend selenium.
+
+    Returns:
+    --------
+    Dict[str, float]
+        Estadísticas de la unidad: segundos de extracción y limpieza, años y tesis.
+    """
+
+    start = perf_counter()
+    data = fetch_thesis_data(unit, backend, checkpoint=checkpoint, pool=pool)
+    fetch_time = perf_counter() - start
+
+    years = len(data)
+    theses = sum(len(year_theses) for year_theses in data.values())
+
+    filename = os.path.join(output_dir, f"{unit}.json")
+    write_clean_thesis_json(filename, data, year_hashes(data))
+
+    return {
+        "fetch_seconds": fetch_time,
+        "total_seconds": perf_counter() - start,
+        "years": years,
+        "theses": theses,
+    }
+
+
+def merge_units(
+    datasets: Dict[str, Dict[str, Dict[str, Dict[str, str]]]],
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Une los datasets de varias unidades en uno solo, etiquetando cada tesis con su unidad.
+
+    Params:
+    -------
+    datasets : Dict[str, Dict[str, Dict[str, Dict[str, str]]]]
+        Un diccionario que mapea cada unidad a su dataset de tesis.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict[str, str]]]
+        Un dataset con la misma estructura que el de una unidad. Los ids se prefijan
+        con la unidad (`{unit}-{id}`) y cada tesis incluye la clave "unit".
+    """
+
+    merged = dict()
+
+    for unit, data in datasets.items():
+        for year, theses in data.items():
+            year_thesis_dict = merged.setdefault(year, dict())
+            for id_thesis, thesis in theses.items():
+                year_thesis_dict[f"{unit}-{id_thesis}"] = {**thesis, "unit": unit}
+
+    # del año más reciente al más antiguo, como en el portal
+    return {year: merged[year] for year in sorted(merged, key=int, reverse=True)}
+
+
+def crawl_units(
+    units: Iterable[str],
+    merged_filename: str,
+    output_dir: str = os.path.join("data", "units"),
+    max_workers: int = 4,
+    backend: str = "selenium",
+    resolve_names: bool = False,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Extrae concurrentemente las tesis de varias unidades del portal.
+
+    Cada unidad se guarda en su propio JSON dentro de `output_dir` y, al terminar,
+    se unen en `merged_filename` las copias sin limpiar de todas ellas, que se
+    limpian juntas como el dataset de una sola unidad (con su copia sin limpiar y su
+    manifiesto). Con el backend selenium los navegadores se
+    reutilizan entre unidades mediante un pool de tamaño `max_workers`. El progreso
+    se guarda en un checkpoint, así que un crawl interrumpido se reanuda sin volver
+    a extraer las unidades ya terminadas.
+
+    Params:
+    -------
+    units : Iterable[str]
+        Los identificadores de las unidades a extraer.
+    merged_filename : str
+        El archivo JSON donde se guarda el dataset conjunto.
+    output_dir : str
+        Directorio donde se guarda el dataset de cada unidad.
+    max_workers : int
+        Número máximo de unidades que se extraen a la vez (y de navegadores abiertos).
+    backend : str
+        Forma de obtener el listado: "selenium" (navegador) o "http" (peticiones HTTP concurrentes).
+    resolve_names : bool
+        Si es True, unifica en el dataset conjunto los nombres que parecen de la
+        misma persona y guarda la tabla de nombres canónicos.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, float]]
+        Las estadísticas de tiempo de cada unidad.
+    """
+
+    units = [str(unit) for unit in units]
+    os.makedirs(output_dir, exist_ok=True)
+
+    checkpoint = checkpoint_path(merged_filename)
+    pool = DriverPool(max_workers) if backend == "selenium" else None
+    stats = dict()
+
+    start = perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    scrape_unit, unit, output_dir, backend, checkpoint, pool
+                ): unit
+                for unit in units
+            }
+            for future in as_completed(futures):
+                unit = futures[future]
+                try:
+                    stats[unit] = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Unidad {unit}: {type(e).__name__}: {e}")
+                    continue
+                print(
+                    f"[INFO] Unidad {unit}: {stats[unit]['theses']} tesis "
+                    f"en {stats[unit]['total_seconds']:.1f}s"
+                )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # unimos los datos sin limpiar de las unidades terminadas, en el orden en que se
+    # pidieron, para que la limpieza no dependa de cómo se repartieron las tesis
+    datasets = dict()
+    for unit in units:
+        if unit in stats:
+            filename = os.path.join(output_dir, f"{unit}.json")
+            datasets[unit] = load_thesis_json(raw_data_path(filename))
+
+    merged = merge_units(datasets)
+    write_clean_thesis_json(merged_filename, merged, year_hashes(merged), resolve_names)
+
+    # el checkpoint solo se borra si no ha fallado ninguna unidad
+    if len(stats) == len(units) and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    with open(os.path.join(output_dir, "crawl_stats.json"), "w") as f:
+        f.write(json.dumps(stats, indent=4))
+
+    elapsed = perf_counter() - start
+    print(f"[INFO] {len(stats)}/{len(units)} unidades en {elapsed:.1f}s")
+    for unit, unit_stats in sorted(
+        stats.items(), key=lambda x: x[1]["total_seconds"], reverse=True
+    ):
+        print(
+            f"    {unit}: {unit_stats['fetch_seconds']:.1f}s extracción, "
+            f"{unit_stats['total_seconds']:.1f}s total, {unit_stats['theses']} tesis"
+        )
+
+    return stats
@@ -0,0 +1,89 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .config import CHROMEDRIVER_PATH, init_driver, set_driver_options
+
+
+class DriverPool:
+    """
+    Pool acotado de controladores WebDriver reutilizables entre varias extracciones.
+
+    Los navegadores se crean bajo demanda con `init_driver` hasta `size` y se
+    devuelven al pool al terminar cada extracción, en lugar de abrir un Chrome nuevo
+    por unidad. Un navegador que falla se descarta y se sustituye por otro nuevo.
+    """
+
+    def __init__(self, size: int, chromedriver_path: str = CHROMEDRIVER_PATH):
+        self.size = size
+        self.chromedriver_path = chromedriver_path
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> WebDriver:
+        # reutilizamos un navegador libre o creamos uno nuevo si no se ha llegado al límite
+        with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if not create:
+            return self._idle.get()
+
+        try:
+            return init_driver(set_driver_options(), self.chromedriver_path)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, driver: WebDriver) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @contextmanager
+    def driver(self) -> Iterator[WebDriver]:
+        """
+        Presta un navegador del pool durante el bloque `with`.
+
+        Returns:
+        --------
+        Iterator[WebDriver]
+            Un controlador WebDriver listo para usar.
+        """
+
+        driver = self._acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            # el navegador puede haber quedado en mal estado, no lo devolvemos al pool
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._idle.put(driver)
+            raise
+        else:
+            self._idle.put(driver)
+
+    def close(self) -> None:
+        """
+        Cierra todos los navegadores libres del pool.
+
+        Returns:
+        --------
+        None
+        """
+
+        while not self._idle.empty():
+            self._discard(self._idle.get())
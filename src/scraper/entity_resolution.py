@@ -0,0 +1,544 @@
+import json
+import os
+import re
+import zlib
+from collections import Counter
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from unidecode import unidecode
+
+# partículas que se omiten al comparar nombres ("Garcia de la Fuente" ~ "Garcia Fuente")
+PARTICLES = {"de", "del", "la", "las", "los", "el", "y", "i", "da", "dos", "van", "von"}
+
+# primo de Mersenne para las permutaciones de MinHash (a * x cabe en int64)
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_person(name: str) -> str:
+    """
+    Normaliza un nombre de persona para compararlo con otros.
+
+    Params:
+    -------
+    name : str
+        El nombre tal y como aparece en los datos (p. ej: "Pérez López, José M.").
+
+    Returns:
+    --------
+    str
+        El nombre sin acentos, en minúsculas, con el orden "nombre apellidos",
+        sin signos de puntuación ni partículas (p. ej: "jose m perez lopez").
+    """
+
+    name = unidecode(name.lower())
+
+    # si el nombre tiene una coma, le damos la vuelta
+    if "," in name:
+        name = " ".join(part.strip() for part in reversed(name.split(",")))
+
+    name = re.sub(r"[^a-z ]", " ", name)
+    return " ".join(word for word in name.split() if word not in PARTICLES)
+
+
+def ngram_hashes(text: str, n: int = 3) -> np.ndarray:
+    """
+    Obtiene los hashes de los n-gramas de caracteres de un texto.
+
+    Params:
+    -------
+    text : str
+        El texto normalizado.
+    n : int
+        La longitud de los n-gramas.
+
+    Returns:
+    --------
+    np.ndarray
+        Los hashes (únicos) de los n-gramas del texto, con un espacio de relleno en cada extremo.
+    """
+
+    padded = f" {text} "
+    grams = {padded[i : i + n] for i in range(max(len(padded) - n + 1, 1))}
+    hashes = [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+    return np.unique(np.array(hashes, dtype=np.int64))
+
+
+def minhash_signatures(
+    hash_lists: List[np.ndarray], num_perm: int = 64, seed: int = 12
+) -> np.ndarray:
+    """
+    Calcula las firmas MinHash de una lista de conjuntos de n-gramas de forma vectorizada.
+
+    Params:
+    -------
+    hash_lists : List[np.ndarray]
+        Los hashes de los n-gramas de cada nombre (ninguno vacío).
+    num_perm : int
+        Número de permutaciones (longitud de la firma).
+    seed : int
+        Semilla para generar las permutaciones.
+
+    Returns:
+    --------
+    np.ndarray
+        Una matriz (nombres, num_perm) con la firma de cada nombre.
+    """
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64)
+    b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64)
+
+    # todos los n-gramas seguidos y el índice donde empieza cada nombre
+    values = np.concatenate(hash_lists) % MERSENNE_PRIME
+    offsets = np.cumsum([0] + [len(h) for h in hash_lists[:-1]])
+
+    signatures = np.empty((len(hash_lists), num_perm), dtype=np.int64)
+
+    # procesamos por bloques de nombres para acotar la memoria
+    chunk = 4096
+    for start in range(0, len(hash_lists), chunk):
+        end = min(start + chunk, len(hash_lists))
+        lo = offsets[start]
+        hi = offsets[end] if end < len(hash_lists) else len(values)
+        permuted = (a * values[lo:hi] + b) % MERSENNE_PRIME
+        signatures[start:end] = np.minimum.reduceat(
+            permuted, offsets[start:end] - lo, axis=1
+        ).T
+
+    return signatures
+
+
+def lsh_candidate_pairs(
+    signatures: np.ndarray, bands: int = 16, max_bucket: int = 100
+) -> np.ndarray:
+    """
+    Obtiene los pares de nombres candidatos con LSH sobre bandas de las firmas MinHash.
+
+    Params:
+    -------
+    signatures : np.ndarray
+        La matriz de firmas MinHash (nombres, num_perm).
+    bands : int
+        Número de bandas. Dos nombres son candidatos si coinciden en alguna banda entera.
+    max_bucket : int
+        Tamaño máximo de un cubo. Los cubos mayores se ignoran para que el número
+        de pares no crezca de forma cuadrática con nombres muy comunes.
+
+    Returns:
+    --------
+    np.ndarray
+        Una matriz (pares, 2) con los índices de los pares candidatos, sin repetir.
+    """
+
+    rows = signatures.shape[1] // bands
+    n = len(signatures)
+    pairs = []
+
+    for band in range(bands):
+        keys = signatures[:, band * rows : (band + 1) * rows]
+        _, bucket = np.unique(keys, axis=0, return_inverse=True)
+        bucket = bucket.ravel()
+
+        # agrupamos los nombres por cubo y generamos los pares de cada cubo
+        order = np.argsort(bucket, kind="stable")
+        bounds = np.flatnonzero(np.diff(bucket[order])) + 1
+        for group in np.split(order, bounds):
+            if 1 < len(group) <= max_bucket:
+                left, right = np.triu_indices(len(group), k=1)
+                # codificamos cada par como un entero para eliminar repetidos
+                pairs.append(group[left] * n + group[right])
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    codes = np.unique(np.concatenate(pairs))
+    return np.stack([codes // n, codes % n], axis=1)
+
+
+def ngram_jaccard(hash_lists: List[np.ndarray], pairs: np.ndarray) -> np.ndarray:
+    """
+    Calcula la similitud de Jaccard exacta entre los n-gramas de cada par de nombres.
+
+    Params:
+    -------
+    hash_lists : List[np.ndarray]
+        Los hashes de los n-gramas de cada nombre.
+    pairs : np.ndarray
+        Una matriz (pares, 2) con los índices de los nombres a comparar.
+
+    Returns:
+    --------
+    np.ndarray
+        La similitud de cada par, entre 0 y 1.
+    """
+
+    # matriz dispersa binaria nombres x n-gramas
+    _, columns = np.unique(np.concatenate(hash_lists), return_inverse=True)
+    indptr = np.cumsum([0] + [len(h) for h in hash_lists])
+    data = np.ones(len(columns), dtype=np.float32)
+    X = sparse.csr_matrix((data, columns.ravel(), indptr))
+
+    sizes = np.diff(indptr)
+    similarity = np.empty(len(pairs))
+
+    # por bloques de pares para no materializar matrices enormes
+    chunk = 2**16
+    for start in range(0, len(pairs), chunk):
+        left = pairs[start : start + chunk, 0]
+        right = pairs[start : start + chunk, 1]
+        inter = np.asarray(X[left].multiply(X[right]).sum(axis=1)).ravel()
+        similarity[start : start + chunk] = inter / (sizes[left] + sizes[right] - inter)
+
+    return similarity
+
+
+def surname_blocks(keys: List[str], max_bucket: int = 100) -> List[List[int]]:
+    """
+    Agrupa los nombres normalizados que comparten los dos apellidos.
+
+    Params:
+    -------
+    keys : List[str]
+        Los nombres normalizados.
+    max_bucket : int
+        Tamaño máximo de un bloque. Los bloques mayores se ignoran.
+
+    Returns:
+    --------
+    List[List[int]]
+        Los índices de los nombres de cada bloque con más de un nombre.
+    """
+
+    blocks = dict()
+    for i, key in enumerate(keys):
+        words = key.split()
+        # solo tiene sentido si además de los apellidos hay nombre (o inicial)
+        if len(words) >= 3:
+            blocks.setdefault(tuple(words[-2:]), []).append(i)
+
+    return [b for b in blocks.values() if 1 < len(b) <= max_bucket]
+
+
+def same_word(word1: str, word2: str) -> bool:
+    """
+    Comprueba si dos palabras de un nombre coinciden, admitiendo que una sea una inicial.
+
+    Params:
+    -------
+    word1 : str
+        La primera palabra.
+    word2 : str
+        La segunda palabra.
+
+    Returns:
+    --------
+    bool
+        True si son iguales o si una es la inicial de la otra.
+    """
+
+    if word1 == word2:
+        return True
+    return (len(word1) == 1 or len(word2) == 1) and word1[0] == word2[0]
+
+
+def compatible_words(name1: str, name2: str) -> bool:
+    """
+    Comprueba si las palabras del nombre más corto aparecen en orden en el otro
+    (p. ej: "juan perez" y "juan perez lopez"), o si los dos nombres tienen las
+    mismas palabras salvo iniciales (p. ej: "j perez lopez" y "juan perez lopez").
+
+    Params:
+    -------
+    name1 : str
+        El primer nombre normalizado.
+    name2 : str
+        El segundo nombre normalizado.
+
+    Returns:
+    --------
+    bool
+        True si los dos nombres son compatibles.
+    """
+
+    short, long = sorted((name1.split(), name2.split()), key=len)
+
+    i = 0
+    initials = False
+    for word in long:
+        if i < len(short) and same_word(short[i], word):
+            initials = initials or short[i] != word
+            i += 1
+
+    # con iniciales exigimos el mismo número de palabras, para no encadenar
+    # "jose perez perez" ~ "j r perez perez" ~ "juan ramon perez perez"
+    if initials and len(short) != len(long):
+        return False
+
+    # además del orden, exigimos al menos una palabra completa en común (un apellido)
+    full_words = {word for word in short if len(word) > 1}
+    return i == len(short) and bool(full_words & set(long))
+
+
+def similar_words(word1: str, word2: str) -> bool:
+    """
+    Comprueba si dos palabras de un nombre pueden ser la misma, admitiendo iniciales y erratas.
+
+    Params:
+    -------
+    word1 : str
+        La primera palabra.
+    word2 : str
+        La segunda palabra.
+
+    Returns:
+    --------
+    bool
+        True si coinciden (ver `same_word`), si son muy parecidas (una letra
+        cambiada) o si tienen las mismas letras en otro orden.
+    """
+
+    if same_word(word1, word2) or sorted(word1) == sorted(word2):
+        return True
+    return SequenceMatcher(None, word1, word2).ratio() >= 0.75
+
+
+def conflicting_names(name1: str, name2: str) -> bool:
+    """
+    Comprueba si dos nombres completos corresponden seguro a personas distintas.
+
+    Solo se comparan los nombres con nombre y dos apellidos: si no coinciden el
+    nombre, el primer apellido o el segundo (salvo iniciales y erratas), son
+    personas distintas aunque un nombre más corto sea compatible con los dos
+    (p. ej: "juan perez lopez" y "juan perez garcia", ambos compatibles con
+    "juan perez").
+
+    Params:
+    -------
+    name1 : str
+        El primer nombre normalizado.
+    name2 : str
+        El segundo nombre normalizado.
+
+    Returns:
+    --------
+    bool
+        True si los dos nombres son incompatibles.
+    """
+
+    words1, words2 = name1.split(), name2.split()
+    if len(words1) < 3 or len(words2) < 3:
+        return False
+
+    return not all(similar_words(words1[i], words2[i]) for i in (0, -2, -1))
+
+
+def resolve_names(
+    names: Iterable[str],
+    counts: Optional[Dict[str, int]] = None,
+    preferred: Optional[Set[str]] = None,
+    threshold: float = 0.75,
+    compatible_threshold: float = 0.4,
+    num_perm: int = 64,
+    bands: int = 16,
+    max_bucket: int = 100,
+) -> Dict[str, str]:
+    """
+    Agrupa los nombres que corresponden a la misma persona y elige un nombre canónico por grupo.
+
+    Los nombres se normalizan, se comparan solo los pares candidatos que encuentra
+    LSH sobre firmas MinHash de sus trigramas de caracteres y se unen los pares cuya
+    similitud supera `threshold` (erratas, partículas) o que tienen palabras
+    compatibles y una similitud mayor que `compatible_threshold` (apellidos que
+    faltan). Los nombres con los mismos dos apellidos se bloquean aparte y se unen si
+    sus palabras son compatibles (iniciales). Como los bloques están acotados, el
+    coste crece casi linealmente con el número de nombres.
+    Dos grupos no se unen si contienen nombres completos incompatibles (ver
+    `conflicting_names`), para que un nombre corto no encadene a dos personas.
+
+    Params:
+    -------
+    names : Iterable[str]
+        Los nombres tal y como aparecen en los datos.
+    counts : Optional[Dict[str, int]]
+        Número de apariciones de cada nombre, para elegir el canónico.
+    preferred : Optional[Set[str]]
+        Nombres preferidos como canónicos (p. ej: los de los directores, ya normalizados).
+    threshold : float
+        Similitud de Jaccard de trigramas a partir de la cual dos nombres se unen.
+    compatible_threshold : float
+        Similitud mínima para unir dos nombres con palabras compatibles.
+    num_perm : int
+        Longitud de las firmas MinHash.
+    bands : int
+        Número de bandas de LSH.
+    max_bucket : int
+        Tamaño máximo de los bloques de candidatos.
+
+    Returns:
+    --------
+    Dict[str, str]
+        Un diccionario que mapea cada nombre a su nombre canónico.
+    """
+
+    names = list(dict.fromkeys(names))
+    counts = counts or dict()
+    preferred = preferred or set()
+
+    # los nombres que normalizan igual se agrupan directamente
+    normalized = [normalize_person(name) for name in names]
+    keys = [key for key in dict.fromkeys(normalized) if key]
+    key_index = {key: i for i, key in enumerate(keys)}
+
+    parent = list(range(len(keys)))
+    # nombres completos de cada grupo (solo en su raíz), los únicos que pueden chocar
+    complete = [[i] if len(key.split()) >= 3 else [] for i, key in enumerate(keys)]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        # no unimos dos grupos si acabarían juntando personas distintas, p. ej:
+        # "juan perez" con "juan perez lopez" y con "juan perez garcia"
+        i, j = find(i), find(j)
+        if i == j:
+            return
+        if any(
+            conflicting_names(keys[a], keys[b])
+            for a in complete[i]
+            for b in complete[j]
+        ):
+            return
+        parent[i] = j
+        complete[j] += complete[i]
+        complete[i] = []
+
+    if len(keys) > 1:
+        hash_lists = [ngram_hashes(key) for key in keys]
+        signatures = minhash_signatures(hash_lists, num_perm)
+        pairs = lsh_candidate_pairs(signatures, bands, max_bucket)
+
+        if len(pairs):
+            similarity = ngram_jaccard(hash_lists, pairs)
+            for (i, j), sim in zip(pairs.tolist(), similarity.tolist()):
+                if sim >= threshold or (
+                    sim >= compatible_threshold and compatible_words(keys[i], keys[j])
+                ):
+                    union(i, j)
+
+        # las iniciales apenas comparten trigramas, así que también bloqueamos por
+        # los dos apellidos y unimos los nombres con palabras compatibles
+        for block in surname_blocks(keys, max_bucket):
+            for i, j in combinations(block, 2):
+                if find(i) != find(j) and compatible_words(keys[i], keys[j]):
+                    union(i, j)
+
+    # agrupamos los nombres originales por grupo
+    clusters = dict()
+    for name, key in zip(names, normalized):
+        root = find(key_index[key]) if key else name
+        clusters.setdefault(root, []).append(name)
+
+    # canónico: preferido, más frecuente y, a igualdad, el más largo
+    mapping = dict()
+    for members in clusters.values():
+        canonical = max(
+            members,
+            key=lambda n: (n in preferred, counts.get(n, 0), len(n), n),
+        )
+        for name in members:
+            mapping[name] = canonical
+
+    return mapping
+
+
+def resolve_entities(
+    data: Dict[str, Dict[str, Dict[str, str]]], **kwargs
+) -> Tuple[Dict[str, Dict[str, Dict[str, str]]], Dict[str, str]]:
+    """
+    Unifica los nombres de autores y directores que corresponden a la misma persona.
+
+    Es una etapa entre `extract_data` y `clean_data`: sustituye cada nombre por su
+    nombre canónico, de forma que las erratas, partículas e iniciales no generen
+    nodos duplicados en el grafo.
+
+    Params:
+    -------
+    data : Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+    **kwargs
+        Parámetros de `resolve_names`.
+
+    Returns:
+    --------
+    Tuple[Dict[str, Dict[str, Dict[str, str]]], Dict[str, str]]
+        Los datos con los nombres unificados y la tabla de nombres que han cambiado
+        (nombre original -> nombre canónico).
+    """
+
+    counts = Counter()
+    directors = set()
+    for theses in data.values():
+        for thesis in theses.values():
+            counts[thesis["author"]] += 1
+            counts.update(thesis["directors"])
+            directors.update(thesis["directors"])
+
+    mapping = resolve_names(counts.keys(), counts, directors, **kwargs)
+
+    for theses in data.values():
+        for thesis in theses.values():
+            thesis["author"] = mapping[thesis["author"]]
+            # dos directores de la misma tesis pueden resultar ser la misma persona
+            thesis["directors"] = list(
+                dict.fromkeys(mapping[name] for name in thesis["directors"])
+            )
+
+    changed = {
+        name: canonical for name, canonical in mapping.items() if name != canonical
+    }
+    return data, changed
+
+
+def name_mapping_path(filename: str) -> str:
+    """
+    Obtiene la ruta de la tabla de nombres canónicos asociada a un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+
+    Returns:
+    --------
+    str
+        La ruta de la tabla (p. ej: data/thesis.names.json).
+    """
+
+    root, _ = os.path.splitext(filename)
+    return root + ".names.json"
+
+
+def save_name_mapping(mapping: Dict[str, str], path: str) -> None:
+    """
+    Guarda la tabla de nombres canónicos en un archivo JSON.
+
+    Params:
+    -------
+    mapping : Dict[str, str]
+        Un diccionario que mapea cada nombre original a su nombre canónico.
+    path : str
+        La ruta del archivo JSON.
+
+    Returns:
+    --------
+    None
+    """
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(mapping, indent=4, ensure_ascii=False, sort_keys=True))
@@ -1,10 +1,213 @@
+from html.parser import HTMLParser
 from time import sleep
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from unidecode import unidecode
 
+# script que recoge todas las tesis del listado en una única llamada al navegador
+BULK_EXTRACT_SCRIPT = """
+const text = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : "";
+};
+const skip = new Set(arguments[0] || []);
+const rows = [];
+const years = document.querySelectorAll(
+    'div[class="unidad-docs__grupo agrupador-anualidad"]'
+);
+for (const cont of years) {
+    const year = text(cont, 'h3[class="unidad-docs__grupo-titulo"]');
+    if (skip.has(year)) {
+        continue;
+    }
+    const theses = cont.querySelectorAll(
+        'li[class="unidad-docs__item c-doc c-doc--dirigidas"]'
+    );
+    for (const thesis of theses) {
+        rows.push([
+            year,
+            text(thesis, 'span[class="c-doc__titulo"]'),
+            text(thesis, 'p[class="c-doc__autores"]'),
+            text(thesis, 'div[class="c-doc__directores"]'),
+        ]);
+    }
+}
+return rows;
+"""
+
+# clases de los contenedores del listado
+YEAR_TITLE_CLASS = "unidad-docs__grupo-titulo"
+THESIS_CLASS = "unidad-docs__item c-doc c-doc--dirigidas"
+FIELD_CLASSES = {
+    ("span", "c-doc__titulo"): "title",
+    ("p", "c-doc__autores"): "author",
+    ("div", "c-doc__directores"): "directors",
+}
+
+# etiquetas html sin cierre, que no se apilan
+VOID_TAGS = {"br", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+def parse_directors(directors: str) -> List[str]:
+    """
+    Normaliza el texto de directores de una tesis y lo divide en una lista de nombres.
+
+    Params:
+    -------
+    directors : str
+        El texto del contenedor de directores (p. ej: "Dirigida por X y Y").
+
+    Returns:
+    --------
+    List[str]
+        Una lista con los nombres de los directores, sin acentos y en formato título.
+    """
+
+    directors = unidecode(directors.lower())
+
+    # limpiamos el texto de los directores
+    directors = directors.strip().replace("dirigida por ", "")
+    # si existen varios, dividimos el texto en dos
+    directors = directors.split(" y ")
+    directors = list(map(lambda x: x.strip(), directors))
+    directors = list(map(lambda x: x.title(), directors))
+
+    return directors
+
+
+def build_thesis_dict(
+    rows: Iterable[Tuple[str, str, str, str]],
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Agrupa por año una secuencia de tesis ya extraídas, con la misma estructura que `extract_data`.
+
+    Params:
+    -------
+    rows : Iterable[Tuple[str, str, str, str]]
+        Tuplas (año, título, autor, texto de directores) en el orden en que aparecen en el listado.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+    """
+
+    full_dict = dict()
+
+    for year, title, author, directors in rows:
+        year_thesis_dict = full_dict.setdefault(year, dict())
+
+        # los ids continúan la numeración del año aunque venga repartido en varias páginas
+        id_thesis = f"{year}-{len(year_thesis_dict) + 1}"
+        year_thesis_dict[id_thesis] = {
+            "title": title,
+            "author": author,
+            "directors": parse_directors(directors),
+        }
+
+    return full_dict
+
+
+class ThesisPageParser(HTMLParser):
+    """
+    Parser de una página del listado de tesis que obtiene las tuplas (año, título, autor, directores).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._stack = []  # etiquetas abiertas junto al papel que tienen en el listado
+        self._year = None
+        self._thesis = None
+        self._field = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br" and self._field:
+                self._text.append("\n")
+            return
+
+        cls = dict(attrs).get("class") or ""
+        role = None
+
+        if tag == "h3" and cls == YEAR_TITLE_CLASS:
+            role = "year"
+        elif tag == "li" and cls == THESIS_CLASS:
+            role = "thesis"
+            self._thesis = {"title": "", "author": "", "directors": ""}
+        elif self._thesis is not None:
+            role = FIELD_CLASSES.get((tag, cls))
+
+        if role and role != "thesis" and not self._field:
+            self._field = role
+            self._text = []
+        self._stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        # desapilamos hasta la etiqueta que se cierra (html mal formado incluido)
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            if role == "thesis":
+                self._save_thesis()
+            elif role and role == self._field:
+                self._save_field()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._field:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        if self._field and self._thesis is not None:
+            self._save_field()
+        if self._thesis is not None:
+            self._save_thesis()
+
+    def _save_field(self):
+        # misma normalización de espacios que aplica el .text de Selenium
+        text = " ".join("".join(self._text).split())
+        if self._field == "year":
+            self._year = text
+        else:
+            self._thesis[self._field] = text
+        self._field = None
+        self._text = []
+
+    def _save_thesis(self):
+        thesis = self._thesis
+        self._thesis = None
+        # las tesis sin título también se guardan, igual que con Selenium
+        if self._year:
+            self.rows.append(
+                (self._year, thesis["title"], thesis["author"], thesis["directors"])
+            )
+
+
+def parse_thesis_page(html: str) -> List[Tuple[str, str, str, str]]:
+    """
+    Obtiene las tesis de una página html del listado.
+
+    Params:
+    -------
+    html : str
+        El contenido html de la página.
+
+    Returns:
+    --------
+    List[Tuple[str, str, str, str]]
+        Tuplas (año, título, autor, texto de directores) en el orden de la página.
+    """
+
+    parser = ThesisPageParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
 
 def extract_data(driver: WebDriver) -> Dict[str, Dict[str, Dict[str, str]]]:
     """
@@ -40,10 +243,11 @@ def extract_data(driver: WebDriver) -> Dict[str, Dict[str, Dict[str, str]]]:
             By.XPATH, './/li[@class="unidad-docs__item c-doc c-doc--dirigidas"]'
         )
 
-        # init dict para almacenar todas las tesis del año
-        year_thesis_dict = dict()
+        # init dict para almacenar todas las tesis del año. Un año puede venir
+        # repartido en varios contenedores, así que se añaden a las que ya había
+        year_thesis_dict = full_dict.setdefault(year, dict())
 
-        for i, thesis in enumerate(thesis_containers, 1):
+        for thesis in thesis_containers:
 
             # init dict para almacenar la indo de cada tesis
             thesis_dict = dict()
@@ -60,14 +264,7 @@ def extract_data(driver: WebDriver) -> Dict[str, Dict[str, Dict[str, str]]]:
             # obtenemos texto
             title = title.text
             author = author.text
-            directors = unidecode(directors.text.lower())
-
-            # limpiamos el texto de los directores
-            directors = directors.strip().replace("dirigida por ", "")
-            # si existen varios, dividimos el texto en dos
-            directors = directors.split(" y ")
-            directors = list(map(lambda x: x.strip(), directors))
-            directors = list(map(lambda x: x.title(), directors))
+            directors = parse_directors(directors.text)
 
             # agregamos la informacion al diccionario de la tesis
             thesis_dict["title"] = title
@@ -75,10 +272,77 @@ def extract_data(driver: WebDriver) -> Dict[str, Dict[str, Dict[str, str]]]:
             thesis_dict["directors"] = directors
 
             # asignamos un id a la tesis y guardamos toda la informacion en el dict de las tesis del año
-            id_thesis = f"{year}-{i}"
+            id_thesis = f"{year}-{len(year_thesis_dict) + 1}"
             year_thesis_dict[id_thesis] = thesis_dict
 
-        # agregamos todas las tesis del año al dict completo
-        full_dict[year] = year_thesis_dict
-
     return full_dict
+
+
+def extract_rows(
+    driver: WebDriver,
+    method: str = "script",
+    skip_years: Optional[Iterable[str]] = None,
+) -> List[Tuple[str, str, str, str]]:
+    """
+    Obtiene todas las tesis de la página con una sola llamada al navegador.
+
+    Params:
+    -------
+    driver : WebDriver
+        El controlador WebDriver para interactuar con la página web.
+    method : str
+        "script" ejecuta un script en el navegador que devuelve las tuplas y
+        "source" descarga el html de la página y lo parsea localmente.
+    skip_years : Optional[Iterable[str]]
+        Años que no se extraen (p. ej: los que ya están en el checkpoint).
+
+    Returns:
+    --------
+    List[Tuple[str, str, str, str]]
+        Tuplas (año, título, autor, texto de directores) en el orden del listado.
+
+    Raises:
+    -------
+    ValueError
+        Si el método especificado no es soportado.
+    """
+
+    skip_years = list(skip_years or [])
+
+    if method == "script":
+        rows = driver.execute_script(BULK_EXTRACT_SCRIPT, skip_years)
+    elif method == "source":
+        skip = set(skip_years)
+        rows = [
+            row for row in parse_thesis_page(driver.page_source) if row[0] not in skip
+        ]
+    else:
+        raise ValueError("Metodo no soportado: {}".format(method))
+
+    return rows
+
+
+def extract_data_bulk(
+    driver: WebDriver, method: str = "script"
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Extrae datos de las tesis de una página web con una sola llamada al navegador.
+
+    En lugar de recorrer los elementos uno a uno (una llamada al WebDriver por campo),
+    obtiene todas las tuplas (año, título, autor, directores) de golpe y hace la
+    limpieza en Python. El resultado es el mismo que el de `extract_data`.
+
+    Params:
+    -------
+    driver : WebDriver
+        El controlador WebDriver para interactuar con la página web.
+    method : str
+        "script" ejecuta un script en el navegador y "source" parsea el html localmente.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+    """
+
+    return build_thesis_dict(extract_rows(driver, method))
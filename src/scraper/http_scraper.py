@@ -0,0 +1,212 @@
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .checkpoint import with_retries
+from .config import DEFAULT_UNIT, PAGE_URL, USER_AGENT
+from .extract_data import build_thesis_dict, parse_thesis_page
+
+
+def init_session(pool_size: int) -> requests.Session:
+    """
+    Crea una sesión HTTP con un pool de conexiones reutilizables.
+
+    Params:
+    -------
+    pool_size : int
+        Número máximo de conexiones simultáneas al portal.
+
+    Returns:
+    --------
+    requests.Session
+        La sesión configurada.
+    """
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_page(
+    session: requests.Session, url: str, timeout: float
+) -> List[Tuple[str, str, str, str]]:
+    """
+    Descarga y parsea una página del listado.
+
+    Params:
+    -------
+    session : requests.Session
+        La sesión HTTP compartida.
+    url : str
+        La url de la página.
+    timeout : float
+        Tiempo máximo de espera de la petición, en segundos.
+
+    Returns:
+    --------
+    List[Tuple[str, str, str, str]]
+        Las tesis de la página. Una lista vacía indica que no quedan más páginas.
+    """
+
+    response = session.get(url, timeout=timeout)
+    if response.status_code == 404:
+        return []
+    response.raise_for_status()
+
+    # el portal sirve utf-8 aunque no siempre lo indique en la cabecera
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = "utf-8"
+    return parse_thesis_page(response.text)
+
+
+async def fetch_pages(
+    page_url: str,
+    concurrency: int = 8,
+    first_page: int = 0,
+    max_pages: Optional[int] = None,
+    timeout: float = 30,
+    stop_year: Optional[str] = None,
+    cached_pages: Optional[Dict[int, list]] = None,
+    on_page: Optional[Callable[[int, list], None]] = None,
+    retries: int = 3,
+) -> List[Tuple[str, str, str, str]]:
+    """
+    Descarga concurrentemente las páginas del listado hasta encontrar una vacía.
+
+    Params:
+    -------
+    page_url : str
+        Plantilla de la url de cada página, con el campo `{page}`.
+    concurrency : int
+        Número de páginas que se piden a la vez.
+    first_page : int
+        Índice de la primera página.
+    max_pages : Optional[int]
+        Número máximo de páginas a descargar. Sin límite si es None.
+    timeout : float
+        Tiempo máximo de espera de cada petición, en segundos.
+    stop_year : Optional[str]
+        Si se indica, deja de pedir páginas en cuanto aparece un año anterior a este.
+    cached_pages : Optional[Dict[int, list]]
+        Páginas ya descargadas (p. ej: de un checkpoint), que no se vuelven a pedir.
+    on_page : Optional[Callable[[int, list], None]]
+        Función que se llama con el índice y las tesis de cada página nueva descargada.
+    retries : int
+        Número de reintentos de cada página ante errores transitorios.
+
+    Returns:
+    --------
+    List[Tuple[str, str, str, str]]
+        Las tesis de todas las páginas, en el orden del listado.
+    """
+
+    rows = []
+    cached_pages = cached_pages or dict()
+    page = first_page
+    last_page = None if max_pages is None else first_page + max_pages
+
+    with init_session(concurrency) as session:
+        finished = False
+        while not finished:
+            # pedimos un lote de páginas consecutivas a la vez
+            end = page + concurrency
+            if last_page is not None:
+                end = min(end, last_page)
+            batch = range(page, end)
+            if not batch:
+                break
+
+            missing = [p for p in batch if p not in cached_pages]
+            fetched = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        with_retries,
+                        fetch_page,
+                        session,
+                        page_url.format(page=p),
+                        timeout,
+                        retries=retries,
+                    )
+                    for p in missing
+                )
+            )
+
+            for p, page_rows in zip(missing, fetched):
+                cached_pages[p] = page_rows
+                if on_page is not None and page_rows:
+                    on_page(p, page_rows)
+            pages = [cached_pages[p] for p in batch]
+
+            # la primera página vacía marca el final del listado
+            for page_rows in pages:
+                if not page_rows:
+                    finished = True
+                    break
+                rows.extend(page_rows)
+
+            # los años aparecen de más reciente a más antiguo
+            if stop_year is not None and rows and int(rows[-1][0]) < int(stop_year):
+                finished = True
+
+            page = end
+
+    return rows
+
+
+def fetch_thesis_http(
+    unit: str = DEFAULT_UNIT,
+    page_url: str = PAGE_URL,
+    concurrency: int = 8,
+    max_pages: Optional[int] = None,
+    timeout: float = 30,
+    stop_year: Optional[str] = None,
+    cached_pages: Optional[Dict[int, list]] = None,
+    on_page: Optional[Callable[[int, list], None]] = None,
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Extrae los datos de tesis de una unidad mediante peticiones HTTP, sin navegador.
+
+    Params:
+    -------
+    unit : str
+        El identificador de la unidad en el portal de investigación.
+    page_url : str
+        Plantilla de la url de cada página, con los campos `{unit}` y `{page}`.
+        Permite apuntar a un servidor local que sirva páginas grabadas.
+    concurrency : int
+        Número de páginas que se piden a la vez.
+    max_pages : Optional[int]
+        Número máximo de páginas a descargar. Sin límite si es None.
+    timeout : float
+        Tiempo máximo de espera de cada petición, en segundos.
+    stop_year : Optional[str]
+        Si se indica, deja de pedir páginas en cuanto aparece un año anterior a este.
+    cached_pages : Optional[Dict[int, list]]
+        Páginas ya descargadas (p. ej: de un checkpoint), que no se vuelven a pedir.
+    on_page : Optional[Callable[[int, list], None]]
+        Función que se llama con el índice y las tesis de cada página nueva descargada.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario con la misma estructura que devuelve `extract_data`.
+    """
+
+    page_url = page_url.replace("{unit}", str(unit))
+    rows = asyncio.run(
+        fetch_pages(
+            page_url,
+            concurrency,
+            max_pages=max_pages,
+            timeout=timeout,
+            stop_year=stop_year,
+            cached_pages=cached_pages,
+            on_page=on_page,
+        )
+    )
+    return build_thesis_dict(rows)
@@ -1,45 +1,383 @@
 import json
-from typing import Dict
+import os
+from itertools import groupby
+from typing import Callable, Dict, List, Optional
 
+from .checkpoint import (
+    append_checkpoint,
+    checkpoint_path,
+    load_checkpoint,
+    with_retries,
+)
 from .clean_data import clean_data
-from .click_button import click_button
-from .config import init_driver, set_driver_options
-from .extract_data import extract_data
+from .click_button import expand_results, oldest_loaded_year
+from .config import (
+    CHROMEDRIVER_PATH,
+    DEFAULT_UNIT,
+    PORTAL_URL,
+    init_driver,
+    set_driver_options,
+)
+from .driver_pool import DriverPool
+from .entity_resolution import name_mapping_path, resolve_entities, save_name_mapping
+from .extract_data import build_thesis_dict, extract_rows
+from .http_scraper import fetch_thesis_http
+from .manifest import (
+    load_manifest,
+    raw_data_path,
+    rekey_theses,
+    save_manifest,
+    year_hashes,
+)
 
 
-def save_thesis_json(filename: str) -> None:
+def fetch_years_selenium(
+    unit: str,
+    years: Dict[str, list],
+    stop_year: Optional[str] = None,
+    pool: Optional[DriverPool] = None,
+    on_year: Optional[Callable[[str, list], None]] = None,
+) -> None:
     """
-    Extrae datos de tesis de un sitio web, limpia los datos y los guarda en un archivo JSON.
+    Carga el listado de una unidad en el navegador y va extrayendo cada año en cuanto está completo.
+
+    Un año está completo cuando ya se ha cargado algún año anterior (el listado va
+    del más reciente al más antiguo) o cuando no quedan más tesis. Los años que ya
+    están en `years` no se vuelven a extraer, así que si la carga falla a mitad, la
+    siguiente llamada continúa desde el primer año que falta.
 
     Params:
     -------
-    filename : str
-        El nombre del archivo JSON en el que se guardarán los datos.
+    unit : str
+        El identificador de la unidad en el portal de investigación.
+    years : Dict[str, list]
+        Las tesis de los años ya extraídos (año -> tuplas). Se completa con los nuevos.
+    stop_year : Optional[str]
+        Si se indica, deja de cargar el listado en cuanto aparece un año anterior a este.
+    pool : Optional[DriverPool]
+        Pool de navegadores reutilizables. Si es None se abre un navegador solo para esta unidad.
+    on_year : Optional[Callable[[str, list], None]]
+        Función que se llama con cada año nuevo y sus tesis en cuanto se extrae.
 
     Returns:
     --------
     None
     """
 
-    # path to chromedriver
-    chromedriver_path = "/usr/bin/chromedriver"
+    def save_years(driver, last: bool = False):
+        rows = extract_rows(driver, skip_years=years)
+        groups = [(year, list(group)) for year, group in groupby(rows, lambda r: r[0])]
+
+        # el último año cargado puede continuar en la siguiente página
+        if not last and groups and groups[-1][0] == str(oldest_loaded_year(driver)):
+            groups.pop()
+
+        for year, year_rows in groups:
+            years[year] = year_rows
+            if on_year is not None:
+                on_year(year, year_rows)
+
+    def crawl(driver):
+        driver.get(PORTAL_URL.format(unit=unit))
+        save_years(driver)
+        expand_results(driver, stop_year=stop_year, on_load=save_years)
+        save_years(driver, last=True)
+
+    if pool is not None:
+        with pool.driver() as driver:
+            crawl(driver)
+        return
 
     options = set_driver_options()
-    driver = init_driver(options, chromedriver_path)
+    driver = init_driver(options, CHROMEDRIVER_PATH)
 
-    driver.get("https://portalinvestigacion.uniovi.es/unidades/6069/tesis")
-    click_button(driver)
+    try:
+        crawl(driver)
+    finally:
+        # cerramos el navegador también si ha fallado, para no dejar procesos huérfanos
+        driver.quit()
 
-    data = extract_data(driver)
-    data = clean_data(data)
 
-    # guardamos el json
+def fetch_thesis_data(
+    unit: str = DEFAULT_UNIT,
+    backend: str = "selenium",
+    stop_year: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    retries: int = 3,
+    pool: Optional[DriverPool] = None,
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Extrae los datos de tesis sin limpiar de una unidad del portal, con ids estables.
+
+    Params:
+    -------
+    unit : str
+        El identificador de la unidad en el portal de investigación.
+    backend : str
+        Forma de obtener el listado: "selenium" (navegador) o "http" (peticiones HTTP concurrentes).
+    stop_year : Optional[str]
+        Si se indica, deja de cargar el listado en cuanto aparece un año anterior a este.
+    checkpoint : Optional[str]
+        Ruta de un checkpoint JSONL en el que se van guardando los años (selenium) o
+        páginas (http) extraídos. Si ya contiene progreso de la unidad, se reanuda desde él.
+    retries : int
+        Número de reintentos ante errores transitorios del navegador o del portal.
+    pool : Optional[DriverPool]
+        Pool de navegadores reutilizables para el backend selenium.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+
+    Raises:
+    -------
+    ValueError
+        Si el backend especificado no es soportado.
+    """
+
+    unit = str(unit)
+    progress = load_checkpoint(checkpoint).get(unit) if checkpoint else None
+    progress = progress or {"years": {}, "pages": {}, "done": False}
+
+    if progress["done"]:
+        print(f"[INFO] Unidad {unit} recuperada del checkpoint")
+        pages = [progress["pages"][p] for p in sorted(progress["pages"])]
+        years = list(progress["years"].values())
+        data = build_thesis_dict(row for rows in pages + years for row in rows)
+    elif backend == "selenium":
+        # cada año se guarda en el checkpoint en cuanto se extrae
+        years = dict(progress["years"])
+        on_year = None
+        if checkpoint:
+            on_year = lambda year, rows: append_checkpoint(
+                checkpoint, {"unit": unit, "year": year, "rows": rows}
+            )
+        if years:
+            print(f"[INFO] Unidad {unit}: {len(years)} años recuperados del checkpoint")
+
+        # cada reintento continúa desde el primer año que falta, y los reintentos se
+        # cuentan por año en lugar de por unidad
+        with_retries(
+            fetch_years_selenium,
+            unit,
+            years,
+            stop_year,
+            pool,
+            on_year,
+            retries=retries,
+            progress=lambda: len(years),
+        )
+
+        ordered = sorted(years, key=int, reverse=True)
+        data = build_thesis_dict(row for year in ordered for row in years[year])
+    elif backend == "http":
+        on_page = None
+        if checkpoint:
+            on_page = lambda page, rows: append_checkpoint(
+                checkpoint, {"unit": unit, "page": page, "rows": rows}
+            )
+
+        data = fetch_thesis_http(
+            unit,
+            stop_year=stop_year,
+            cached_pages=progress["pages"],
+            on_page=on_page,
+        )
+    else:
+        raise ValueError("Backend no soportado: {}".format(backend))
+
+    if checkpoint and not progress["done"]:
+        append_checkpoint(checkpoint, {"unit": unit, "done": True})
+
+    return rekey_theses(data)
+
+
+def write_thesis_json(filename: str, data: Dict[str, Dict[str, Dict[str, str]]]):
+    """
+    Escribe los datos de tesis en un archivo JSON.
+
+    Params:
+    -------
+    filename : str
+        El nombre del archivo JSON en el que se guardarán los datos.
+    data : Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+
+    Returns:
+    --------
+    None
+    """
+
     with open(filename, "w", encoding="utf-8") as file:
         file.write(json.dumps(data, indent=4, ensure_ascii=False))
 
+
+def write_clean_thesis_json(
+    filename: str,
+    data: Dict[str, Dict[str, Dict[str, str]]],
+    hashes: Dict[str, str],
+    resolve_names: bool = False,
+) -> None:
+    """
+    Guarda los datos sin limpiar, los limpia y escribe el JSON de tesis y su manifiesto.
+
+    Es el paso común a `save_thesis_json` y `update_thesis_json`: la limpieza y la
+    unificación de nombres dependen de todos los años a la vez, así que siempre se
+    aplican sobre el dataset completo sin limpiar, que se guarda junto al JSON.
+
+    Params:
+    -------
+    filename : str
+        El nombre del archivo JSON en el que se guardarán los datos.
+    data : Dict[str, Dict[str, Dict[str, str]]]
+        Los datos de tesis sin limpiar, con ids estables. Se modifican al limpiarlos.
+    hashes : Dict[str, str]
+        Los hashes por año de los datos sin limpiar.
+    resolve_names : bool
+        Si es True, unifica antes de limpiar los nombres que parecen de la misma
+        persona y guarda la tabla de nombres canónicos.
+
+    Returns:
+    --------
+    None
+    """
+
+    # la limpieza modifica los datos, así que la copia sin limpiar se escribe antes
+    write_thesis_json(raw_data_path(filename), data)
+
+    if resolve_names:
+        data, mapping = resolve_entities(data)
+        save_name_mapping(mapping, name_mapping_path(filename))
+
+    data = clean_data(data)
+
+    write_thesis_json(filename, data)
+    save_manifest(filename, hashes)
+
+
+def save_thesis_json(
+    filename: str,
+    unit: str = DEFAULT_UNIT,
+    backend: str = "selenium",
+    resolve_names: bool = False,
+) -> None:
+    """
+    Extrae datos de tesis de un sitio web, limpia los datos y los guarda en un archivo JSON.
+
+    Junto al JSON se guarda un manifiesto con el hash de cada año, que usa
+    `update_thesis_json` para saltarse los años que no han cambiado. Mientras
+    dura la extracción el progreso se va guardando en un checkpoint, de modo que
+    si el proceso se interrumpe la siguiente ejecución continúa donde lo dejó.
+
+    Params:
+    -------
+    filename : str
+        El nombre del archivo JSON en el que se guardarán los datos.
+    unit : str
+        El identificador de la unidad en el portal de investigación.
+    backend : str
+        Forma de obtener el listado: "selenium" (navegador) o "http" (peticiones HTTP concurrentes).
+    resolve_names : bool
+        Si es True, unifica antes de limpiar los nombres que parecen de la misma
+        persona (erratas, partículas, iniciales) y guarda la tabla de nombres canónicos.
+
+    Returns:
+    --------
+    None
+    """
+
+    # si una ejecución anterior se interrumpió, se reanuda desde su checkpoint
+    checkpoint = checkpoint_path(filename)
+    data = fetch_thesis_data(unit, backend, checkpoint=checkpoint)
+
+    # el hash se calcula sobre los datos sin limpiar, que es lo que se compara al actualizar
+    hashes = year_hashes(data)
+    write_clean_thesis_json(filename, data, hashes, resolve_names)
+
+    # con el json ya escrito el checkpoint deja de ser necesario
+    os.remove(checkpoint)
+
     print("[INFO] json exportado correctamente")
 
 
+def update_thesis_json(
+    filename: str,
+    unit: str = DEFAULT_UNIT,
+    backend: str = "selenium",
+    full: bool = False,
+    resolve_names: bool = False,
+) -> List[str]:
+    """
+    Actualiza un archivo JSON de tesis descargando solo los años nuevos o modificados.
+
+    Los años descargados sustituyen a los de la copia sin limpiar que se guarda junto
+    al JSON, y el dataset resultante se limpia igual que en `save_thesis_json`, de
+    modo que el archivo queda igual que si se hubiera extraído todo de nuevo. Si no
+    existe la copia sin limpiar (datos de una versión anterior), se extrae todo.
+
+    Params:
+    -------
+    filename : str
+        El nombre del archivo JSON con los datos existentes.
+    unit : str
+        El identificador de la unidad en el portal de investigación.
+    backend : str
+        Forma de obtener el listado: "selenium" (navegador) o "http" (peticiones HTTP concurrentes).
+    full : bool
+        Si es True, recorre el listado completo para detectar cambios en años antiguos.
+        Si es False, solo se descargan los años posteriores o iguales al más reciente ya guardado.
+    resolve_names : bool
+        Si es True, unifica antes de limpiar los nombres que parecen de la misma
+        persona y guarda la tabla de nombres canónicos.
+
+    Returns:
+    --------
+    List[str]
+        Los años que se han añadido o actualizado.
+    """
+
+    if not os.path.exists(filename) or not os.path.exists(raw_data_path(filename)):
+        # los datos ya limpios no se pueden volver a limpiar, hace falta la copia sin limpiar
+        if os.path.exists(filename):
+            print("[WARN] No hay copia sin limpiar de los datos: se extraen completos")
+        save_thesis_json(filename, unit, backend, resolve_names)
+        return list(load_thesis_json(filename).keys())
+
+    data = load_thesis_json(raw_data_path(filename))
+    hashes = load_manifest(filename)
+
+    # el año más reciente guardado puede tener tesis nuevas, así que se vuelve a descargar
+    stop_year = None if full or not data else max(data.keys(), key=int)
+    fetched = fetch_thesis_data(unit, backend, stop_year)
+
+    # el año anterior a stop_year puede estar incompleto, se descarta
+    if stop_year is not None:
+        fetched = {y: t for y, t in fetched.items() if int(y) >= int(stop_year)}
+
+    fetched_hashes = year_hashes(fetched)
+    changed = [y for y in fetched if hashes.get(y) != fetched_hashes[y]]
+    # con el listado completo, los años que ya no aparecen en el portal se quitan
+    removed = [y for y in data if full and y not in fetched]
+
+    if not changed and not removed:
+        print("[INFO] No hay años nuevos ni modificados")
+        return changed
+
+    # sustituimos los años modificados y ordenamos del más reciente al más antiguo
+    for year in removed:
+        del data[year]
+        hashes.pop(year, None)
+    data.update({year: fetched[year] for year in changed})
+    data = {year: data[year] for year in sorted(data, key=int, reverse=True)}
+    hashes.update({year: fetched_hashes[year] for year in changed})
+
+    write_clean_thesis_json(filename, data, hashes, resolve_names)
+
+    print(f"[INFO] Años actualizados: {', '.join(changed)}")
+    return changed
+
+
 def load_thesis_json(path: str) -> Dict[str, Dict[str, Dict[str, str]]]:
     """
     Carga los datos de tesis desde un archivo JSON.
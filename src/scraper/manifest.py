@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from typing import Dict
+
+from unidecode import unidecode
+
+
+def manifest_path(filename: str) -> str:
+    """
+    Obtiene la ruta del manifiesto asociado a un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+
+    Returns:
+    --------
+    str
+        La ruta del manifiesto (p. ej: data/thesis.manifest.json).
+    """
+
+    root, _ = os.path.splitext(filename)
+    return root + ".manifest.json"
+
+
+def raw_data_path(filename: str) -> str:
+    """
+    Obtiene la ruta de la copia sin limpiar de un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis (p. ej: data/thesis.json).
+
+    Returns:
+    --------
+    str
+        La ruta de los datos tal y como se extrajeron, con ids estables y sin
+        limpiar (p. ej: data/thesis.raw.json). Son los que resumen los hashes del
+        manifiesto.
+    """
+
+    root, _ = os.path.splitext(filename)
+    return root + ".raw.json"
+
+
+def stable_thesis_id(year: str, title: str) -> str:
+    """
+    Genera un id de tesis que no depende de su posición en el listado.
+
+    Params:
+    -------
+    year : str
+        El año de la tesis.
+    title : str
+        El título de la tesis.
+
+    Returns:
+    --------
+    str
+        Un id con el formato `{year}-{hash}`, estable aunque el portal reordene el listado.
+    """
+
+    # normalizamos el titulo para que cambios de formato no alteren el id
+    title = " ".join(unidecode(title.lower()).split())
+    digest = hashlib.sha1(title.encode("utf-8")).hexdigest()[:10]
+    return f"{year}-{digest}"
+
+
+def rekey_theses(
+    data: Dict[str, Dict[str, Dict[str, str]]]
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Sustituye los ids posicionales de las tesis por ids estables.
+
+    Params:
+    -------
+    data : Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+
+    Returns:
+    --------
+    Dict[str, Dict[str, Dict[str, str]]]
+        El mismo diccionario con los ids de cada año sustituidos por ids estables.
+    """
+
+    rekeyed = dict()
+
+    for year, theses in data.items():
+        year_thesis_dict = dict()
+        for thesis in theses.values():
+            id_thesis = stable_thesis_id(year, thesis["title"])
+
+            # dos tesis con el mismo titulo en el mismo año no deben pisarse
+            base_id, n = id_thesis, 1
+            while id_thesis in year_thesis_dict:
+                n += 1
+                id_thesis = f"{base_id}-{n}"
+
+            year_thesis_dict[id_thesis] = thesis
+        rekeyed[year] = year_thesis_dict
+
+    return rekeyed
+
+
+def year_hashes(data: Dict[str, Dict[str, Dict[str, str]]]) -> Dict[str, str]:
+    """
+    Calcula un hash del contenido de cada año.
+
+    Params:
+    -------
+    data : Dict[str, Dict[str, Dict[str, str]]]
+        Un diccionario que contiene la información de las tesis, organizada por año y ID.
+
+    Returns:
+    --------
+    Dict[str, str]
+        Un diccionario que mapea cada año al hash sha256 de sus tesis.
+    """
+
+    hashes = dict()
+
+    for year, theses in data.items():
+        content = json.dumps(theses, sort_keys=True, ensure_ascii=False)
+        hashes[year] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    return hashes
+
+
+def load_manifest(filename: str) -> Dict[str, str]:
+    """
+    Carga los hashes por año del manifiesto de un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis.
+
+    Returns:
+    --------
+    Dict[str, str]
+        Los hashes por año, o un diccionario vacío si todavía no hay manifiesto.
+    """
+
+    path = manifest_path(filename)
+    if not os.path.exists(path):
+        return dict()
+
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    return manifest["years"]
+
+
+def save_manifest(filename: str, hashes: Dict[str, str]) -> None:
+    """
+    Guarda los hashes por año en el manifiesto de un archivo de tesis.
+
+    Params:
+    -------
+    filename : str
+        La ruta del archivo JSON de tesis.
+    hashes : Dict[str, str]
+        Un diccionario que mapea cada año al hash de sus tesis.
+
+    Returns:
+    --------
+    None
+    """
+
+    with open(manifest_path(filename), "w") as f:
+        f.write(json.dumps({"years": hashes}, indent=4, sort_keys=True))
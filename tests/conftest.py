@@ -0,0 +1,210 @@
+import functools
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+# los módulos del proyecto se importan igual que desde src/main.py
+sys.path.insert(0, os.path.join(ROOT, "src"))
+# y los generadores de datos sintéticos de las pruebas de rendimiento
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from selenium.common.exceptions import (  # noqa: E402
+    NoSuchElementException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from scraper.click_button import ITEM_SELECTOR, YEAR_SELECTOR  # noqa: E402
+from scraper.extract_data import (  # noqa: E402
+    BULK_EXTRACT_SCRIPT,
+    THESIS_CLASS,
+    VOID_TAGS,
+    YEAR_TITLE_CLASS,
+    parse_thesis_page,
+)
+
+# rutas que usa extract_data: //etiqueta[@class="..."] o .//etiqueta[@class="..."]
+XPATH_RE = re.compile(r'^\.?//(\w+)\[@class="([^"]*)"\]$')
+
+
+class FakeElement:
+    """
+    Elemento html con la parte de la interfaz de WebElement que usa el scraper.
+    """
+
+    def __init__(self, tag, cls):
+        self.tag = tag
+        self.cls = cls
+        self.children = []
+        self.parts = []  # texto y elementos hijos en orden de documento
+
+    @property
+    def text(self):
+        # como el .text de Selenium: texto visible con los espacios normalizados
+        return " ".join(self._raw_text().split())
+
+    def _raw_text(self):
+        return "".join(p if isinstance(p, str) else p._raw_text() for p in self.parts)
+
+    def _descendants(self):
+        for child in self.children:
+            yield child
+            yield from child._descendants()
+
+    def find_elements(self, by, value):
+        tag, cls = XPATH_RE.match(value).groups()
+        return [e for e in self._descendants() if e.tag == tag and e.cls == cls]
+
+    def find_element(self, by, value):
+        return self.find_elements(by, value)[0]
+
+
+class FakeDriver(FakeElement):
+    """
+    WebDriver falso que sirve una página html ya cargada, sin navegador.
+    """
+
+    def __init__(self, html):
+        super().__init__("html", "")
+        self.load(html)
+
+    def load(self, html):
+        self.children, self.parts = [], []
+        self.page_source = html
+        builder = _TreeBuilder(self)
+        builder.feed(html)
+        builder.close()
+
+    def quit(self):
+        pass
+
+
+class FakeListingDriver(FakeDriver):
+    """
+    WebDriver falso que abre la primera página grabada del listado y carga la
+    siguiente con cada clic en el botón 'See more'.
+
+    Los scripts del scraper se responden en Python. La carga de las páginas de
+    `failures` falla una vez con WebDriverException, como un navegador que se cae;
+    el conjunto se comparte entre navegadores para simular reintentos.
+    """
+
+    def __init__(self, pages, failures=None):
+        self.pages = pages
+        self.failures = failures if failures is not None else set()
+        self.loaded = 0
+        super().__init__("")
+
+    def get(self, url):
+        self.loaded = 1
+        self.load("".join(self.pages[: self.loaded]))
+
+    def find_element(self, by, value):
+        if by != By.ID:
+            return super().find_element(by, value)
+        if value != "verMasButton" or self.loaded >= len(self.pages):
+            raise NoSuchElementException(value)
+        return FakeButton(self)
+
+    def execute_script(self, script, *args):
+        if script == BULK_EXTRACT_SCRIPT:
+            skip = set(args[0] if args else [])
+            rows = parse_thesis_page(self.page_source)
+            return [list(row) for row in rows if row[0] not in skip]
+        if ITEM_SELECTOR in script:
+            return len(self.find_elements(By.XPATH, f'//li[@class="{THESIS_CLASS}"]'))
+        if YEAR_SELECTOR in script:
+            years = self.find_elements(By.XPATH, f'//h3[@class="{YEAR_TITLE_CLASS}"]')
+            return years[-1].text if years else None
+        raise NotImplementedError(script)
+
+
+class FakeButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        driver = self.driver
+        if driver.loaded in driver.failures:
+            driver.failures.discard(driver.loaded)
+            raise WebDriverException(f"fallo al cargar la página {driver.loaded}")
+        driver.loaded += 1
+        driver.load("".join(driver.pages[: driver.loaded]))
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self, root):
+        super().__init__()
+        self.stack = [root]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.stack[-1].parts.append("\n")
+            return
+        element = FakeElement(tag, dict(attrs).get("class") or "")
+        self.stack[-1].children.append(element)
+        self.stack[-1].parts.append(element)
+        self.stack.append(element)
+
+    def handle_endtag(self, tag):
+        if any(e.tag == tag for e in self.stack[1:]):
+            while self.stack.pop().tag != tag:
+                pass
+
+    def handle_data(self, data):
+        self.stack[-1].parts.append(data)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_listing(directory):
+    """
+    Sirve las páginas del listado de un directorio y devuelve la plantilla de sus urls.
+
+    La primera página que no existe devuelve 404 y cierra el listado.
+    """
+
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/page{{page}}.html"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def read_fixture(*path):
+    with open(os.path.join(FIXTURES, *path), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def listing_pages():
+    names = os.listdir(os.path.join(FIXTURES, "listing"))
+    pages = sorted(name for name in names if name.startswith("page"))
+    return [read_fixture("listing", page) for page in pages]
+
+
+@pytest.fixture
+def listing_html():
+    return read_fixture("listing.html")
+
+
+@pytest.fixture
+def listing_driver(listing_html):
+    return FakeDriver(listing_html)
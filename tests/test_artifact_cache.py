@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+from artifact_cache import ArtifactCache
+from scheduler import Task, run_tasks
+
+# tareas ejecutadas en el proceso principal (las de los tests son "main" e "io")
+calls = []
+
+
+def load(value):
+    calls.append("load")
+    return value
+
+
+def write_file(value, path):
+    calls.append("file")
+    with open(path, "w") as f:
+        f.write(f"valor {value}")
+    return value * 2
+
+
+def write_dir(value, path, count):
+    # el número de archivos depende del resultado, así que se guarda el directorio
+    calls.append("dir")
+    os.makedirs(path, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(path, f"{i}.txt"), "w") as f:
+            f.write(f"{value} {i}")
+    return count
+
+
+def tasks(params=None):
+    return [
+        Task("load", load, kind="main", value=3),
+        Task(
+            "file",
+            write_file,
+            ["load"],
+            "io",
+            cache=True,
+            params=params or {},
+            outputs=["out/file.txt"],
+            path="out/file.txt",
+        ),
+        Task(
+            "dir",
+            write_dir,
+            ["file"],
+            "io",
+            cache=True,
+            outputs=["out/tiles"],
+            path="out/tiles",
+            count=3,
+        ),
+    ]
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("out")
+    calls.clear()
+    return ArtifactCache(str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_second_run_comes_from_the_cache(cache, jobs):
+    first, _ = run_tasks(tasks(), jobs=jobs, cache=cache, base_key="relaciones")
+    assert calls == ["load", "file", "dir"]
+
+    calls.clear()
+    results, timings = run_tasks(tasks(), jobs=jobs, cache=cache, base_key="relaciones")
+
+    # ni las tareas de la caché ni las que solo se necesitaban para ellas se ejecutan
+    assert calls == []
+    assert {name: kind for name, (kind, _) in timings.items()} == {
+        "file": "cache",
+        "dir": "cache",
+    }
+    # solo se cargan los resultados que usa alguna tarea que se ejecuta
+    assert results == {}
+    assert first == {"load": 3, "file": 6, "dir": 3}
+
+
+@pytest.mark.parametrize(
+    "params, base_key, expected",
+    [
+        ({"umbral": 1}, "relaciones", ["load", "file", "dir"]),
+        ({}, "otras relaciones", ["load", "file", "dir"]),
+        ({}, "relaciones", []),
+    ],
+)
+def test_params_and_relations_invalidate(cache, params, base_key, expected):
+    run_tasks(tasks(), cache=cache, base_key="relaciones")
+    calls.clear()
+
+    run_tasks(tasks(params), cache=cache, base_key=base_key)
+
+    assert calls == expected
+
+
+def test_restores_files_and_directories(cache):
+    run_tasks(tasks(), cache=cache, base_key="relaciones")
+    expected = {
+        "out/file.txt": read("out/file.txt"),
+        **{f"out/tiles/{i}.txt": read(f"out/tiles/{i}.txt") for i in range(3)},
+    }
+
+    # un archivo cambiado, otro borrado y uno de más en el directorio
+    with open("out/file.txt", "w") as f:
+        f.write("cambiado")
+    os.remove("out/tiles/1.txt")
+    with open("out/tiles/9.txt", "w") as f:
+        f.write("sobra")
+    calls.clear()
+
+    run_tasks(tasks(), cache=cache, base_key="relaciones")
+
+    assert calls == []
+    assert sorted(os.listdir("out/tiles")) == ["0.txt", "1.txt", "2.txt"]
+    assert {path: read(path) for path in expected} == expected
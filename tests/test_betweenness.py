@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import pytest
+
+from graph.betweenness import approximate_betweenness, betweenness_centrality
+from graph.csr_graph import CSRGraph
+
+
+def thesis_like_graph(directed, seed):
+    # autores que apuntan a sus directores, como en la red de tesis, más una
+    # componente pequeña y nodos aislados
+    graph = nx.gnm_random_graph(120, 180, seed=seed, directed=directed)
+    graph.add_edges_from((200 + i, i % 7) for i in range(30))
+    graph.add_edges_from([(300, 301), (301, 302), (302, 300), (303, 300)])
+    graph.add_nodes_from([400, 401])
+    return nx.relabel_nodes(graph, lambda node: f"n{node}")
+
+
+def assert_close(result, expected):
+    assert result.keys() == expected.keys()
+    for node, value in expected.items():
+        assert result[node] == pytest.approx(value, rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("normalized", [True, False])
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_matches_networkx(directed, normalized, jobs):
+    graph = thesis_like_graph(directed, seed=1)
+
+    result = betweenness_centrality(
+        CSRGraph.from_networkx(graph), normalized=normalized, jobs=jobs
+    )
+
+    assert_close(result, nx.betweenness_centrality(graph, normalized=normalized))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_same_result_with_any_number_of_processes(directed):
+    graph = CSRGraph.from_networkx(thesis_like_graph(directed, seed=2))
+
+    assert betweenness_centrality(graph, jobs=1) == betweenness_centrality(
+        graph, jobs=2
+    )
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_approximate_with_every_source_is_exact(directed):
+    graph = thesis_like_graph(directed, seed=3)
+
+    # con top_k mayor que el grafo el muestreo solo para al usar todos los orígenes
+    estimate, error, info = approximate_betweenness(
+        CSRGraph.from_networkx(graph), top_k=len(graph), patience=10**6, jobs=2
+    )
+
+    assert info["stop"] == "exacto"
+    assert not any(error.values())
+    assert_close(estimate, nx.betweenness_centrality(graph))
+
+
+def test_shared_executor_across_graphs():
+    # el pool del planificador calcula varias redes seguidas con los mismos procesos
+    graphs = [thesis_like_graph(directed, seed=4) for directed in (False, True)]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for graph in graphs:
+            result = betweenness_centrality(
+                CSRGraph.from_networkx(graph), jobs=2, executor=executor
+            )
+            assert_close(result, nx.betweenness_centrality(graph))
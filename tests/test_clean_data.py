@@ -0,0 +1,45 @@
+import copy
+import json
+import os
+
+import pytest
+
+from bench_name_index import clean_data_loop, synthetic_theses
+from conftest import ROOT
+from scraper.clean_data import NameIndex, clean_data, unify_duplicated_names
+
+
+def dump(data):
+    # como write_thesis_json
+    return json.dumps(data, indent=4, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("size", [300, 1500])
+def test_matches_previous_loop_on_synthetic_data(size):
+    data = synthetic_theses(size, seed=size)
+
+    assert dump(clean_data(copy.deepcopy(data))) == dump(clean_data_loop(data))
+
+
+def test_matches_previous_loop_on_portal_data():
+    with open(os.path.join(ROOT, "data", "thesis.json"), encoding="utf-8") as f:
+        data = json.load(f)
+
+    assert dump(clean_data(copy.deepcopy(data))) == dump(clean_data_loop(data))
+
+
+def test_find_matches_unify_duplicated_names():
+    names = [
+        "Pablo Gonzalez Gonzalez",
+        "Pablo Gonzalez",
+        "José Pérez López",
+        "Jose Perez Garcia",
+        "Ana Gil",
+    ]
+    index = NameIndex(names)
+
+    for query in ["Pablo Gonzalez", "Jose Perez", "Ana Gil Ruiz", "Luis Sanz", "Gil"]:
+        expected = None
+        for name in names:
+            expected = unify_duplicated_names(query, name) or expected
+        assert index.find(query) == expected
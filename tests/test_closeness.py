@@ -0,0 +1,57 @@
+import networkx as nx
+import pytest
+
+from graph.closeness import closeness_centrality
+from graph.csr_graph import CSRGraph
+
+
+def thesis_like_graph(directed, seed):
+    # autores que apuntan a sus directores, como en la red de tesis
+    graph = nx.gnm_random_graph(120, 150, seed=seed, directed=directed)
+    graph.add_edges_from((200 + i, i % 7) for i in range(30))
+    return nx.relabel_nodes(graph, lambda node: f"n{node}")
+
+
+def disconnected_graph(directed):
+    # una componente grande, varias pequeñas y nodos aislados
+    graph = nx.disjoint_union_all(
+        [
+            nx.gnm_random_graph(60, 90, seed=1, directed=directed),
+            nx.path_graph(5, create_using=nx.DiGraph if directed else nx.Graph),
+            nx.star_graph(4, create_using=nx.DiGraph if directed else nx.Graph),
+            nx.empty_graph(3, create_using=nx.DiGraph if directed else nx.Graph),
+        ]
+    )
+    graph.add_edge(100, 101)
+    return nx.relabel_nodes(graph, lambda node: f"n{node}")
+
+
+GRAPHS = {
+    "undirected": lambda: thesis_like_graph(False, seed=0),
+    "directed": lambda: thesis_like_graph(True, seed=0),
+    "disconnected": lambda: disconnected_graph(False),
+    "disconnected_directed": lambda: disconnected_graph(True),
+}
+
+
+@pytest.mark.parametrize("name", GRAPHS)
+@pytest.mark.parametrize(
+    "batch_entries, block_size",
+    # por defecto, lotes de un solo origen y bloques de componentes diminutos
+    [(1 << 22, 256), (1, 1), (97, 3), (500, 16)],
+)
+def test_matches_networkx(name, batch_entries, block_size):
+    graph = GRAPHS[name]()
+    expected = nx.closeness_centrality(graph)
+
+    for source in (graph, CSRGraph.from_networkx(graph)):
+        result = closeness_centrality(
+            source, batch_entries=batch_entries, block_size=block_size
+        )
+        assert list(result) == list(expected)
+        assert result == pytest.approx(expected, abs=1e-12)
+
+
+def test_trivial_graphs():
+    assert closeness_centrality(nx.Graph()) == {}
+    assert closeness_centrality(nx.empty_graph(["a"])) == {"a": 0.0}
@@ -0,0 +1,73 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import pytest
+
+import graph.communities as communities
+
+# barrido corto para que los tests sean rápidos
+SWEEP = dict(resolutions=(0.8, 1.2), runs=3)
+
+
+def thesis_like_graph():
+    # grupos de autores alrededor de unos pocos directores, unidos entre sí por
+    # algunas codirecciones, más nodos aislados
+    graph = nx.relaxed_caveman_graph(6, 8, 0.1, seed=1)
+    graph.add_nodes_from([100, 101])
+    return nx.relabel_nodes(graph, lambda node: f"n{node}")
+
+
+def test_same_consensus_with_any_number_of_processes():
+    graph = thesis_like_graph()
+
+    result = communities.detect_communities(graph, jobs=1, **SWEEP)
+
+    assert communities.detect_communities(graph, jobs=2, **SWEEP) == result
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert (
+            communities.detect_communities(graph, jobs=2, executor=executor, **SWEEP)
+            == result
+        )
+
+    assert result["partition"].keys() == set(graph)
+    assert len(result["stability"]) == max(result["partition"].values()) + 1
+    assert all(0 <= value <= 1 for value in result["stability"])
+    assert [(run["resolution"], run["seed"]) for run in result["runs"]] == [
+        (resolution, seed) for resolution in (0.8, 1.2) for seed in range(3)
+    ]
+
+
+def test_same_consensus_in_repeated_runs():
+    graph = thesis_like_graph()
+
+    results = [communities.detect_communities(graph, **SWEEP) for _ in range(3)]
+
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+def test_saved_communities_are_reused(tmp_path, monkeypatch):
+    graph = thesis_like_graph()
+    filename = str(tmp_path / "thesis.json")
+
+    result = communities.get_communities(graph, filename, "digest", **SWEEP)
+
+    with open(communities.communities_path(filename)) as f:
+        saved = json.load(f)
+    assert saved["digest"] == "digest"
+    # json guarda las claves como texto y las tuplas como listas
+    assert json.loads(json.dumps(result)) == saved["communities"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("se recalculan las comunidades guardadas")
+
+    monkeypatch.setattr(communities, "detect_communities", fail)
+    assert communities.get_communities(graph, filename, "digest", **SWEEP) == (
+        saved["communities"]
+    )
+
+    # con otras relaciones o parámetros se vuelven a calcular
+    for digest, sweep in [("otro", SWEEP), ("digest", dict(SWEEP, runs=2))]:
+        with pytest.raises(AssertionError):
+            communities.get_communities(graph, filename, digest, **sweep)
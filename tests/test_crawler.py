@@ -0,0 +1,65 @@
+import copy
+import functools
+import json
+import os
+import shutil
+
+import scraper.json_generator as json_generator
+from conftest import FIXTURES, serve_listing
+from scraper.clean_data import clean_data
+from scraper.crawler import crawl_units, merge_units
+from scraper.entity_resolution import resolve_entities
+from scraper.http_scraper import fetch_thesis_http
+from scraper.manifest import load_manifest, raw_data_path, year_hashes
+
+# las páginas grabadas repartidas entre dos unidades del portal
+UNITS = {"A": ["page0.html", "page1.html"], "B": ["page2.html", "page3.html"]}
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def portal(directory):
+    for unit, pages in UNITS.items():
+        os.makedirs(directory / unit)
+        for i, page in enumerate(pages):
+            shutil.copy(
+                os.path.join(FIXTURES, "listing", page),
+                directory / unit / f"page{i}.html",
+            )
+    return str(directory)
+
+
+def test_merge_cleans_the_raw_units_together(tmp_path, monkeypatch):
+    merged_filename = str(tmp_path / "thesis_units.json")
+    output_dir = str(tmp_path / "units")
+
+    with serve_listing(portal(tmp_path / "portal")) as url:
+        monkeypatch.setattr(
+            json_generator,
+            "fetch_thesis_http",
+            functools.partial(
+                fetch_thesis_http, page_url=url.replace("/page", "/{unit}/page")
+            ),
+        )
+        stats = crawl_units(
+            UNITS, merged_filename, output_dir, backend="http", resolve_names=True
+        )
+
+    assert sorted(stats) == sorted(UNITS)
+
+    # el dataset conjunto parte de las copias sin limpiar de cada unidad...
+    raw = merge_units(
+        {
+            unit: read_json(raw_data_path(os.path.join(output_dir, f"{unit}.json")))
+            for unit in UNITS
+        }
+    )
+    assert read_json(raw_data_path(merged_filename)) == raw
+    assert load_manifest(merged_filename) == year_hashes(raw)
+
+    # ...y se limpia una sola vez, como el de una unidad
+    expected, _ = resolve_entities(copy.deepcopy(raw))
+    assert read_json(merged_filename) == clean_data(expected)
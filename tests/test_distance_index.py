@@ -0,0 +1,51 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph.csr_graph import CSRGraph
+from graph.distance_index import DistanceIndex
+
+
+def build(graph, tmp_path, batch_entries=1 << 22):
+    csr = CSRGraph.from_networkx(graph)
+    return DistanceIndex.build(
+        csr, str(tmp_path / "thesis.distances.npy"), "x", batch_entries
+    )
+
+
+def assert_matches_networkx(index, graph):
+    for source in graph:
+        assert index.distances_from(source) == nx.single_source_shortest_path_length(
+            graph, source
+        )
+
+
+def test_large_component_with_short_distances_uses_8_bits(tmp_path):
+    # 400 nodos conectados pero ninguna distancia mayor que 2
+    graph = nx.relabel_nodes(nx.star_graph(400), lambda node: f"n{node}")
+
+    index = build(graph, tmp_path)
+
+    assert index.matrix.dtype == np.uint8
+    assert index.diameter() == 2
+    assert_matches_networkx(index, graph)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_widens_when_a_long_distance_appears(tmp_path, directed):
+    # los primeros orígenes son los de una estrella y los últimos los de un camino
+    # de 300 nodos, así que el tipo se ensancha con parte de la matriz ya escrita
+    create_using = nx.DiGraph if directed else nx.Graph
+    graph = nx.disjoint_union(
+        nx.star_graph(20, create_using=create_using),
+        nx.path_graph(300, create_using=create_using),
+    )
+    graph = nx.relabel_nodes(graph, lambda node: f"n{node}")
+
+    index = build(graph, tmp_path, batch_entries=len(graph) * 16)
+
+    assert index.matrix.dtype == np.uint16
+    assert index.distance("n0", "n21") is None
+    assert index.diameter() == 299
+    assert_matches_networkx(index, graph)
+    assert not list(tmp_path.glob("*.tmp*"))
@@ -0,0 +1,68 @@
+import pytest
+
+from scraper.entity_resolution import conflicting_names, resolve_names
+
+
+def groups(mapping):
+    clusters = dict()
+    for name, canonical in mapping.items():
+        clusters.setdefault(canonical, set()).add(name)
+    return sorted(map(sorted, clusters.values()))
+
+
+@pytest.mark.parametrize(
+    "names",
+    [
+        ["Juan Pérez López", "Juan Pérez", "Juan Pérez García"],
+        ["Juan Perez", "Juan Pérez López", "Juan Pérez García"],
+        ["Juan Pérez García", "Pérez, Juan", "Juan Pérez López"],
+    ],
+)
+def test_short_name_does_not_chain_two_people(names):
+    mapping = resolve_names(names)
+
+    assert mapping["Juan Pérez López"] != mapping["Juan Pérez García"]
+    # el nombre corto se une a una de las dos personas
+    short = next(name for name in names if "López" not in name and "García" not in name)
+    assert mapping[short] in (mapping["Juan Pérez López"], mapping["Juan Pérez García"])
+
+
+def test_initial_does_not_chain_two_people():
+    mapping = resolve_names(["J. Perez Lopez", "Juan Perez Lopez", "Jose Perez Lopez"])
+
+    assert mapping["Juan Perez Lopez"] != mapping["Jose Perez Lopez"]
+    assert mapping["J. Perez Lopez"] == mapping["Juan Perez Lopez"]
+
+
+def test_same_person_still_unified():
+    names = [
+        "Juan Perez Lopez",
+        "Pérez López, Juan",
+        "Juan de Pérez López",
+        "J. Pérez López",
+        "Juan Pérez",
+        "Ruben Usamentiaga Fernandez",
+        "Ruben Usamentiga Fernandez",
+    ]
+
+    assert groups(resolve_names(names)) == [
+        ["J. Pérez López", "Juan Perez Lopez", "Juan Pérez", "Juan de Pérez López", "Pérez López, Juan"],
+        ["Ruben Usamentiaga Fernandez", "Ruben Usamentiga Fernandez"],
+    ]  # fmt: skip
+
+
+@pytest.mark.parametrize(
+    "name1, name2, conflict",
+    [
+        ("juan perez lopez", "juan perez garcia", True),
+        ("juan perez lopez", "jose perez lopez", True),
+        ("juan perez lopez", "j perez lopez", False),
+        ("juan perez lopez", "juan peres lopez", False),
+        ("ruben usamentiaga fernandez", "ruben usamentiga fernandez", False),
+        ("juan carlos perez lopez", "juan perez lopez", False),
+        ("juan perez", "juan perez garcia", False),
+    ],
+)
+def test_conflicting_names(name1, name2, conflict):
+    assert conflicting_names(name1, name2) == conflict
+    assert conflicting_names(name2, name1) == conflict
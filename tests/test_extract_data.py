@@ -0,0 +1,33 @@
+import json
+
+from conftest import FakeDriver, read_fixture
+from scraper.extract_data import extract_data, extract_data_bulk, extract_rows
+
+
+def test_bulk_matches_per_element(listing_driver):
+    expected = extract_data(listing_driver)
+    data = extract_data_bulk(listing_driver, method="source")
+
+    # mismo contenido y mismo orden de años e ids, que es lo que acaba en el json
+    assert json.dumps(data) == json.dumps(expected)
+
+
+def test_rows_cover_every_thesis(listing_driver, listing_html):
+    rows = extract_rows(listing_driver, method="source")
+
+    assert len(rows) == listing_html.count("c-doc--dirigidas")
+    assert all(year.isdigit() and title and author for year, title, author, _ in rows)
+
+
+def test_untitled_thesis_and_split_year():
+    html = read_fixture("edge_cases", "page0.html")
+    expected = extract_data(FakeDriver(html))
+
+    # la tesis sin título se guarda y el año repartido en dos contenedores continúa
+    # la numeración en lugar de pisar las tesis del primero
+    assert expected["2024"]["2024-2"]["title"] == ""
+    assert list(expected["2023"]) == ["2023-1", "2023-2", "2023-3"]
+    assert list(expected) == ["2024", "2023", "2022"]
+
+    data = extract_data_bulk(FakeDriver(html), method="source")
+    assert json.dumps(data) == json.dumps(expected)
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from graph.graph_store import GraphStore
+from main import parse_args
+from pipeline import build_tasks, run_tasks
+
+# dos grupos de investigación unidos por un codirector y un autor que luego dirige
+RELATIONS = [
+    ("Ana Lopez", "Juan Perez"),
+    ("Luis Garcia", "Juan Perez"),
+    ("Luis Garcia", "Maria Diaz"),
+    ("Maria Diaz", "Juan Perez"),
+    ("Pablo Ruiz", "Maria Diaz"),
+    ("Sara Gil", "Elena Vega"),
+    ("Raul Sanz", "Elena Vega"),
+    ("Raul Sanz", "Carlos Mora"),
+    ("Eva Ramos", "Carlos Mora"),
+    ("Ivan Rey", "Carlos Mora"),
+    ("Ivan Rey", "Maria Diaz"),
+]
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--jobs", "1"],
+        ["--jobs", "2", "--render-jobs", "2", "--distance-index", "--incremental"],
+    ],
+)
+def test_graphs_built_once(tmp_path, monkeypatch, argv):
+    # las tareas escriben en outputs/ y junto al archivo de datos
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("sys.argv", ["main.py", *argv])
+    filename = str(tmp_path / "data" / "thesis.json")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "thesis.json").write_text(json.dumps({}))
+    for output_dir in ("outputs/static", "outputs/interactive"):
+        (tmp_path / output_dir).mkdir(parents=True)
+
+    args = parse_args()
+    store = GraphStore(RELATIONS)
+    tasks = build_tasks(store, args, filename)
+    run_tasks(tasks, jobs=args.jobs, render_jobs=args.render_jobs)
+
+    built = {"graph", "digraph", "csr_graph", "csr_digraph", "degrees"}
+    assert built <= set(store.build_counts)
+    assert all(count == 1 for count in store.build_counts.values()), dict(
+        store.build_counts
+    )
@@ -0,0 +1,63 @@
+import json
+import os
+
+import pytest
+
+from conftest import FIXTURES, FakeDriver, read_fixture, serve_listing
+from scraper.extract_data import extract_data, parse_thesis_page
+from scraper.http_scraper import fetch_thesis_http
+
+PAGES = sorted(
+    f for f in os.listdir(os.path.join(FIXTURES, "listing")) if f.startswith("page")
+)
+
+
+@pytest.fixture
+def page_url():
+    # las páginas grabadas
+    with serve_listing(os.path.join(FIXTURES, "listing")) as url:
+        yield url
+
+
+def test_fetch_matches_extract_data(page_url):
+    # el navegador acaba con todas las páginas cargadas en el mismo listado
+    expected = extract_data(FakeDriver(read_fixture("listing.html")))
+
+    for concurrency in (1, 3, 8):
+        data = fetch_thesis_http("6069", page_url=page_url, concurrency=concurrency)
+        assert data == expected
+        assert list(data) == list(expected)
+
+
+def test_fetch_resumes_from_cached_pages(page_url):
+    expected = fetch_thesis_http("6069", page_url=page_url)
+
+    cached = {0: parse_thesis_page(read_fixture("listing", PAGES[0]))}
+    fetched = []
+    data = fetch_thesis_http(
+        "6069",
+        page_url=page_url,
+        cached_pages=cached,
+        on_page=lambda page, rows: fetched.append(page),
+    )
+
+    assert data == expected
+    assert sorted(fetched) == list(range(1, len(PAGES)))
+
+
+def test_stop_year(page_url):
+    data = fetch_thesis_http("6069", page_url=page_url, concurrency=1, stop_year="2015")
+
+    # se para en la página en la que aparece un año anterior, sin pedir las siguientes
+    assert "2015" in data and "2024" in data
+    assert "1990" not in data
+
+
+def test_fetch_matches_extract_data_on_edge_cases():
+    # una tesis sin título y un año repartido en dos contenedores
+    expected = extract_data(FakeDriver(read_fixture("edge_cases", "page0.html")))
+
+    with serve_listing(os.path.join(FIXTURES, "edge_cases")) as url:
+        data = fetch_thesis_http("6069", page_url=url)
+
+    assert json.dumps(data) == json.dumps(expected)
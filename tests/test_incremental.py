@@ -0,0 +1,100 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graph import incremental
+from graph.graph_store import relations_digest
+
+
+def random_relations(rng, group, authors, directors, count):
+    # autores de un grupo que apuntan a uno o dos directores del grupo, que a veces
+    # también son autores
+    def name(kind, size):
+        return f"{group}{kind}{rng.randrange(size)}"
+
+    relations = []
+    for _ in range(count):
+        author = name("a", authors)
+        for _ in range(rng.choice((1, 1, 2))):
+            relations.append((author, name("d", directors)))
+        if rng.random() < 0.2:
+            relations.append((name("d", directors), name("d", directors)))
+    return [(a, b) for a, b in relations if a != b]
+
+
+def random_network(rng, groups, authors, directors, count):
+    # grupos sin relaciones entre ellos, como los de la red de tesis: una relación
+    # nueva solo cambia los caminos de su grupo
+    return [
+        relation
+        for group in groups
+        for relation in random_relations(rng, group, authors, directors, count)
+    ]
+
+
+def assert_matches_networkx(state, relations):
+    graph = nx.DiGraph() if state.directed else nx.Graph()
+    graph.add_edges_from(relations)
+
+    assert set(state.names) == set(graph)
+    for metric, error in incremental.check_state(state).items():
+        assert error <= incremental.TOLERANCE, metric
+
+    for metric, expected in [
+        ("betweenness", nx.betweenness_centrality(graph)),
+        ("closeness", nx.closeness_centrality(graph)),
+    ]:
+        values = state.centrality(metric)
+        for node, value in expected.items():
+            assert values[node] == pytest.approx(value, abs=1e-9), (metric, node)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_updates_match_networkx(tmp_path, capsys, directed, seed):
+    rng = random.Random(seed)
+    filename = str(tmp_path / "thesis.json")
+    relations = random_network(rng, "ABCDE", 40, 15, 30)
+
+    state = incremental.get_metrics_state(
+        relations, filename, relations_digest(relations), directed
+    )
+    assert_matches_networkx(state, relations)
+
+    # lotes de relaciones nuevas, con autores y directores que no estaban
+    for batch in range(3):
+        group = rng.choice("ABCDE")
+        relations = relations + random_relations(rng, group, 45, 17, 3)
+        relations.append((f"nuevo{batch}", f"{group}d{rng.randrange(15)}"))
+        n_old = len(state.names)
+
+        state = incremental.get_metrics_state(
+            relations, filename, relations_digest(relations), directed
+        )
+
+        assert "actualizadas" in capsys.readouterr().out
+        # solo se recalcula una parte de los orígenes
+        assert state.affected < n_old
+        assert_matches_networkx(state, relations)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_removed_relation_rebuilds_the_state(tmp_path, capsys, directed):
+    rng = random.Random(3)
+    filename = str(tmp_path / "thesis.json")
+    relations = random_network(rng, "AB", 40, 15, 30)
+    incremental.get_metrics_state(
+        relations, filename, relations_digest(relations), directed
+    )
+    capsys.readouterr()
+
+    removed = {relations[0], relations[0][::-1]}
+    relations = [relation for relation in relations if relation not in removed]
+    relations += random_relations(rng, "A", 45, 17, 3)
+    state = incremental.get_metrics_state(
+        relations, filename, relations_digest(relations), directed
+    )
+
+    assert "desde cero" in capsys.readouterr().out
+    assert_matches_networkx(state, relations)
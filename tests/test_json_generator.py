@@ -0,0 +1,184 @@
+import functools
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+
+import pytest
+
+from selenium.common.exceptions import WebDriverException
+
+import scraper.checkpoint as checkpoint
+import scraper.json_generator as json_generator
+from conftest import (
+    FIXTURES,
+    FakeDriver,
+    FakeListingDriver,
+    listing_pages,
+    read_fixture,
+    serve_listing,
+)
+from scraper.checkpoint import load_checkpoint
+from scraper.entity_resolution import name_mapping_path
+from scraper.extract_data import extract_data
+from scraper.http_scraper import fetch_thesis_http
+from scraper.manifest import manifest_path, rekey_theses
+
+THESIS_RE = re.compile(r'\s*<li class="unidad-docs__item.*?</li>', re.S)
+
+
+def listing_without(directory, page, count, skip=0):
+    """
+    Copia las páginas grabadas quitando `count` tesis de una de ellas, como estaba
+    el listado antes de publicarse.
+    """
+
+    shutil.copytree(os.path.join(FIXTURES, "listing"), directory)
+    path = os.path.join(directory, f"page{page}.html")
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    items = list(THESIS_RE.finditer(html))[skip : skip + count]
+    for item in reversed(items):
+        html = html[: item.start()] + html[item.end() :]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return directory
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    # el backend http descarga el listado del servidor local mientras está abierto
+    @contextmanager
+    def serve(directory):
+        with serve_listing(directory) as url:
+            monkeypatch.setattr(
+                json_generator,
+                "fetch_thesis_http",
+                functools.partial(fetch_thesis_http, page_url=url),
+            )
+            yield
+
+    return serve
+
+
+@pytest.mark.parametrize("resolve_names", [False, True])
+@pytest.mark.parametrize(
+    "full, page, count, skip, changed",
+    [
+        # tesis nuevas en el año más reciente y uno nuevo
+        (False, 0, 2, 0, ["2024", "2023"]),
+        # una tesis antigua que aparece tarde en el portal
+        (True, 3, 1, 5, ["2003"]),
+    ],
+)
+def test_update_matches_full_scrape(
+    tmp_path, serve, resolve_names, full, page, count, skip, changed
+):
+    updated = str(tmp_path / "updated" / "thesis.json")
+    scraped = str(tmp_path / "scraped" / "thesis.json")
+    os.makedirs(os.path.dirname(updated))
+    os.makedirs(os.path.dirname(scraped))
+
+    with serve(listing_without(tmp_path / "old", page, count, skip)):
+        json_generator.save_thesis_json(
+            updated, backend="http", resolve_names=resolve_names
+        )
+
+    with serve(os.path.join(FIXTURES, "listing")):
+        years = json_generator.update_thesis_json(
+            updated, backend="http", full=full, resolve_names=resolve_names
+        )
+        json_generator.save_thesis_json(
+            scraped, backend="http", resolve_names=resolve_names
+        )
+
+    assert years == changed
+    assert read(updated) == read(scraped)
+    assert read(manifest_path(updated)) == read(manifest_path(scraped))
+    if resolve_names:
+        assert read(name_mapping_path(updated)) == read(name_mapping_path(scraped))
+
+
+def test_update_without_changes(tmp_path, serve):
+    filename = str(tmp_path / "thesis.json")
+    with serve(os.path.join(FIXTURES, "listing")):
+        json_generator.save_thesis_json(filename, backend="http")
+        before = read(filename)
+        assert json_generator.update_thesis_json(filename, backend="http") == []
+
+    assert read(filename) == before
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    # cada navegador que abre el scraper es uno falso sobre las páginas grabadas;
+    # los fallos pendientes se comparten entre ellos
+    failures = set()
+    monkeypatch.setattr(
+        json_generator,
+        "init_driver",
+        lambda options, path: FakeListingDriver(listing_pages(), failures),
+    )
+    monkeypatch.setattr(checkpoint, "sleep", lambda seconds: None)
+    return failures
+
+
+def checkpoint_years(path):
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return [record["year"] for record in records if "year" in record]
+
+
+def expected_listing():
+    return rekey_theses(extract_data(FakeDriver(read_fixture("listing.html"))))
+
+
+def test_selenium_checkpoints_each_year(tmp_path, browser):
+    path = str(tmp_path / "thesis.checkpoint.jsonl")
+
+    data = json_generator.fetch_thesis_data("6069", "selenium", checkpoint=path)
+
+    assert data == expected_listing()
+    assert checkpoint_years(path) == list(data)
+    assert load_checkpoint(path)["6069"]["done"]
+
+
+def test_selenium_retries_each_year(tmp_path, browser):
+    path = str(tmp_path / "thesis.checkpoint.jsonl")
+    # falla la carga de todas las páginas salvo la primera: con un solo reintento
+    # basta porque entre fallo y fallo se ha extraído algún año
+    browser.update({1, 2, 3})
+
+    data = json_generator.fetch_thesis_data(
+        "6069", "selenium", checkpoint=path, retries=1
+    )
+
+    assert not browser
+    assert data == expected_listing()
+    assert checkpoint_years(path) == list(data)
+
+
+def test_selenium_resumes_from_checkpoint(tmp_path, browser):
+    path = str(tmp_path / "thesis.checkpoint.jsonl")
+    browser.add(2)
+
+    with pytest.raises(WebDriverException):
+        json_generator.fetch_thesis_data("6069", "selenium", checkpoint=path, retries=0)
+
+    # los años completos de las dos primeras páginas ya están guardados
+    progress = load_checkpoint(path)["6069"]
+    assert not progress["done"]
+    assert list(progress["years"]) == list(expected_listing())[: len(progress["years"])]
+    assert len(progress["years"]) > 1
+
+    data = json_generator.fetch_thesis_data("6069", "selenium", checkpoint=path)
+
+    # la segunda ejecución solo extrae los años que faltaban
+    assert data == expected_listing()
+    assert checkpoint_years(path) == list(data)
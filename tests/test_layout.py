@@ -0,0 +1,69 @@
+import networkx as nx
+import pytest
+
+from graph import layout
+from graph.graph_store import relations_digest
+
+K = 0.5
+
+
+def relations(nodes):
+    graph = nx.gnm_random_graph(nodes, 2 * nodes, seed=1)
+    return [(f"n{u}", f"n{v}") for u, v in graph.edges()]
+
+
+def get_layout(relations, filename, **kwargs):
+    graph = nx.Graph(relations)
+    return layout.get_layout(graph, filename, relations_digest(relations), K, **kwargs)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    # cada cálculo del layout, con las posiciones de las que parte
+    calls = []
+    spring_layout = layout.spring_layout
+
+    def recorded(graph, k, seed, previous, engine):
+        calls.append(previous)
+        return spring_layout(graph, k, seed=seed, previous=previous, engine=engine)
+
+    monkeypatch.setattr(layout, "spring_layout", recorded)
+    return calls
+
+
+@pytest.mark.parametrize("engine", layout.ENGINES)
+def test_saved_layout_is_reused(tmp_path, calls, engine):
+    filename = str(tmp_path / "thesis.json")
+    edges = relations(30)
+
+    pos = get_layout(edges, filename, engine=engine)
+
+    assert calls == [None]
+    assert layout.load_layout(layout.layout_path(filename, K))["engine"] == engine
+    assert all(-1 <= x <= 1 and -1 <= y <= 1 for x, y in pos.values())
+
+    assert get_layout(edges, filename, engine=engine) == pos
+    assert calls == [None]
+
+
+def test_other_seed_or_engine_starts_again(tmp_path, calls):
+    filename = str(tmp_path / "thesis.json")
+    edges = relations(30)
+
+    get_layout(edges, filename)
+    get_layout(edges, filename, seed=13)
+    get_layout(edges, filename, seed=13, engine="multilevel")
+
+    assert calls == [None, None, None]
+
+
+def test_grown_graph_starts_from_the_saved_layout(tmp_path, calls):
+    filename = str(tmp_path / "thesis.json")
+    edges = relations(30)
+    get_layout(edges, filename)
+    saved = layout.load_layout(layout.layout_path(filename, K))["positions"]
+
+    pos = get_layout(edges + [("n0", "nuevo")], filename)
+
+    assert calls == [None, saved]
+    assert set(pos) == set(saved) | {"nuevo"}
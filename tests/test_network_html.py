@@ -0,0 +1,60 @@
+import copy
+
+import networkx as nx
+import pytest
+from pyvis.network import Network
+
+from graph.network_html import write_network_html
+
+
+def thesis_like_graph(nodes):
+    graph = nx.gnm_random_graph(nodes, 2 * nodes, seed=1, directed=True)
+    graph = nx.relabel_nodes(graph, lambda node: f"n{node}")
+    graph.add_node("aislado")
+    return graph
+
+
+def pyvis_page(graph, path, sizes=None, groups=None):
+    # la exportación anterior: atributos en una copia del grafo y `from_nx`
+    graph = copy.deepcopy(graph)
+    if sizes:
+        nx.set_node_attributes(graph, sizes, "size")
+    if groups:
+        nx.set_node_attributes(graph, groups, "group")
+    net = Network(
+        notebook=True,
+        width="1920px",
+        height="1080px",
+        bgcolor="#222222",
+        font_color="white",
+        directed=True,
+    )
+    net.from_nx(graph)
+    net.save_graph(path)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+# con más de 100 nodos la plantilla añade la barra de carga
+@pytest.mark.parametrize("nodes", [20, 150])
+@pytest.mark.parametrize("view", ["plain", "degree", "communities"])
+def test_same_page_as_pyvis(tmp_path, monkeypatch, nodes, view):
+    # pyvis copia sus librerías (lib/) al directorio de trabajo
+    monkeypatch.chdir(tmp_path)
+    graph = thesis_like_graph(nodes)
+    sizes = groups = None
+    if view != "plain":
+        sizes = {k: v * 800 for k, v in nx.degree_centrality(graph).items()}
+    if view == "communities":
+        groups = {node: i % 4 for i, node in enumerate(graph)}
+    before = nx.node_link_data(graph)
+
+    write_network_html(graph, str(tmp_path / "stream.html"), sizes, groups)
+    pyvis_page(graph, str(tmp_path / "pyvis.html"), sizes, groups)
+
+    assert read(tmp_path / "stream.html") == read(tmp_path / "pyvis.html")
+    # el grafo es compartido por las demás tareas: no se le añaden atributos
+    assert nx.node_link_data(graph) == before
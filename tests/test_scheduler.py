@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from scheduler import Task, check_tasks, run_tasks
+
+
+def add(*values, value=0):
+    return sum(values) + value
+
+
+def fail(*values, executor=None):
+    raise RuntimeError("fallo de prueba")
+
+
+def touch(value, path):
+    with open(path, "w") as f:
+        f.write(str(value))
+
+
+def pool_size(value, executor=None):
+    # número de procesos del pool que recibe una tarea "pool"
+    return None if executor is None else executor._max_workers
+
+
+def diamond(kind):
+    return [
+        Task("a", add, kind="main", value=1),
+        Task("b", add, ["a"], kind, value=2),
+        Task("c", add, ["a"], kind, value=3),
+        Task("d", add, ["b", "c"], kind),
+        Task("e", add, kind="io", kwdeps={"value": "d"}),
+    ]
+
+
+def test_check_tasks_accepts_declaration_order():
+    check_tasks(diamond("cpu"))
+
+
+@pytest.mark.parametrize(
+    "tasks, message",
+    [
+        ([Task("a", add), Task("a", add)], "Tarea repetida: a"),
+        ([Task("b", add, ["a"]), Task("a", add)], "antes de b: a"),
+        ([Task("a", add, ["x"])], "antes de a: x"),
+        ([Task("a", add, kwdeps={"value": "a"})], "antes de a: a"),
+    ],
+)
+def test_check_tasks_rejects(tasks, message):
+    with pytest.raises(ValueError, match=message):
+        check_tasks(tasks)
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Tipo de tarea"):
+        Task("a", add, kind="gpu")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("kind", ["cpu", "io", "main"])
+def test_results_in_any_order(jobs, kind):
+    results, timings = run_tasks(diamond(kind), jobs=jobs)
+
+    assert results == {"a": 1, "b": 3, "c": 4, "d": 7, "e": 7}
+    assert timings["b"][0] == kind
+    assert timings["e"][0] == "io"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_pool_tasks_get_the_process_pool(jobs):
+    tasks = [
+        Task("a", add, kind="main", value=1),
+        Task("pool", pool_size, ["a"], "pool"),
+        Task("b", add, ["a"], "cpu"),
+    ]
+
+    results, timings = run_tasks(tasks, jobs=jobs)
+
+    assert results["pool"] == (None if jobs == 1 else jobs)
+    assert timings["pool"][0] == "pool"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("kind", ["cpu", "io", "main", "pool"])
+def test_failure_propagates(tmp_path, capsys, jobs, kind):
+    marker = str(tmp_path / "after")
+    tasks = [
+        Task("a", add, kind="main", value=1),
+        Task("broken", fail, ["a"], kind),
+        Task("after", touch, ["broken"], "main", path=marker),
+    ]
+
+    with pytest.raises(RuntimeError, match="fallo de prueba"):
+        run_tasks(tasks, jobs=jobs)
+
+    assert "[ERROR] Tarea broken: RuntimeError" in capsys.readouterr().out
+    # las que dependen de la tarea fallida no llegan a ejecutarse
+    assert not os.path.exists(marker)
@@ -0,0 +1,58 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from graph.plot_static_graphs import TILE_SIZE, save_tiles, tile_paths
+
+
+def test_tile_paths():
+    paths = tile_paths("thesis_simple.svg", 3)
+
+    root = os.path.join("outputs", "static", "tiles", "thesis_simple")
+    assert len(paths) == 1 + 4 + 16
+    assert paths[:5] == [
+        os.path.join(root, "0", "0_0.png"),
+        os.path.join(root, "1", "0_0.png"),
+        os.path.join(root, "1", "0_1.png"),
+        os.path.join(root, "1", "1_0.png"),
+        os.path.join(root, "1", "1_1.png"),
+    ]
+    assert paths[-1] == os.path.join(root, "2", "3_3.png")
+
+
+def test_save_tiles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # figura cuadrada blanca con un cuadrado rojo en el cuarto superior izquierdo
+    fig = Figure(figsize=(4, 4), dpi=50)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_xlim(0, 2)
+    ax.set_ylim(0, 2)
+    ax.fill([0, 1, 1, 0], [1, 1, 2, 2], color="red")
+
+    save_tiles(fig, "thesis_simple.svg", 3)
+
+    assert fig.dpi == 50
+    tiles = dict()
+    for path in tile_paths("thesis_simple.svg", 3):
+        image = plt.imread(path)
+        assert image.shape[:2] == (TILE_SIZE, TILE_SIZE)
+        zoom, name = path.split(os.sep)[-2:]
+        tiles[int(zoom), name] = image
+
+    def red(zoom, name):
+        image = tiles[zoom, name]
+        return np.mean((image[..., 0] > 0.9) & (image[..., 1] < 0.1))
+
+    # salvo el suavizado del borde del cuadrado
+    assert red(0, "0_0.png") == pytest.approx(0.25, abs=0.01)
+    # x crece hacia la derecha e y hacia abajo, como en los mapas web
+    assert red(1, "0_0.png") > 0.99
+    assert red(1, "1_0.png") < 0.01 and red(1, "0_1.png") < 0.01
+    assert red(2, "1_1.png") > 0.99
+    assert red(2, "2_1.png") < 0.01 and red(2, "1_2.png") < 0.01
@@ -0,0 +1,61 @@
+import gzip
+import json
+import os
+
+import networkx as nx
+import pytest
+
+from graph import web_export
+
+VIEWS = {
+    "plain": "thesis_interactive.html",
+    "overview": "thesis_communities_overview.html",
+}
+
+
+def read_data(path):
+    # los .js envuelven el JSON en la llamada al visor
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    prefix = f"{web_export.DATA_CALLBACK}(document.currentScript,"
+    assert text.startswith(prefix) and text.endswith(");\n")
+    return json.loads(text[len(prefix) : -len(");\n")])
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_export_interactive(tmp_path, compress):
+    graph = nx.DiGraph([("a", "c"), ("b", "c"), ("d", "e"), ("c", "e")])
+    pos = {node: (i / 5, -i / 5) for i, node in enumerate(graph)}
+    degrees = nx.degree_centrality(graph)
+    communities = {"a": 0, "b": 0, "c": 0, "d": 1, "e": 1}
+    output_dir = str(tmp_path)
+
+    web_export.export_interactive(
+        graph, degrees, communities, pos, VIEWS, output_dir, compress
+    )
+
+    paths = web_export.export_paths(output_dir, VIEWS, compress)
+    assert all(os.path.exists(path) for path in paths)
+
+    data_path = web_export.graph_data_path(output_dir, compress)
+    assert data_path.endswith(".json.gz" if compress else ".js")
+    assert read_data(data_path) == web_export.graph_data(
+        graph, pos, degrees, communities
+    )
+
+    # el resumen apunta a un archivo por comunidad, relativo a él
+    directory = web_export.communities_dir(output_dir)
+    overview = read_data(
+        os.path.join(directory, "index" + web_export.data_suffix(compress))
+    )
+    assert overview["members"] == [3, 2]
+    for community, filename in zip(overview["community"], overview["files"]):
+        data = read_data(os.path.join(directory, filename))
+        assert {communities[node] for node in data["nodes"]} == {community}
+
+    with open(os.path.join(output_dir, VIEWS["overview"]), encoding="utf-8") as f:
+        page = f.read()
+    assert f'data-src="communities/index{web_export.data_suffix(compress)}"' in page